@@ -1,4 +1,44 @@
-from .fetch import fetch_stocks, get_symbol_list
-from .main import main
-from .stock_scanner import StockScanner
-from .zone_detector import DemandZoneScanner, detect_zones
\ No newline at end of file
+# Public names are resolved on first access so that `import ZoneScanner` (and the CLI
+# entry points, which import it as their package) does not load pandas, plotly or
+# the scanner modules up front.
+_EXPORTS = {
+    "fetch": ["fetch_stocks", "get_symbol_list"],
+    "main": ["main"],
+    "stock_scanner": ["StockScanner"],
+    "universe": ["StockInfo", "StockUniverse", "get_universe"],
+    "backtest": ["backtest_params", "causal_zones", "run_backtest", "simulate_trades", "simulate_zones", "summarize_trades"],
+    "confluence": ["IntervalIndex", "find_confluence", "write_confluence"],
+    "cache": ["CacheBackend", "CSVCache", "FeatherCache", "NpyCache", "get_cache", "merge_bars", "migrate_cache"],
+    "downloader": ["OHLCDownloader", "TokenBucket"],
+    "instrumentation": ["RunStats", "stats"],
+    "incremental": ["IncrementalZoneDetector"],
+    "logs": ["pool_logging", "progress", "start_logging", "stop_logging"],
+    "parallel": ["arrays_to_frame", "detect_job", "frame_to_arrays"],
+    "panel": ["Panel", "build_panel", "detect_zones_panel"],
+    "plotting": ["render_zones", "zone_figure", "zone_window"],
+    "quality": ["QualityReport", "check_ohlc", "repair_ohlc", "validate_ohlc"],
+    "result_cache": ["ResultCache", "frame_fingerprint"],
+    "results": ["TopZones", "ZoneWriter"],
+    "service": ["ZoneClient", "ZoneService", "make_server"],
+    "resample": ["resample_ohlcv", "trim_to_period", "validate_resampled"],
+    "zone": ["Zone", "zones_to_frame"],
+    "zone_detector": ["DemandZoneScanner", "ZoneParams", "clean_ohlc_frame", "detect_zones", "detect_zones_sweep", "detect_zones_vectorized"],
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = sorted(_MODULES)
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module 'ZoneScanner' has no attribute '{name}'")
+    import importlib
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    # Also replaces the submodule attribute set by the import for `main`, as the eager import did
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_MODULES))
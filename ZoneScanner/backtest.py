@@ -0,0 +1,347 @@
+import os
+import math
+import logging
+import argparse
+import itertools
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+import pandas as pd
+from ZoneScanner.instrumentation import stats
+from ZoneScanner.panel import Panel, _panel_candidates, build_panel
+from ZoneScanner.results import sweep_columns
+from ZoneScanner.support_resistance import finalize_levels, insert_levels, pivot_masks
+from ZoneScanner.zone import Zone
+from ZoneScanner.zone_detector import ZoneParams, _build_zone, _candle_masks
+
+# Trade outcome codes of simulate_zones
+UNTOUCHED, OPEN, WIN, LOSS = 0, 1, 2, 3
+
+# Candles on each side of a swing pivot (detect_support_resistance's default); a
+# pivot is only known once this many bars after it have closed
+SWING = 2
+
+
+def backtest_params(params: ZoneParams) -> ZoneParams:
+    """
+    The detection parameters a backtest uses for `params`. Freshness and distance are
+    measured against the latest bar, so a zone that is still fresh today never traded;
+    history is replayed with both filters off and only the base range applies
+    (causal_zones scores every zone as fresh at its leg-out).
+    """
+    return ZoneParams(False, params.min_base, params.max_base, (-math.inf, math.inf))
+
+
+def _reach_tables(values: np.ndarray, reduce, span: int) -> List[np.ndarray]:
+    """
+    tables[k][j] = reduce(values[j:j + 2**k]) (cut short at the end of the array),
+    for every k with 2**k <= span.
+    """
+    tables = [values]
+    step = 1
+    while step * 2 <= span:
+        prev = tables[-1]
+        table = prev.copy()
+        reduce(prev[:-step], prev[step:], out=table[:-step])
+        tables.append(table)
+        step *= 2
+    return tables
+
+
+def _first_hit(tables: List[np.ndarray], start: np.ndarray, hit) -> np.ndarray:
+    """
+    For every query, the first position at or after `start` whose value passes
+    `hit(values)` (one level per query), found by binary lifting over `tables`: a
+    block of 2**k values is jumped whole when none of it hits. The caller guarantees
+    a hitting sentinel within reach of every start.
+    """
+    pos = start.copy()
+    for k in range(len(tables) - 1, -1, -1):
+        pos += np.where(hit(tables[k][pos]), 0, 1 << k)
+    return pos
+
+
+def simulate_trades(panel: Panel, rows: np.ndarray, starts: np.ndarray, entry: np.ndarray,
+                    stop: np.ndarray, target: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Replay one long trade per query on the panel's bars, all queries at once. From
+    bar `starts` of panel row `rows`, the entry fills on the first bar whose Low
+    reaches `entry`; the trade then loses on the first bar whose Low reaches `stop`
+    (the fill bar included) and wins on the first later bar whose High reaches
+    `target`. A bar that reaches both counts as a loss. Bars are symbol-relative.
+
+    Each row gets one sentinel bar past its end (Low -inf, High +inf) that every
+    search stops at, so "no hit" comes back as that row's sentinel position.
+    """
+    width = panel.bars + 1
+    row_end = rows * width + panel.bars
+    offsets = panel.offsets[rows]
+    pos = rows * width + offsets + starts
+
+    low = np.full((len(panel), width), -np.inf)
+    low[:, :-1] = panel.prices["Low"]
+    # fmin skips the NaN padding of the following row instead of propagating it
+    tables = _reach_tables(low.ravel(), np.fmin, width)
+    filled = _first_hit(tables, np.minimum(pos, row_end), lambda lows: lows <= entry)
+    stopped = _first_hit(tables, filled, lambda lows: lows <= stop)
+    del low, tables
+
+    high = np.full((len(panel), width), np.inf)
+    high[:, :-1] = panel.prices["High"]
+    tables = _reach_tables(high.ravel(), np.fmax, width)
+    reached = _first_hit(tables, np.minimum(filled + 1, row_end), lambda highs: highs >= target)
+    del high, tables
+
+    touched = filled < row_end
+    loss = touched & (stopped < row_end) & (stopped <= reached)
+    win = touched & ~loss & (reached < row_end)
+    outcome = np.where(loss, LOSS, np.where(win, WIN, np.where(touched, OPEN, UNTOUCHED))).astype(np.int8)
+    exit_pos = np.where(loss, stopped, np.where(win, reached, row_end))
+
+    risk = entry - stop
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r_multiple = np.where(loss, -1.0, np.where(win, (target - entry) / risk, np.nan))
+    base = rows * width + offsets
+    return {
+        "outcome": outcome,
+        "entry_bar": np.where(touched, filled - base, -1),
+        "exit_bar": np.where(loss | win, exit_pos - base, -1),
+        "r_multiple": r_multiple,
+    }
+
+
+def _causal_row(panel: Panel, row: int, records: np.ndarray, tf: str, param_sets, arr: dict,
+                idx: np.ndarray, is_res: np.ndarray, is_sup: np.ndarray) -> Dict[ZoneParams, List[Zone]]:
+    """
+    Build the zones of one panel row's candidates, each against the support and
+    resistance known at its leg-out bar. Candidates are visited by leg-out bar so
+    pivots are inserted once, in candle order, as the known history grows.
+    """
+    symbol = panel.symbols[row]
+    offset = int(panel.offsets[row])
+    high, low = panel.prices["High"][row], panel.prices["Low"][row]
+    res_bars, sup_bars = idx[is_res[row]], idx[is_sup[row]]
+    res_confirmed = res_bars - offset + SWING
+    sup_confirmed = sup_bars - offset + SWING
+    cmp = float(panel.prices["Close"][row, -1])
+    green_run = arr["green_run"][row, offset:]
+    dates = panel.bar_dates(row)
+
+    support, resistance = [], []
+    levels = finalize_levels(support, resistance)
+    inserted_res = inserted_sup = 0
+    built = []
+    legout = records["i"] + records["base_len"]
+    for k in np.argsort(legout, kind="stable").tolist():
+        i, base_len, proximal, distal = (int(records["i"][k]), int(records["base_len"][k]),
+                                         float(records["proximal"][k]), float(records["distal"][k]))
+        wanted = [params for params in param_sets if params.min_base <= base_len <= params.max_base]
+        if not wanted:
+            continue
+
+        # Pivots confirmed by the close of the leg-out candle
+        end = i + base_len
+        res_stop = int(np.searchsorted(res_confirmed, end, side="right"))
+        sup_stop = int(np.searchsorted(sup_confirmed, end, side="right"))
+        if res_stop > inserted_res or sup_stop > inserted_sup:
+            insert_levels(support, resistance, high[res_bars[inserted_res:res_stop]], low[sup_bars[inserted_sup:sup_stop]])
+            inserted_res, inserted_sup = res_stop, sup_stop
+            levels = finalize_levels(support, resistance)
+
+        zone = _build_zone(
+            symbol, tf, proximal, distal,
+            index=i,
+            fresh=True,
+            score=int(records["score"][k]),
+            leg_out_strength=float(records["leg_out_strength"][k]),
+            base_len=base_len,
+            green_after_legout=int(green_run[end + 1]),
+            dates=dates[i - 1:end + 1].tolist(),
+            distance_pct=round(((cmp - proximal) / cmp) * 100, 2),
+            stop_loss_pct=round(((proximal - distal) / proximal) * 100, 2),
+            all_supports=levels["Support"],
+            all_resistances=levels["Resistance"],
+        )
+        built.append((k, wanted, zone))
+
+    results = {params: [] for params in param_sets}
+    for k, wanted, zone in sorted(built, key=lambda item: item[0]):
+        if zone is not None:
+            for params in wanted:
+                results[params].append(zone)
+    return results
+
+
+def causal_zones(panel: Panel, tf: str, param_sets) -> Dict[str, Dict[ZoneParams, List[Zone]]]:
+    """
+    Detect zones on a panel as they looked at their leg-out bar, using no later bar.
+    Every candidate is fresh at that point, so the score counts it as fresh, and the
+    support/resistance behind the target, the risk/reward filter and the sizing come
+    from the swing pivots confirmed by then, as detect_support_resistance would find
+    them on the frame cut at the leg-out. Returns {symbol: {params: zones}} like
+    detect_zones_panel.
+    """
+    param_sets = [ZoneParams(*p) for p in param_sets]
+    results = {symbol: {params: [] for params in param_sets} for symbol in panel.symbols}
+    if not len(panel) or not param_sets:
+        return results
+
+    p = panel.prices
+    with stats.timer("candidates", tf):
+        arr = _candle_masks(p["Open"], p["High"], p["Low"], p["Close"], p["Volume"])
+        # No low after the leg-out is known yet, so nothing has traded back into the base
+        arr["low_suffix_min"] = np.full_like(p["Low"], np.inf)
+        candidates = _panel_candidates(
+            arr, panel.offsets, panel.lengths,
+            min(params.min_base for params in param_sets),
+            max(params.max_base for params in param_sets),
+            False,
+        )
+    if not candidates.size:
+        return results
+
+    with stats.timer("support_resistance", tf):
+        idx, is_res, is_sup = pivot_masks(p["High"], p["Low"], 0, panel.bars, SWING)
+        rows, starts = np.unique(candidates["row"], return_index=True)
+        for row, records in zip(rows.tolist(), np.split(candidates, starts[1:])):
+            results[panel.symbols[row]] = _causal_row(panel, row, records, tf, param_sets, arr, idx, is_res, is_sup)
+    return results
+
+
+def simulate_zones(panel: Panel, zones: List[Zone]) -> Dict[str, np.ndarray]:
+    """
+    Replay every zone as a trade on the bars it was detected on: watch from the bar
+    after the leg-out for a fill at Entry, then Stop Loss against Nearest Resistance
+    as the target. Adds each trade's P&L in rupees at the zone's Quantity.
+    """
+    row_of = {symbol: row for row, symbol in enumerate(panel.symbols)}
+    rows = np.array([row_of[z.symbol] for z in zones], dtype=np.int64)
+    starts = np.array([z.index + z.base_len + 1 for z in zones], dtype=np.int64)
+    entry = np.array([z.entry for z in zones], dtype="float64")
+    stop = np.array([z.stop_loss for z in zones], dtype="float64")
+    target = np.array([np.nan if z.nearest_resistance is None else z.nearest_resistance for z in zones], dtype="float64")
+    quantity = np.array([z.quantity for z in zones], dtype="float64")
+
+    trades = simulate_trades(panel, rows, starts, entry, stop, target)
+    outcome = trades["outcome"]
+    trades["pnl"] = np.where(outcome == WIN, quantity * (target - entry),
+                             np.where(outcome == LOSS, -quantity * (entry - stop), np.nan))
+    trades["wait_bars"] = np.where(trades["entry_bar"] >= 0, trades["entry_bar"] - starts, -1)
+    trades["holding_bars"] = np.where(trades["exit_bar"] >= 0, trades["exit_bar"] - trades["entry_bar"], -1)
+    return trades
+
+
+def summarize_trades(trades: Dict[str, np.ndarray]) -> dict:
+    """Win rate, expectancy and holding time of one parameter set's trades."""
+    outcome = trades["outcome"]
+    closed = (outcome == WIN) | (outcome == LOSS)
+    wins, losses = int(np.sum(outcome == WIN)), int(np.sum(outcome == LOSS))
+    touched = outcome != UNTOUCHED
+
+    def mean(values):
+        return round(float(np.mean(values)), 2) if len(values) else None
+
+    return {
+        "Zones": len(outcome),
+        "Touched": int(np.sum(touched)),
+        "Wins": wins,
+        "Losses": losses,
+        "Open": int(np.sum(outcome == OPEN)),
+        "Win Rate %": round(100 * wins / (wins + losses), 2) if wins + losses else None,
+        "Expectancy R": mean(trades["r_multiple"][closed]),
+        "Avg P&L ₹": mean(trades["pnl"][closed]),
+        "Avg Bars To Entry": mean(trades["wait_bars"][touched]),
+        "Avg Holding Bars": mean(trades["holding_bars"][closed]),
+    }
+
+
+def run_backtest(frames: Iterable[Tuple[str, pd.DataFrame]], tf: str, param_sets, panel_size: int = 250) -> pd.DataFrame:
+    """
+    Detect zones on (symbol, frame) pairs in panels of `panel_size` symbols with
+    causal_zones, replay each zone once and summarize the trades of every parameter
+    set (see backtest_params). One row per parameter set, with the sweep parameter
+    columns first.
+    """
+    param_sets = [backtest_params(ZoneParams(*p)) for p in param_sets]
+    param_sets = list(dict.fromkeys(param_sets))
+    collected = {params: [] for params in param_sets}
+    frames = iter(frames)
+    while True:
+        batch = list(itertools.islice(frames, panel_size))
+        if not batch:
+            break
+        panel = build_panel(batch)
+        detected = causal_zones(panel, tf, param_sets)
+
+        # A zone shared by several parameter sets is replayed once
+        zones, positions = [], {}
+        for results in detected.values():
+            for params, found in results.items():
+                for zone in found:
+                    if id(zone) not in positions:
+                        positions[id(zone)] = len(zones)
+                        zones.append(zone)
+        if not zones:
+            continue
+        with stats.timer("backtest", tf):
+            trades = simulate_zones(panel, zones)
+        for params in param_sets:
+            picked = np.array([positions[id(zone)] for results in detected.values() for zone in results[params]], dtype=np.int64)
+            collected[params].append({name: values[picked] for name, values in trades.items()})
+        stats.count("symbols", len(batch), tf=tf)
+
+    rows = []
+    for params in param_sets:
+        parts = collected[params]
+        merged = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]} if parts else {
+            name: np.zeros(0) for name in ("outcome", "r_multiple", "pnl", "wait_bars", "holding_bars")}
+        rows.append({"Timeframe": tf, **sweep_columns(params), **summarize_trades(merged)})
+    return pd.DataFrame(rows)
+
+
+def main():
+    from ZoneScanner.main import CACHE_FORMATS, setup_logging
+    from ZoneScanner.cache import get_cache
+    from ZoneScanner.downloader import OHLCDownloader
+    from ZoneScanner.fetch import get_symbol_list
+    from ZoneScanner.stock_scanner import StockScanner
+
+    parser = argparse.ArgumentParser(description="Replay detected demand zones against the bars that followed them")
+    parser.add_argument("--tf", nargs="+", default=["1d"], help="Timeframes to backtest")
+    parser.add_argument("--symbol", nargs="+", help="Backtest only these symbols")
+    parser.add_argument("--sector", nargs="+", help="Filter by one or more sectors in StockList.csv")
+    parser.add_argument("--industry", nargs="+", help="Filter by one or more industries in StockList.csv")
+    parser.add_argument("--limit", type=int, help="Max number of symbols")
+    parser.add_argument("--min-base", type=int, nargs="+", default=[1], help="Minimum base candle counts to compare")
+    parser.add_argument("--max-base", type=int, nargs="+", default=[3], help="Maximum base candle counts to compare")
+    parser.add_argument("--panel", type=int, default=250, help="Symbols detected and replayed together")
+    parser.add_argument("--cache-format", choices=list(CACHE_FORMATS), default="csv", help="OHLC cache format")
+    parser.add_argument("--download-workers", type=int, default=4, help="Max concurrent yfinance downloads")
+    parser.add_argument("--rate-limit", type=float, default=2.0, help="Max download requests per second (0 = unlimited)")
+    parser.add_argument("--output-dir", default=".", help="Where backtest_{tf}.csv is written")
+    args = parser.parse_args()
+    grid = [ZoneParams(False, lo, hi) for lo, hi in itertools.product(args.min_base, args.max_base) if lo <= hi]
+    if not grid:
+        parser.error("no --min-base / --max-base combination has min <= max")
+    setup_logging()
+
+    symbols = args.symbol or get_symbol_list(csv_path="StockList.csv", sectors=args.sector, industries=args.industry)
+    if args.limit:
+        symbols = symbols[:args.limit]
+    cache = get_cache(args.cache_format)
+    downloader = OHLCDownloader(max_workers=args.download_workers, rate_limit=args.rate_limit)
+
+    for tf in args.tf:
+        scanner = StockScanner(tf=tf, cache=cache, downloader=downloader)
+        with stats.timer("backtest_total", tf):
+            summary = run_backtest(scanner.load_frames(symbols), tf, grid, args.panel)
+        path = os.path.join(args.output_dir, f"backtest_{tf}.csv")
+        summary.to_csv(path, index=False)
+        logging.info(f"📊 Backtest ({tf}, {len(symbols)} symbols) saved to: {path}")
+        for row in summary.to_dict("records"):
+            logging.info(f"📊 {tf} base {row['Min Base']}-{row['Max Base']}: {row['Zones']} zones, "
+                         f"{row['Wins']}W/{row['Losses']}L/{row['Open']} open, win rate {row['Win Rate %']}%, "
+                         f"expectancy {row['Expectancy R']}R, holding {row['Avg Holding Bars']} bars")
+
+
+if __name__ == "__main__":
+    main()
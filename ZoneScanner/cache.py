@@ -0,0 +1,272 @@
+import os
+import json
+import argparse
+import tempfile
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Optional, Tuple, Type
+import numpy as np
+import pandas as pd
+from ZoneScanner.zone_detector import clean_ohlc_frame
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+class CacheBackend:
+    """
+    Per symbol-timeframe OHLCV store. `read` returns a cleaned frame with a
+    DatetimeIndex named Date, a Date column and Open/High/Low/Close/Volume columns.
+    """
+
+    suffix = ""
+
+    def __init__(self, cache_dir: str = "csv_data"):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path(self, symbol: str, tf: str) -> str:
+        return os.path.join(self.cache_dir, f"{symbol}_{tf}{self.suffix}")
+
+    def exists(self, symbol: str, tf: str) -> bool:
+        return os.path.exists(self.path(symbol, tf))
+
+    def read(self, symbol: str, tf: str) -> pd.DataFrame:
+        raise NotImplementedError
+
+    def write(self, symbol: str, tf: str, df: pd.DataFrame) -> None:
+        raise NotImplementedError
+
+    def remove(self, symbol: str, tf: str) -> None:
+        if os.path.exists(self.path(symbol, tf)):
+            os.remove(self.path(symbol, tf))
+
+    def meta_path(self, symbol: str, tf: str) -> str:
+        return os.path.join(self.cache_dir, f"{symbol}_{tf}.meta.json")
+
+    def read_meta(self, symbol: str, tf: str) -> dict:
+        """Staleness metadata for a cache entry, or {} when none was recorded."""
+        try:
+            with open(self.meta_path(symbol, tf), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def write_meta(self, symbol: str, tf: str, df: pd.DataFrame, downloaded_rows: int,
+                   quality: Optional[dict] = None, **extra) -> dict:
+        meta = {
+            "last_bar": pd.Timestamp(df.index[-1]).isoformat() if len(df) else None,
+            "rows": len(df),
+            "downloaded_rows": downloaded_rows,
+            "refreshed_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        if quality is not None:
+            meta["quality"] = quality
+        meta.update(extra)
+        with open(self.meta_path(symbol, tf), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return meta
+
+    def is_stale(self, symbol: str, tf: str, max_age: timedelta) -> bool:
+        refreshed_at = self.read_meta(symbol, tf).get("refreshed_at")
+        if not refreshed_at:
+            return True
+        return datetime.now() - datetime.fromisoformat(refreshed_at) > max_age
+
+    def quarantine(self, symbol: str, tf: str, df: pd.DataFrame, reason: str, quality: Optional[dict] = None) -> str:
+        """
+        Move a frame that failed validation to `{cache_dir}/quarantine/` in this
+        backend's format and drop the live entry. The metadata stays in place with
+        the reason, so later runs skip the symbol without reading any bars.
+        Returns the quarantined file's path.
+        """
+        held = type(self)(os.path.join(self.cache_dir, "quarantine"))
+        if len(df):
+            held.write(symbol, tf, df)
+        self.remove(symbol, tf)
+        self.write_meta(symbol, tf, df, downloaded_rows=len(df), quality=quality, quarantined=reason,
+                        quarantined_at=datetime.now().isoformat(timespec="seconds"))
+        return held.path(symbol, tf)
+
+    def quarantined(self, symbol: str, tf: str, retry_after: Optional[timedelta] = None) -> Optional[str]:
+        """
+        The reason a symbol is quarantined, or None. Once `retry_after` has passed
+        since the quarantine, None is returned so the data is downloaded again.
+        """
+        meta = self.read_meta(symbol, tf)
+        reason = meta.get("quarantined")
+        if not reason:
+            return None
+        if retry_after is not None and datetime.now() - datetime.fromisoformat(meta["quarantined_at"]) > retry_after:
+            return None
+        return reason
+
+    def entries(self) -> Iterator[Tuple[str, str]]:
+        """Yield (symbol, tf) for every cached file in this backend's format."""
+        for name in sorted(os.listdir(self.cache_dir)):
+            if not name.endswith(self.suffix):
+                continue
+            stem = name[:-len(self.suffix)]
+            symbol, sep, tf = stem.rpartition("_")
+            if sep:
+                yield symbol, tf
+
+
+class CSVCache(CacheBackend):
+    """The original `{symbol}_{tf}.csv` text cache."""
+
+    suffix = ".csv"
+
+    def read(self, symbol: str, tf: str) -> pd.DataFrame:
+        df = pd.read_csv(self.path(symbol, tf), index_col="Date", parse_dates=True)
+        return clean_ohlc_frame(df, symbol)
+
+    def write(self, symbol: str, tf: str, df: pd.DataFrame) -> None:
+        df.to_csv(self.path(symbol, tf), index_label="Date")
+
+
+class NpyCache(CacheBackend):
+    """
+    Memory-mapped NumPy cache: `{symbol}_{tf}.ohlcv.npy` holds a (5, bars) float64
+    matrix and `{symbol}_{tf}.dates.npy` the int64 nanosecond timestamps. Reads wrap
+    the mapped matrix in a DataFrame without copying.
+    """
+
+    suffix = ".ohlcv.npy"
+    dates_suffix = ".dates.npy"
+
+    def _dates_path(self, symbol: str, tf: str) -> str:
+        return os.path.join(self.cache_dir, f"{symbol}_{tf}{self.dates_suffix}")
+
+    def exists(self, symbol: str, tf: str) -> bool:
+        return os.path.exists(self.path(symbol, tf)) and os.path.exists(self._dates_path(symbol, tf))
+
+    def remove(self, symbol: str, tf: str) -> None:
+        # The dates go first, so a half-removed entry no longer reports exists()
+        for path in (self._dates_path(symbol, tf), self.path(symbol, tf)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _save(self, path: str, array: np.ndarray) -> None:
+        """
+        Write `array` to a temporary file next to `path` and rename it into place.
+        Frames still mapping the old file keep reading its unchanged contents.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, prefix=os.path.basename(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def read(self, symbol: str, tf: str) -> pd.DataFrame:
+        values = np.load(self.path(symbol, tf), mmap_mode="r")
+        dates = np.load(self._dates_path(symbol, tf))
+        index = pd.DatetimeIndex(dates.view("datetime64[ns]"), name="Date")
+        df = pd.DataFrame(values.T, index=index, columns=OHLCV_COLUMNS, copy=False)
+        df["Date"] = df.index
+        return df
+
+    def write(self, symbol: str, tf: str, df: pd.DataFrame) -> None:
+        index = pd.DatetimeIndex(pd.to_datetime(df.index))
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        values = np.vstack([
+            df[col].to_numpy(dtype="float64") if col in df.columns else np.full(len(df), np.nan)
+            for col in OHLCV_COLUMNS
+        ])
+        # Each file is replaced whole, never rewritten in place under a live memory map;
+        # the values go last so a new entry only reports exists() once both are there
+        self._save(self._dates_path(symbol, tf), index.asi8)
+        self._save(self.path(symbol, tf), np.ascontiguousarray(values))
+
+
+class FeatherCache(CacheBackend):
+    """Arrow IPC (Feather) cache read with memory mapping. Requires pyarrow."""
+
+    suffix = ".feather"
+
+    def __init__(self, cache_dir: str = "csv_data"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError("The feather cache format requires pyarrow: pip install pyarrow") from e
+        super().__init__(cache_dir)
+
+    def read(self, symbol: str, tf: str) -> pd.DataFrame:
+        from pyarrow import feather
+        df = feather.read_table(self.path(symbol, tf), memory_map=True).to_pandas()
+        df = df.set_index("Date")
+        df["Date"] = df.index
+        return df
+
+    def write(self, symbol: str, tf: str, df: pd.DataFrame) -> None:
+        out = df[[col for col in OHLCV_COLUMNS if col in df.columns]].astype("float64")
+        out.index = pd.DatetimeIndex(pd.to_datetime(df.index), name="Date")
+        out.reset_index().to_feather(self.path(symbol, tf))
+
+
+CACHE_BACKENDS: Dict[str, Type[CacheBackend]] = {
+    "csv": CSVCache,
+    "npy": NpyCache,
+    "feather": FeatherCache,
+}
+
+
+def get_cache(fmt: str = "csv", cache_dir: str = "csv_data") -> CacheBackend:
+    if fmt not in CACHE_BACKENDS:
+        raise ValueError(f"Unknown cache format '{fmt}'. Choose from: {', '.join(CACHE_BACKENDS)}")
+    return CACHE_BACKENDS[fmt](cache_dir)
+
+
+def merge_bars(cached: pd.DataFrame, fresh: pd.DataFrame) -> pd.DataFrame:
+    """
+    Append freshly downloaded bars to a cached frame. Overlapping dates take the
+    downloaded values, which corrects the previously still-forming last bar.
+    """
+    if fresh is None or fresh.empty:
+        return cached
+    fresh = fresh.copy()
+    if fresh.index.tz is not None and cached.index.tz is None:
+        fresh.index = fresh.index.tz_localize(None)
+    columns = [col for col in OHLCV_COLUMNS if col in cached.columns]
+    head = cached[cached.index < fresh.index.min()]
+    merged = pd.concat([head[columns], fresh[[col for col in columns if col in fresh.columns]]])
+    merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+    merged.index.name = "Date"
+    merged["Date"] = merged.index
+    return merged
+
+
+def migrate_cache(src: CacheBackend, dst: CacheBackend, overwrite: bool = False) -> int:
+    """
+    Copy every entry in `src` into `dst`. Existing destination entries are kept
+    unless `overwrite` is set. Returns the number of entries written.
+    """
+    migrated = 0
+    for symbol, tf in src.entries():
+        if not overwrite and dst.exists(symbol, tf):
+            continue
+        try:
+            dst.write(symbol, tf, src.read(symbol, tf))
+            migrated += 1
+        except Exception as e:
+            logging.warning(f"❌ Could not migrate {symbol} [{tf}] – {type(e).__name__}: {e}")
+    logging.info(f"📦 Migrated {migrated} cache entries to {type(dst).__name__}")
+    return migrated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate the OHLC cache between formats")
+    parser.add_argument("--cache-dir", default="csv_data", help="Cache directory")
+    parser.add_argument("--from", dest="src", default="csv", choices=list(CACHE_BACKENDS), help="Source format")
+    parser.add_argument("--to", dest="dst", default="npy", choices=list(CACHE_BACKENDS), help="Target format")
+    parser.add_argument("--overwrite", action="store_true", help="Rewrite entries that already exist in the target format")
+    args = parser.parse_args()
+    migrate_cache(get_cache(args.src, args.cache_dir), get_cache(args.dst, args.cache_dir), args.overwrite)
+
+
+if __name__ == "__main__":
+    main()
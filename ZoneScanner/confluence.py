@@ -0,0 +1,118 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+from ZoneScanner.results import ZoneWriter
+from ZoneScanner.zone import Zone
+
+# Timeframes from lowest to highest; a zone is joined against every higher one
+TF_ORDER = ("1d", "1wk", "1mo")
+
+CONTAINS = "contains"
+OVERLAPS = "overlaps"
+
+
+class IntervalIndex:
+    """
+    Static index of closed price intervals [low, high], held as arrays sorted by
+    low together with the widest interval's width. Every interval overlapping
+    [a, b] has its low inside [a - widest, b], so a query only scans that slice of
+    the sorted lows instead of every interval.
+    """
+
+    def __init__(self, lows: np.ndarray, highs: np.ndarray):
+        lows = np.asarray(lows, dtype="float64")
+        highs = np.asarray(highs, dtype="float64")
+        self.order = np.argsort(lows, kind="stable")
+        self.lows = lows[self.order]
+        self.highs = highs[self.order]
+        self.widest = float(np.max(self.highs - self.lows)) if len(lows) else 0.0
+
+    def __len__(self):
+        return len(self.lows)
+
+    def overlaps(self, a: np.ndarray, b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Every (query, interval) pair with interval ∩ [a[q], b[q]] non-empty, for all
+        queries at once. Interval positions refer to the order the index was built in.
+        """
+        a = np.asarray(a, dtype="float64")
+        b = np.asarray(b, dtype="float64")
+        if not len(self) or not len(a):
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty
+        # Widened by a hair so rounding in a - widest cannot cut off a touching interval
+        reach = self.widest * (1 + 1e-9) + 1e-9
+        start = np.searchsorted(self.lows, a - reach, side="left")
+        stop = np.searchsorted(self.lows, b, side="right")
+        counts = np.maximum(stop - start, 0)
+
+        queries = np.repeat(np.arange(len(a)), counts)
+        first = np.repeat(start - np.cumsum(counts) + counts, counts)
+        slots = first + np.arange(len(queries))
+        keep = self.highs[slots] >= a[queries]
+        return queries[keep], self.order[slots[keep]]
+
+
+def zone_interval(zone: Zone) -> Tuple[float, float]:
+    """A zone's [Stop Loss, Entry] price range."""
+    return zone.stop_loss, zone.entry
+
+
+def find_confluence(zones: Iterable[Zone]) -> List[Tuple[Zone, List[Tuple[Zone, str]]]]:
+    """
+    Join every zone against the zones of the same symbol on higher timeframes
+    (TF_ORDER). A higher-timeframe zone whose [Stop Loss, Entry] range covers the
+    lower zone's whole range `contains` it, any other intersection `overlaps` it.
+    Returns (zone, [(higher zone, relation), ...]) for every zone below the highest
+    timeframe present, in input order; matches are listed highest timeframe first.
+    """
+    zones = list(zones)
+    by_key: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+    for n, zone in enumerate(zones):
+        by_key[(zone.symbol, zone.tf)].append(n)
+    present = [tf for tf in TF_ORDER if any(tf == key[1] for key in by_key)]
+    ranks = {tf: rank for rank, tf in enumerate(present)}
+
+    bounds = np.array([zone_interval(zone) for zone in zones], dtype="float64").reshape(-1, 2)
+    indexes = {}
+    for key, members in by_key.items():
+        if ranks.get(key[1], 0) > 0:
+            members = np.array(members)
+            indexes[key] = (members, IntervalIndex(bounds[members, 0], bounds[members, 1]))
+
+    matches: Dict[int, List[Tuple[Zone, str]]] = {}
+    for (symbol, tf), members in by_key.items():
+        if tf not in ranks or ranks[tf] == len(present) - 1:
+            continue
+        members = np.array(members)
+        found = {n: [] for n in members.tolist()}
+        lows, highs = bounds[members, 0], bounds[members, 1]
+        for higher_tf in reversed(present[ranks[tf] + 1:]):
+            entry = indexes.get((symbol, higher_tf))
+            if entry is None:
+                continue
+            higher, index = entry
+            queries, hits = index.overlaps(lows, highs)
+            contains = (bounds[higher[hits], 0] <= lows[queries]) & (bounds[higher[hits], 1] >= highs[queries])
+            for q, h, inside in zip(queries.tolist(), higher[hits].tolist(), contains.tolist()):
+                found[int(members[q])].append((zones[h], CONTAINS if inside else OVERLAPS))
+        matches.update(found)
+
+    return [(zone, matches[n]) for n, zone in enumerate(zones) if n in matches]
+
+
+def confluence_columns(matches: List[Tuple[Zone, str]]) -> dict:
+    """Output columns describing a zone's higher-timeframe matches."""
+    return {
+        "HTF Contains": sum(relation == CONTAINS for _, relation in matches),
+        "HTF Overlaps": sum(relation == OVERLAPS for _, relation in matches),
+        "HTF Zones": "; ".join(f"{z.tf} {z.start} {z.stop_loss}-{z.entry} {relation}" for z, relation in matches),
+    }
+
+
+def write_confluence(joined: List[Tuple[Zone, List[Tuple[Zone, str]]]], path: str, fmt: str = "csv") -> int:
+    """Write every joined zone with its confluence columns first; returns the zones written."""
+    with ZoneWriter(path, fmt) as writer:
+        for zone, matches in joined:
+            writer.write([zone], confluence_columns(matches))
+    return writer.count
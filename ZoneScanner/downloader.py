@@ -0,0 +1,164 @@
+import time
+import random
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import pandas as pd
+from ZoneScanner.instrumentation import stats
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: allows `rate` acquisitions per second on average,
+    with bursts of up to `capacity`. A rate of 0 or less disables limiting.
+    `clock` and `sleep` default to time.monotonic and time.sleep.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = self.capacity
+        self._last = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            self.sleep(wait)
+
+
+def _default_download_fn(*args, **kwargs) -> pd.DataFrame:
+    import yfinance as yf
+    return yf.download(*args, **kwargs)
+
+
+def split_batch_frame(df: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Split a multi-ticker yfinance frame into one OHLCV frame per symbol.
+    Handles both (Ticker, Price) and (Price, Ticker) column layouts.
+    """
+    frames = {symbol: pd.DataFrame() for symbol in symbols}
+    if df is None or df.empty:
+        return frames
+
+    if not isinstance(df.columns, pd.MultiIndex):
+        # A single-ticker batch may come back with flat columns
+        if len(symbols) == 1:
+            frames[symbols[0]] = df
+        return frames
+
+    level = 0 if any(s in df.columns.get_level_values(0) for s in symbols) else 1
+    for symbol in symbols:
+        if symbol not in df.columns.get_level_values(level):
+            continue
+        sub = df.xs(symbol, axis=1, level=level).dropna(how="all")
+        frames[symbol] = sub
+    return frames
+
+
+class OHLCDownloader:
+    """
+    Concurrent OHLC downloader with a bounded thread pool, token-bucket rate limiting,
+    retry with exponential backoff and optional multi-ticker batch requests.
+
+    `download_fn` has the signature of `yf.download` and can be replaced by a local
+    fake for offline runs; `clock` and `sleep` drive the rate limit and backoff waits.
+    """
+
+    def __init__(self,
+                 max_workers: int = 4,
+                 rate_limit: float = 2.0,
+                 burst: Optional[float] = None,
+                 retries: int = 3,
+                 backoff: float = 1.0,
+                 batch_size: int = 0,
+                 download_fn: Optional[Callable[..., pd.DataFrame]] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        self.max_workers = max(1, max_workers)
+        self.bucket = TokenBucket(rate_limit, burst if burst is not None else self.max_workers, clock, sleep)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.batch_size = batch_size
+        self.download_fn = download_fn or _default_download_fn
+        self.sleep = sleep
+
+    def _call_with_retry(self, tickers, interval: str, period: str, start=None, **kwargs) -> pd.DataFrame:
+        # An explicit start date (incremental refresh) replaces the period
+        window = {"start": start} if start is not None else {"period": period}
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            try:
+                with stats.timer("download", interval, tickers if isinstance(tickers, str) else None):
+                    df = self.download_fn(
+                        tickers, interval=interval, auto_adjust=False, progress=False, **window, **kwargs
+                    )
+                stats.count("download_requests", tf=interval)
+                if df is not None:
+                    # Decoded size of the returned frame; yfinance does not expose wire bytes
+                    stats.count("bytes_downloaded", int(df.memory_usage(index=True).sum()), tf=interval)
+                return df
+            except Exception as e:
+                stats.count("download_errors", tf=interval)
+                if attempt >= self.retries:
+                    raise
+                delay = self.backoff * (2 ** attempt) * (1 + random.random() * 0.25)
+                logging.warning(f"🔁 Retry {attempt + 1}/{self.retries} for {tickers} in {delay:.1f}s – {type(e).__name__}: {e}")
+                self.sleep(delay)
+                attempt += 1
+
+    def download(self, symbol: str, interval: str, period: str, start=None) -> pd.DataFrame:
+        return self._call_with_retry(symbol, interval, period, start=start)
+
+    def _fetch_job(self, job: List[str], interval: str, period: str, starts: Optional[dict]) -> Dict[str, pd.DataFrame]:
+        if self.batch_size <= 1:
+            return {job[0]: self.download(job[0], interval, period, start=(starts or {}).get(job[0]))}
+        # A batch shares one request window, so it starts at the earliest symbol's start
+        job_starts = [starts[s] for s in job if starts and starts.get(s) is not None]
+        start = min(job_starts) if job_starts and len(job_starts) == len(job) else None
+        df = self._call_with_retry(job, interval, period, start=start, group_by="ticker", threads=False)
+        return split_batch_frame(df, job)
+
+    def download_many(self, symbols: List[str], interval: str, period: str,
+                      starts: Optional[Dict[str, pd.Timestamp]] = None) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Submit all downloads immediately and return an iterator that yields
+        (symbol, frame) pairs in completion order. Failed symbols yield an empty frame.
+        `starts` optionally maps symbols to a start date for incremental downloads.
+        """
+        if self.batch_size > 1:
+            jobs = [symbols[i:i + self.batch_size] for i in range(0, len(symbols), self.batch_size)]
+        else:
+            jobs = [[s] for s in symbols]
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ohlc-download")
+        futures = {pool.submit(self._fetch_job, job, interval, period, starts): job for job in jobs}
+        return self._drain(pool, futures)
+
+    def _drain(self, pool: ThreadPoolExecutor, futures: dict) -> Iterator[Tuple[str, pd.DataFrame]]:
+        try:
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    frames = future.result()
+                except Exception as e:
+                    logging.warning(f"❌ Download failed for {', '.join(job)} – {type(e).__name__}: {e}")
+                    frames = {}
+                for symbol in job:
+                    yield symbol, frames.get(symbol, pd.DataFrame())
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -1,16 +1,16 @@
 import pandas as pd
 import argparse
 from typing import List, Optional
-from stockfetcher.fetcher import StockFetcher
+from ZoneScanner.universe import get_universe
 import os
 import logging
 
-def fetch_stocks(limit: int = 5, sectors: Optional[List[str]] = None) -> pd.DataFrame:
-    csv_file = 'StockList.csv'
-
+def fetch_stocks(limit: int = 5, sectors: Optional[List[str]] = None, csv_file: str = 'StockList.csv') -> pd.DataFrame:
     if os.path.exists(csv_file):
         df = pd.read_csv(csv_file)
     else:
+        # The crawl dependency is only needed when StockList.csv has to be built
+        from stockfetcher.fetcher import StockFetcher
         fetcher = StockFetcher(sectors=sectors, exchange='nse')
         df = fetcher.collect_data(nse_limit=None, mode='shariah')
         required_columns = [
@@ -30,18 +30,21 @@ def fetch_stocks(limit: int = 5, sectors: Optional[List[str]] = None) -> pd.Data
 
     return df.head(limit)[['YahooSymbol']]
 
-def get_symbol_list(csv_path: str = "StockList.csv", sectors: Optional[List[str]] = None) -> List[str]:
+def get_symbol_list(csv_path: str = "StockList.csv", sectors: Optional[List[str]] = None,
+                    industries: Optional[List[str]] = None) -> List[str]:
     try:
-        df = fetch_stocks(limit=None, sectors=sectors)
-        return df['YahooSymbol'].dropna().astype(str).tolist()
+        return get_universe(csv_path or "StockList.csv", sectors).symbols(sectors=sectors, industries=industries)
     except Exception as e:
         logging.warning(f"Failed to fetch symbols: {e}. Using hardcoded symbols.")
         return ["RELIANCE.NS", "ITC.NS"]
 
-if __name__ == "__main__":
+def main():
     parser = argparse.ArgumentParser(description="Fetch stock symbols")
     parser.add_argument("--limit", type=int, default=5, help="Limit the number of symbols")
     parser.add_argument("--sector", type=str, action="append", help="Filter by sector(s)")
     args = parser.parse_args()
     result = fetch_stocks(args.limit, args.sector)
     print(result)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+import os
+import json
+import logging
+import numpy as np
+import pandas as pd
+from ZoneScanner.support_resistance import scan_levels, finalize_levels
+from ZoneScanner.zone import Zone, wall_time_ns
+from ZoneScanner.zone_detector import _build_zone, _candle_arrays, detect_zones_vectorized
+
+# Bump when the persisted layout changes; older states are rebuilt (v2: sorted S/R level lists)
+STATE_VERSION = 2
+SR_SWING = 2
+SR_TOLERANCE = 0.015
+
+
+class IncrementalZoneDetector:
+    """
+    Keeps a persisted per symbol-timeframe detection state so a daily run only
+    processes the bars added since the last run.
+
+    The state holds the number of processed bars, every candidate pattern that can
+    still produce a zone (with its running min-low since the leg-out and its green
+    run), and the raw support/resistance levels found so far. Updating costs
+    O(new bars + live zones). The last bar is treated as still forming: it is
+    applied for the current output but not persisted, so a corrected bar on the
+    next refresh is picked up. If the cached history no longer matches the state
+    (e.g. after a re-download), the state is rebuilt from scratch.
+
+    `verify` compares the result with a full `detect_zones_vectorized` recompute.
+    """
+
+    def __init__(self, state_dir: str = "zone_state", fresh_only: bool = True, min_base: int = 1, max_base: int = 3,
+                 distance_range=(1.0, 5.0)):
+        self.state_dir = state_dir
+        self.fresh_only = fresh_only
+        self.min_base = min_base
+        self.max_base = max_base
+        self.distance_range = distance_range
+        os.makedirs(self.state_dir, exist_ok=True)
+
+    def _params(self) -> dict:
+        return {"version": STATE_VERSION, "fresh_only": self.fresh_only, "min_base": self.min_base, "max_base": self.max_base}
+
+    def _state_path(self, symbol: str, tf: str) -> str:
+        return os.path.join(self.state_dir, f"{symbol}_{tf}.state.json")
+
+    def _empty_state(self) -> dict:
+        return {
+            "params": self._params(),
+            "n": 0,
+            "last_bar": None,
+            "last_ohlc": None,
+            "candidates": [],
+            "support": [],
+            "resistance": [],
+            "next_pivot": SR_SWING,
+        }
+
+    def load_state(self, symbol: str, tf: str):
+        try:
+            with open(self._state_path(symbol, tf), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_state(self, symbol: str, tf: str, state: dict) -> None:
+        tmp_path = self._state_path(symbol, tf) + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self._state_path(symbol, tf))
+
+    def _matches(self, state, df: pd.DataFrame) -> bool:
+        """The state is reusable when its parameters match and its last bar is unchanged."""
+        if state is None or state.get("params") != self._params():
+            return False
+        n0 = state["n"]
+        if n0 == 0:
+            return True
+        if n0 > len(df):
+            return False
+        row = df.iloc[n0 - 1]
+        ohlc = [float(row[col]) for col in ("Open", "High", "Low", "Close")]
+        return pd.Timestamp(df.index[n0 - 1]).isoformat() == state["last_bar"] and ohlc == state["last_ohlc"]
+
+    def _advance(self, state: dict, df: pd.DataFrame, n: int) -> dict:
+        """Extend `state` (in place) from its processed bar count to the first `n` bars of df."""
+        n0 = state["n"]
+        if n <= n0:
+            return state
+
+        # Enough history before n0 to re-check patterns that only became eligible now
+        lo = max(0, n0 - (self.max_base + 6))
+        arr = _candle_arrays(df.iloc[lo:n])
+        l, c, v = arr["Low"], arr["Close"], arr["Volume"]
+        body, strong, base_count = arr["body"], arr["strong"], arr["base_count"]
+        low_suffix_min, green_run = arr["low_suffix_min"], arr["green_run"]
+
+        # === Existing candidates: fold in the new bars ===
+        if state["candidates"]:
+            new_low_min = float(np.fmin.reduce(l[n0 - lo:]))
+            new_green = int(green_run[n0 - lo])
+            for cand in state["candidates"]:
+                cand["min_low_after"] = float(np.fmin(cand["min_low_after"], new_low_min))
+                if cand["green_open"]:
+                    cand["green"] += new_green
+                    cand["green_open"] = new_green == n - n0
+
+        # === New candidates: patterns that became eligible with the new bars ===
+        for base_len in range(self.max_base, self.min_base - 1, -1):
+            first = max(3, min(n0 - 4, n0 - base_len - 1))
+            stop = min(n - 4, n - base_len - 1)
+            if stop <= first:
+                continue
+            rel = np.arange(first, stop) - lo
+            mask = (base_count[rel + base_len] - base_count[rel]) == base_len
+            mask &= strong[rel - 1] & strong[rel + base_len]
+            rel = rel[mask]
+            if rel.size == 0:
+                continue
+
+            windows = rel[:, None] + np.arange(base_len)
+            proximal = np.nanmax(c[windows], axis=1)
+            distal = np.nanmin(l[windows], axis=1)
+
+            base_vol_window = v[windows]
+            vol_counts = np.sum(~np.isnan(base_vol_window), axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                base_vol = np.where(vol_counts > 0, np.nansum(base_vol_window, axis=1) / vol_counts, np.nan)
+                vol_spike = (base_vol > 0) & (v[rel + base_len] > 1.5 * base_vol)
+
+            after = rel + base_len + 1
+            for j, r in enumerate(rel):
+                green = int(green_run[after[j]])
+                state["candidates"].append({
+                    "i": int(r + lo),
+                    "base_len": base_len,
+                    "proximal": float(proximal[j]),
+                    "distal": float(distal[j]),
+                    "leg_in_strength": float(abs(body[r - 1])),
+                    "leg_out_strength": float(body[r + base_len]),
+                    "vol_spike": bool(vol_spike[j]),
+                    "min_low_after": float(low_suffix_min[after[j]]),
+                    "green": green,
+                    "green_open": bool(after[j] + green == len(l)),
+                })
+
+        # Freshness never comes back, so drop candidates that can no longer produce a zone
+        state["candidates"] = [cand for cand in state["candidates"] if self._can_emit(cand)]
+
+        # === Support/Resistance: scan pivots that now have enough right-hand neighbours ===
+        scan_levels(arr["High"], l, state["next_pivot"] - lo, n - lo, state["support"], state["resistance"],
+                    SR_SWING, SR_TOLERANCE)
+        state["next_pivot"] = max(state["next_pivot"], n - SR_SWING)
+
+        row = df.iloc[n - 1]
+        state["n"] = n
+        state["last_bar"] = pd.Timestamp(df.index[n - 1]).isoformat()
+        state["last_ohlc"] = [float(row[col]) for col in ("Open", "High", "Low", "Close")]
+        return state
+
+    def _can_emit(self, cand: dict) -> bool:
+        if not (cand["min_low_after"] <= cand["proximal"]):
+            return True
+        if self.fresh_only:
+            return False
+        strength = 2 if cand["leg_out_strength"] > 2 * cand["leg_in_strength"] else 1
+        return 1 + strength + (1 if cand["vol_spike"] else 0) >= 3
+
+    def _zones(self, state: dict, df: pd.DataFrame, tf: str, symbol: str) -> list[Zone]:
+        if len(df) < 8 or not state["candidates"]:
+            return []
+
+        cmp = float(df["Close"].iloc[-1])
+        dates = None
+        levels = None
+        zones = []
+        for cand in sorted(state["candidates"], key=lambda cand: (cand["i"], -cand["base_len"])):
+            i, base_len = cand["i"], cand["base_len"]
+            proximal, distal = cand["proximal"], cand["distal"]
+            fresh = not (cand["min_low_after"] <= proximal)
+            if self.fresh_only and not fresh:
+                continue
+
+            strength = 2 if cand["leg_out_strength"] > 2 * cand["leg_in_strength"] else 1
+            score = (2 if fresh else 1) + strength + (1 if cand["vol_spike"] else 0)
+            if score < 3:
+                continue
+
+            distance_pct = round(((cmp - proximal) / cmp) * 100, 2)
+            stop_loss_pct = round(((proximal - distal) / proximal) * 100, 2)
+            if distance_pct < self.distance_range[0] or distance_pct > self.distance_range[1]:
+                continue
+
+            if levels is None:
+                levels = finalize_levels(state["support"], state["resistance"])
+                dates = wall_time_ns(df["Date"])
+
+            zone = _build_zone(
+                symbol, tf, proximal, distal,
+                index=i,
+                fresh=fresh,
+                score=score,
+                leg_out_strength=cand["leg_out_strength"],
+                base_len=base_len,
+                green_after_legout=cand["green"],
+                dates=dates[i - 1:i + base_len + 1].tolist(),
+                distance_pct=distance_pct,
+                stop_loss_pct=stop_loss_pct,
+                all_supports=levels["Support"],
+                all_resistances=levels["Resistance"],
+            )
+            if zone is not None:
+                zones.append(zone)
+        return zones
+
+    def update(self, df: pd.DataFrame, tf: str, symbol: str) -> list[Zone]:
+        """
+        Bring the persisted state up to date with `df` and return the current zones,
+        identical to `detect_zones_vectorized` on the full frame.
+        """
+        if not isinstance(df.index, pd.DatetimeIndex) or "Date" not in df.columns:
+            df = df.copy()
+            df.index = pd.to_datetime(df.index)
+            if "Date" not in df.columns:
+                df["Date"] = df.index
+
+        state = self.load_state(symbol, tf)
+        if not self._matches(state, df):
+            if state is not None:
+                logging.info(f"♻️ Rebuilding zone state for {symbol} [{tf}]")
+            state = self._empty_state()
+
+        n = len(df)
+        committed = self._advance(state, df, n - 1) if n - 1 > state["n"] else state
+        self.save_state(symbol, tf, committed)
+
+        current = {
+            **committed,
+            "candidates": [dict(cand) for cand in committed["candidates"]],
+            "support": list(committed["support"]),
+            "resistance": list(committed["resistance"]),
+        }
+        current = self._advance(current, df, n)
+        return self._zones(current, df, tf, symbol)
+
+    def verify(self, df: pd.DataFrame, tf: str, symbol: str) -> bool:
+        """Check the incremental result against a full recompute of the same frame."""
+        full = detect_zones_vectorized(df, tf, symbol, self.fresh_only, self.min_base, self.max_base, self.distance_range)
+        return self.update(df, tf, symbol) == full
@@ -0,0 +1,167 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+import numpy as np
+
+# Stages timed once per symbol; their sum ranks the slowest symbols in the report
+SYMBOL_STAGES = ("load", "detect")
+
+
+def _summary(samples) -> dict:
+    values = np.asarray(samples, dtype="float64")
+    return {
+        "count": int(values.size),
+        "total": round(float(values.sum()), 6),
+        "mean": round(float(values.mean()), 6),
+        "p50": round(float(np.percentile(values, 50)), 6),
+        "p95": round(float(np.percentile(values, 95)), 6),
+        "max": round(float(values.max()), 6),
+    }
+
+
+class RunStats:
+    """
+    Thread-safe stage timers and counters for one scan run.
+
+    `timer(stage, tf, symbol)` records a duration sample for the stage (per
+    timeframe) and adds it to the symbol's total; `count(name, n, tf)` bumps a
+    counter. Inside `collect()` the current thread records into a fresh child
+    instead, whose `export()` can be sent back from a worker process and folded in
+    with `merge()`. `report()` builds the JSON run report.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.samples = defaultdict(list)
+            self.counters = defaultdict(int)
+            self.symbols = defaultdict(float)
+            self.started = datetime.now()
+
+    def _target(self) -> "RunStats":
+        stack = getattr(self._local, "stack", None)
+        return stack[-1] if stack else self
+
+    def record(self, stage: str, seconds: float, tf: Optional[str] = None, symbol: Optional[str] = None):
+        target = self._target()
+        with target._lock:
+            target.samples[(stage, tf)].append(seconds)
+            if symbol is not None:
+                target.symbols[(symbol, tf, stage)] += seconds
+
+    def count(self, name: str, n: int = 1, tf: Optional[str] = None):
+        target = self._target()
+        with target._lock:
+            target.counters[(name, tf)] += n
+
+    @contextmanager
+    def timer(self, stage: str, tf: Optional[str] = None, symbol: Optional[str] = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, tf, symbol)
+
+    @contextmanager
+    def collect(self):
+        """Record this thread's timers and counters into a separate RunStats."""
+        child = RunStats()
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        self._local.stack.append(child)
+        try:
+            yield child
+        finally:
+            self._local.stack.pop()
+
+    def export(self) -> dict:
+        with self._lock:
+            return {
+                "samples": [[stage, tf, values] for (stage, tf), values in self.samples.items()],
+                "counters": [[name, tf, n] for (name, tf), n in self.counters.items()],
+                "symbols": [[symbol, tf, stage, s] for (symbol, tf, stage), s in self.symbols.items()],
+            }
+
+    def merge(self, exported: Optional[dict]):
+        if not exported:
+            return
+        target = self._target()
+        with target._lock:
+            for stage, tf, values in exported["samples"]:
+                target.samples[(stage, tf)].extend(values)
+            for name, tf, n in exported["counters"]:
+                target.counters[(name, tf)] += n
+            for symbol, tf, stage, seconds in exported["symbols"]:
+                target.symbols[(symbol, tf, stage)] += seconds
+
+    def total(self, name: str) -> int:
+        return sum(n for (counter, _), n in self.counters.items() if counter == name)
+
+    def report(self, slowest: int = 20, **extra) -> dict:
+        with self._lock:
+            samples = {key: list(values) for key, values in self.samples.items()}
+            counters = dict(self.counters)
+            symbols = dict(self.symbols)
+
+        stages = {}
+        for stage in sorted({stage for stage, _ in samples}):
+            merged = [s for (name, _), values in samples.items() if name == stage for s in values]
+            stages[stage] = _summary(merged)
+            stages[stage]["by_tf"] = {
+                tf: _summary(values) for (name, tf), values in samples.items() if name == stage and tf is not None
+            }
+
+        counter_report = {}
+        for (name, tf), n in sorted(counters.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+            entry = counter_report.setdefault(name, {"total": 0, "by_tf": {}})
+            entry["total"] += n
+            if tf is not None:
+                entry["by_tf"][tf] = n
+
+        per_symbol = defaultdict(dict)
+        for (symbol, tf, stage), seconds in symbols.items():
+            per_symbol[(symbol, tf)][stage] = round(seconds, 6)
+        ranked = sorted(per_symbol.items(), key=lambda item: -sum(item[1].get(s, 0.0) for s in SYMBOL_STAGES))
+
+        hits = self.total("cache_hits")
+        misses = self.total("cache_misses")
+        refreshes = self.total("cache_refreshes")
+        lookups = hits + misses + refreshes
+        finished = datetime.now()
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "finished": finished.isoformat(timespec="seconds"),
+            "wall_seconds": round((finished - self.started).total_seconds(), 3),
+            **extra,
+            "cache": {
+                "hits": hits,
+                "misses": misses,
+                "refreshes": refreshes,
+                "hit_rate": round(hits / lookups, 4) if lookups else None,
+            },
+            "bytes_downloaded": self.total("bytes_downloaded"),
+            "stages": stages,
+            "counters": counter_report,
+            "slowest_symbols": [
+                {"symbol": symbol, "tf": tf, "seconds": round(sum(times.get(s, 0.0) for s in SYMBOL_STAGES), 6), "stages": times}
+                for (symbol, tf), times in ranked[:slowest]
+            ],
+        }
+
+    def write_report(self, path: str, **extra) -> dict:
+        report = self.report(**extra)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, default=str)
+        return report
+
+
+# Shared by every module of a run; worker processes send theirs back via export()
+stats = RunStats()
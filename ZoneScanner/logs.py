@@ -0,0 +1,235 @@
+import os
+import sys
+import json
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Per-symbol status lines (cache hits, downloads, refreshes) sit between DEBUG and
+# INFO, so the "info" level silences them without hiding warnings or run summaries
+PROGRESS = 15
+logging.addLevelName(PROGRESS, "PROGRESS")
+
+LOG_LEVELS = {"progress": PROGRESS, "info": logging.INFO, "warning": logging.WARNING}
+LOG_FORMATS = ("text", "json")
+TEXT_FORMAT = "%(asctime)s [%(levelname)s] %(message)s"
+
+# A log file rolls over at this size, keeping LOG_BACKUPS older parts
+LOG_MAX_BYTES = 50 * 1024 * 1024
+LOG_BACKUPS = 5
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listeners = []
+_pool_queue = None
+_exit_registered = False
+
+
+def progress(message: str, **fields) -> None:
+    """Log a per-symbol status line at PROGRESS level; `fields` become JSON keys."""
+    root = logging.getLogger()
+    if root.isEnabledFor(PROGRESS):
+        # Built directly, skipping the caller-frame lookup: no output format uses the source line
+        root.handle(root.makeRecord(root.name, PROGRESS, "", 0, message, None, None, extra=fields or None))
+
+
+class ConsoleFormatter(logging.Formatter):
+    """The timestamped text format, except PROGRESS lines, which print bare."""
+
+    def format(self, record):
+        if record.levelno == PROGRESS:
+            return record.getMessage()
+        return super().format(record)
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per record: time, level, message (with any traceback), process
+    and any `extra` fields.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "process": record.process,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_FIELDS:
+                entry[key] = value
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def prune_logs(log_dir: str, retention_days: int) -> int:
+    """Delete files in `log_dir` last modified more than `retention_days` ago; returns how many."""
+    now = datetime.now()
+    removed = 0
+    for name in os.listdir(log_dir):
+        path = os.path.join(log_dir, name)
+        try:
+            if os.path.isfile(path) and (now - datetime.fromtimestamp(os.path.getmtime(path))).days > retention_days:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            # Another run pruning the same directory got there first
+            continue
+    return removed
+
+
+class ListenerStreamHandler(logging.StreamHandler):
+    """Console handler for a BatchingListener: writes without flushing every record."""
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class RetentionFileHandler(RotatingFileHandler):
+    """
+    Size-rotated log file for a BatchingListener that prunes expired logs from its
+    directory after each rollover. Records are not flushed one by one, and the size
+    is counted as lines are written instead of formatting each record twice and
+    asking the file for its position, as RotatingFileHandler does.
+    """
+
+    def __init__(self, path: str, retention_days: int, **kwargs):
+        super().__init__(path, **kwargs)
+        self.retention_days = retention_days
+        self.written = os.path.getsize(path) if os.path.exists(path) else 0
+
+    def emit(self, record):
+        try:
+            line = self.format(record) + self.terminator
+            size = len(line.encode("utf-8"))
+            if self.maxBytes and self.written and self.written + size > self.maxBytes:
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(line)
+            self.written += size
+        except Exception:
+            self.handleError(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.written = 0
+        prune_logs(os.path.dirname(self.baseFilename) or ".", self.retention_days)
+
+
+class RecordQueueHandler(QueueHandler):
+    """
+    QueueHandler that finishes records in place instead of copying them: the message
+    (with any traceback) is formatted on the logging thread, everything else on the
+    listener's.
+    """
+
+    def prepare(self, record):
+        message = self.format(record)
+        record.message = message
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        record.stack_info = None
+        return record
+
+
+class BatchingListener(QueueListener):
+    """QueueListener that flushes its handlers once the queue runs dry rather than per record."""
+
+    def dequeue(self, block):
+        try:
+            return self.queue.get(block=False)
+        except queue.Empty:
+            for handler in self.handlers:
+                handler.flush()
+            return self.queue.get(block)
+
+
+def start_logging(log_path: str, level: int = PROGRESS, fmt: str = "text", stream=None,
+                  retention_days: int = 7) -> QueueListener:
+    """
+    Point the root logger at a queue that a background listener drains into the log
+    file (text or JSON lines, rotated by size) and the console (`stream`, default
+    stdout). Logging calls only enqueue, and records below `level` are dropped before
+    a record is even built. Expired logs next to `log_path` are pruned on a
+    background thread. Replaces any configuration from an earlier call.
+    """
+    global _exit_registered
+    if fmt not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format '{fmt}'. Choose from: {', '.join(LOG_FORMATS)}")
+    stop_logging()
+
+    file_handler = RetentionFileHandler(log_path, retention_days, maxBytes=LOG_MAX_BYTES,
+                                        backupCount=LOG_BACKUPS, encoding="utf-8")
+    file_handler.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+    console_handler = ListenerStreamHandler(stream or sys.stdout)
+    console_handler.setFormatter(ConsoleFormatter(TEXT_FORMAT))
+
+    records = queue.SimpleQueue()
+    listener = BatchingListener(records, file_handler, console_handler, respect_handler_level=True)
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.setLevel(level)
+    root.addHandler(RecordQueueHandler(records))
+    listener.start()
+    _listeners.append(listener)
+    if not _exit_registered:
+        atexit.register(stop_logging)
+        _exit_registered = True
+
+    log_dir = os.path.dirname(log_path) or "."
+    threading.Thread(target=prune_logs, args=(log_dir, retention_days), name="log-retention", daemon=True).start()
+    return listener
+
+
+def stop_logging() -> None:
+    """Flush every queued record, stop the listeners and close their handlers."""
+    global _pool_queue
+    handlers = _listeners[-1].handlers if _listeners else ()
+    # Worker records are drained first, while the handlers they share are still open
+    while _listeners:
+        _listeners.pop(0).stop()
+    for handler in handlers:
+        handler.flush()
+        handler.close()
+    root = logging.getLogger()
+    for handler in [h for h in root.handlers if isinstance(h, QueueHandler)]:
+        root.removeHandler(handler)
+    if _pool_queue is not None:
+        _pool_queue.close()
+        _pool_queue.join_thread()
+        _pool_queue = None
+
+
+def init_worker(records, level: int) -> None:
+    """Process pool initializer: send this worker's records to the parent's listener."""
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.setLevel(level)
+    root.addHandler(RecordQueueHandler(records))
+
+
+def pool_logging() -> dict:
+    """
+    Keyword arguments for a ProcessPoolExecutor whose workers should log through
+    this process's handlers; empty unless start_logging is active. The
+    multiprocessing queue and its listener are created on first use.
+    """
+    global _pool_queue
+    if not _listeners:
+        return {}
+    if _pool_queue is None:
+        import multiprocessing
+        _pool_queue = multiprocessing.Queue()
+        listener = BatchingListener(_pool_queue, *_listeners[-1].handlers, respect_handler_level=True)
+        listener.start()
+        _listeners.insert(0, listener)
+    return {"initializer": init_worker, "initargs": (_pool_queue, logging.getLogger().level)}
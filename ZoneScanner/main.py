@@ -3,102 +3,247 @@ import os
 import sys
 import logging
 import io
-from datetime import datetime
-from ZoneScanner.stock_scanner import StockScanner
-from ZoneScanner.fetch import get_symbol_list
+import cProfile
+import pstats
+import itertools
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from ZoneScanner.logs import LOG_FORMATS, LOG_LEVELS, pool_logging, start_logging
+from ZoneScanner.results import RESULT_FORMATS
 
 # Example
 # demandzone --tf 1wk --symbol NH.NS --limit 5 --fresh --distance-range 1 5 --min-base 1 --max-base 3
 # demandzone --tf 1wk --limit 5 --fresh --distance-range 1 5 --min-base 1 --max-base 3
+# demandzone --tf 1d --limit 50 --sweep-fresh --distance-range 1 5 1 8 --min-base 1 2 --max-base 3 5
+
+# Same keys as cache.CACHE_BACKENDS, listed here so --help does not have to import pandas
+CACHE_FORMATS = ("csv", "npy", "feather")
+# Same as quality.QUALITY_MODES
+QUALITY_MODES = ("off", "flag", "repair")
 
 LOG_DIR = "logs"
 LOG_RETENTION_DAYS = 7
 
-def setup_logging():
+def setup_logging(level: str = "progress", fmt: str = "text") -> str:
+    """
+    Log to logs/scanner_{timestamp}.log (.jsonl with fmt="json") and the console
+    through a background queue listener (see logs.start_logging). The "info" and
+    "warning" levels silence the per-symbol progress lines.
+    """
     # 💡 Force stdout/stderr to use UTF-8 and avoid UnicodeEncodeError
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, "reconfigure"):
+            stream.reconfigure(encoding="utf-8", errors="replace")
 
     os.makedirs(LOG_DIR, exist_ok=True)
     now = datetime.now()
+    extension = "jsonl" if fmt == "json" else "log"
+    log_path = os.path.join(LOG_DIR, f"scanner_{now.strftime('%Y%m%d_%H%M%S')}.{extension}")
+    start_logging(log_path, LOG_LEVELS[level], fmt, retention_days=LOG_RETENTION_DAYS)
 
-    # Delete old log files
-    for f in os.listdir(LOG_DIR):
-        path = os.path.join(LOG_DIR, f)
-        if os.path.isfile(path):
-            mod_time = datetime.fromtimestamp(os.path.getmtime(path))
-            if (now - mod_time).days > LOG_RETENTION_DAYS:
-                os.remove(path)
+    logging.info(f"📋 Logging to: {log_path}")
+    return log_path
 
-    log_path = os.path.join(LOG_DIR, f"scanner_{now.strftime('%Y%m%d_%H%M%S')}.log")
 
-    # Reset logging (important if previous logging was already configured)
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
-    root_logger.handlers.clear()
+def parameter_grid(args) -> list:
+    """Every detection parameter combination asked for on the command line."""
+    from ZoneScanner.zone_detector import ZoneParams
+    fresh = [True, False] if args.sweep_fresh else [args.fresh]
+    ranges = [tuple(args.distance_range[i:i + 2]) for i in range(0, len(args.distance_range), 2)]
+    return [
+        ZoneParams(fresh_only, min_base, max_base, distance_range)
+        for fresh_only, min_base, max_base, distance_range in itertools.product(fresh, args.min_base, args.max_base, ranges)
+        if min_base <= max_base
+    ]
 
-    # File handler (UTF-8 safe)
-    file_handler = logging.FileHandler(log_path, encoding='utf-8')
-    file_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
 
-    # Console handler (safe with replacement)
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+def log_sweep_summary(scanners):
+    logging.info("\n============= SWEEP SUMMARY =============")
+    logging.info(f"{'fresh':<7}{'base':>6}{'distance':>12}" + "".join(f"{scanner.tf:>8}" for scanner in scanners))
+    for params in scanners[0].sweep:
+        lo, hi = params.distance_range
+        counts = "".join(f"{scanner.sweep_counts.get(params, 0):>8}" for scanner in scanners)
+        logging.info(f"{str(params.fresh_only):<7}{f'{params.min_base}-{params.max_base}':>6}{f'{lo:g}-{hi:g}%':>12}{counts}")
 
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
 
-    logging.info(f"📋 Logging to: {log_path}")
-    return log_path
+def log_confluence(scanners, output_format: str):
+    from ZoneScanner.confluence import CONTAINS, find_confluence, write_confluence
+    from ZoneScanner.results import result_path
+    from ZoneScanner.instrumentation import stats
+
+    with stats.timer("confluence"):
+        joined = find_confluence(zone for scanner in scanners for zone in scanner.all_zones)
+    if not joined:
+        logging.info("🧭 Confluence needs zones on at least two timeframes")
+        return
+    path = result_path("confluence", output_format)
+    write_confluence(joined, path, output_format)
+    inside = [(zone, matches) for zone, matches in joined if any(relation == CONTAINS for _, relation in matches)]
+    logging.info(f"🧭 {len(inside)} of {len(joined)} lower-timeframe zones sit inside a higher-timeframe zone; saved to: {path}")
+    for zone, matches in sorted(inside, key=lambda item: -item[0].score)[:10]:
+        higher = ", ".join(f"{z.tf} {z.start}" for z, relation in matches if relation == CONTAINS)
+        logging.info(f"🧭 {zone.symbol} | {zone.tf} | Score: {zone.score} | Zone: {zone.entry} - {zone.stop_loss} | inside {higher}")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Demand Zone Screener")
     parser.add_argument("--tf", nargs="+", default=["1mo", "1wk", "1d"], help="Timeframes to scan")
     parser.add_argument("--plot", action="store_true", help="Enable chart plotting")
+    parser.add_argument("--plot-top", type=int, default=20, help="Charts for the best N zones per timeframe when plotting")
+    parser.add_argument("--plot-combined", action="store_true", help="Write one HTML page of charts per timeframe instead of one file per zone")
+    parser.add_argument("--plot-workers", type=int, default=4, help="Chart rendering processes when --workers is 0 (0 = in-process)")
     parser.add_argument("--fresh", action="store_true", help="Only include fresh zones")
     parser.add_argument("--symbol", type=str, help="Run for a single symbol only (e.g., TCS.NS)")
-    parser.add_argument("--distance-range", nargs=2, type=float, default=[1.0, 5.0], help="Valid zone distance percentage (e.g., 1 5)")
-    parser.add_argument("--min-base", type=int, default=1, help="Minimum base candle count")
-    parser.add_argument("--max-base", type=int, default=3, help="Maximum base candle count")
+    parser.add_argument("--distance-range", nargs="+", type=float, default=[1.0, 5.0], help="Valid zone distance percentage (e.g., 1 5); several pairs run a sweep")
+    parser.add_argument("--min-base", type=int, nargs="+", default=[1], help="Minimum base candle count; several values run a sweep")
+    parser.add_argument("--max-base", type=int, nargs="+", default=[3], help="Maximum base candle count; several values run a sweep")
+    parser.add_argument("--sweep-fresh", action="store_true", help="Evaluate both fresh-only and all zones in one sweep")
+    parser.add_argument("--confluence", action="store_true", help="Annotate lower-timeframe zones with the higher-timeframe zones they sit in")
     parser.add_argument("--sector", nargs="+", help="Filter by one or more sectors in StockList.csv (e.g., IT Energy)")
+    parser.add_argument("--industry", nargs="+", help="Filter by one or more industries in StockList.csv")
     parser.add_argument("--limit", type=int, help="Max number of symbols to scan")
     parser.add_argument("--no-cache", action="store_true", help="Force fresh OHLC data download, ignore CSV cache")
+    parser.add_argument("--download-workers", type=int, default=4, help="Max concurrent yfinance downloads")
+    parser.add_argument("--rate-limit", type=float, default=2.0, help="Max download requests per second (0 = unlimited)")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per download with exponential backoff")
+    parser.add_argument("--batch-size", type=int, default=0, help="Symbols per multi-ticker yfinance request (0 = one per request)")
+    parser.add_argument("--refresh", action="store_true", help="Append only new bars to stale cached data instead of re-downloading")
+    parser.add_argument("--refresh-max-age", type=float, default=12.0, help="Hours after which a cached symbol is considered stale")
+    parser.add_argument("--resample", action="store_true", help="Derive 1wk/1mo bars from the cached daily data instead of downloading them")
+    parser.add_argument("--incremental", action="store_true", help="Update persisted zone state with new bars only instead of re-detecting full history")
+    parser.add_argument("--cache-format", choices=list(CACHE_FORMATS), default="csv", help="OHLC cache format (csv, npy memory-mapped arrays, feather)")
+    parser.add_argument("--quality", choices=list(QUALITY_MODES), default="flag",
+                        help="Check downloaded bars before caching them: off, flag (report and quarantine unusable data) or repair (also fix what can be fixed)")
+    parser.add_argument("--quarantine-days", type=float, default=7.0, help="Days before a quarantined symbol is downloaded again")
+    parser.add_argument("--workers", type=int, default=0, help="Detection worker processes across symbols (0 = run in-process)")
+    parser.add_argument("--panel", type=int, default=0, help="Detect this many symbols at a time as one vectorized panel (0 = per symbol)")
+    parser.add_argument("--top", type=int, default=50, help="Best zones per timeframe to keep for the summary (0 = all)")
+    parser.add_argument("--no-result-cache", action="store_true", help="Re-run detection even for symbols whose data and settings are unchanged")
+    parser.add_argument("--result-cache-dir", default="zone_cache", help="Directory for cached detection results")
+    parser.add_argument("--result-cache-mb", type=float, default=256, help="Size limit of the result cache; least recently used entries are evicted")
+    parser.add_argument("--log-level", choices=list(LOG_LEVELS), default="progress", help="progress shows a line per symbol; info and warning silence them")
+    parser.add_argument("--log-format", choices=list(LOG_FORMATS), default="text", help="Log file format (text or JSON lines)")
+    parser.add_argument("--profile", action="store_true", help="Profile the scan with cProfile; stats are saved next to the log")
+    parser.add_argument("--output-format", choices=list(RESULT_FORMATS), default="csv", help="Zone output file format (csv or jsonl)")
 
     args = parser.parse_args()
-    setup_logging()
+    if len(args.distance_range) % 2:
+        parser.error("--distance-range takes pairs of values (min max)")
+    grid = parameter_grid(args)
+    if not grid:
+        parser.error("no --min-base / --max-base combination has min <= max")
+    if args.confluence and len(grid) > 1:
+        parser.error("--confluence does not combine with parameter sweeps")
+    log_path = setup_logging(args.log_level, args.log_format)
+
+    # Heavy imports (pandas, numpy) only once the arguments are valid
+    from ZoneScanner.stock_scanner import StockScanner
+    from ZoneScanner.downloader import OHLCDownloader
+    from ZoneScanner.cache import get_cache
+    from ZoneScanner.result_cache import ResultCache
+    from ZoneScanner.instrumentation import stats
+    from ZoneScanner.fetch import get_symbol_list
+    stats.reset()
     
     if args.symbol:
         symbols = [args.symbol]
     else:
-        symbols = get_symbol_list(csv_path="StockList.csv", sectors=args.sector)
+        with stats.timer("universe"):
+            symbols = get_symbol_list(csv_path="StockList.csv", sectors=args.sector, industries=args.industry)
         if args.limit:
             symbols = symbols[:args.limit]
     
-    all_zones = []
-    for tf in args.tf:
-        scanner = StockScanner(
+    downloader = OHLCDownloader(
+        max_workers=args.download_workers,
+        rate_limit=args.rate_limit,
+        retries=args.retries,
+        batch_size=args.batch_size,
+    )
+
+    cache = get_cache(args.cache_format)
+    result_cache = None
+    if not args.no_result_cache:
+        result_cache = ResultCache(args.result_cache_dir, max_bytes=int(args.result_cache_mb * 1024 * 1024))
+
+    scanners = [
+        StockScanner(
             tf=tf,
-            fresh_only=args.no_cache,
+            fresh_only=grid[0].fresh_only,
             plot=args.plot,
+            min_base=grid[0].min_base,
+            max_base=grid[0].max_base,
+            distance_range=grid[0].distance_range,
+            force_download=args.no_cache,
+            sweep=grid if len(grid) > 1 else None,
+            downloader=downloader,
+            cache=cache,
+            refresh=args.refresh,
+            refresh_max_age=timedelta(hours=args.refresh_max_age),
+            resample=args.resample,
+            incremental=args.incremental,
+            top_n=args.top or None,
+            output_format=args.output_format,
+            result_cache=result_cache,
+            plot_top=args.plot_top,
+            plot_combined=args.plot_combined,
+            plot_workers=args.plot_workers,
+            panel_size=args.panel,
+            collect_zones=args.confluence,
+            quality=args.quality,
+            quarantine_retry=timedelta(days=args.quarantine_days),
         )
-        scanner.run(
-            source_csv="StockList.csv" if not args.symbol else None,
-            sectors=args.sector,
-            symbols=symbols
-        )
-        if scanner.zones:
-            logging.info(f"Zones found in tf={tf}: {len(scanner.zones)}")
-            all_zones.extend(scanner.zones)
+        for tf in args.tf
+    ]
+
+    profiler = cProfile.Profile() if args.profile else None
+    if profiler is not None:
+        profiler.enable()
+
+    if args.workers > 0 and args.panel > 0:
+        logging.warning("⚠️ Panel detection runs in the main process; --workers only renders charts")
+    if args.workers > 0:
+        logging.info(f"⚙️ Running detection on {args.workers} worker processes")
+        with ProcessPoolExecutor(max_workers=args.workers, **pool_logging()) as executor:
+            for scanner in scanners:
+                scanner.run(symbols=symbols, executor=executor)
+    else:
+        for scanner in scanners:
+            scanner.run(
+                source_csv="StockList.csv" if not args.symbol else None,
+                sectors=args.sector,
+                industries=args.industry,
+                symbols=symbols
+            )
+
+    run_prefix = os.path.splitext(log_path)[0]
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(f"{run_prefix}.prof")
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(25)
+        logging.info(f"🧪 Profile saved to {run_prefix}.prof (main process only)\n{summary.getvalue()}")
+
+    if args.confluence:
+        log_confluence(scanners, args.output_format)
+
+    report = stats.write_report(f"{run_prefix}_report.json", timeframes=args.tf, symbols=len(symbols), workers=args.workers)
+    logging.info(f"⏱️ Run report saved to {run_prefix}_report.json (cache hit rate: {report['cache']['hit_rate']})")
+
+    if len(grid) > 1:
+        log_sweep_summary(scanners)
+
+    for scanner in scanners:
+        if scanner.zone_count:
+            logging.info(f"Zones found in tf={scanner.tf}: {scanner.zone_count}")
         else:
-            logging.info(f"⚠️ No zones found in tf={tf}")
+            logging.info(f"⚠️ No zones found in tf={scanner.tf}")
 
-    # Final summary log
+    # Final summary log: the best zones per timeframe, the full lists are in the output files
     logging.info("\n================ SUMMARY ================")
-    total_zones = 0
-    for zone in all_zones:
-        logging.info(f"{zone['Symbol']} | {zone['Timeframe']} | Score: {zone['Score']} | Zone: {zone['Entry']} - {zone['Stop Loss']} | Start: {zone['Start']}")
-        total_zones += 1
+    total_zones = sum(scanner.zone_count for scanner in scanners)
+    for scanner in scanners:
+        for zone in scanner.zones:
+            logging.info(f"{zone.symbol} | {zone.tf} | Score: {zone.score} | Zone: {zone.entry} - {zone.stop_loss} | Start: {zone.start}")
     if total_zones == 0:
         logging.info("⚠️ No valid zones detected.")
     else:
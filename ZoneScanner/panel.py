@@ -0,0 +1,199 @@
+import time
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+import pandas as pd
+from ZoneScanner.instrumentation import stats
+from ZoneScanner.support_resistance import finalize_levels, insert_levels, pivot_masks
+from ZoneScanner.zone import Zone, wall_time_ns
+from ZoneScanner.zone_detector import ZoneParams, _candle_masks, _zones_from_candidates
+
+PRICE_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+# Shortest history detect_zones_sweep scans
+MIN_BARS = 8
+
+# One pattern candidate of a panel row, as returned by _panel_candidates
+CANDIDATE_DTYPE = np.dtype([
+    ("row", np.int64), ("i", np.int64), ("base_len", np.int64), ("proximal", np.float64),
+    ("distal", np.float64), ("fresh", bool), ("score", np.int64), ("leg_out_strength", np.float64),
+])
+
+
+class Panel:
+    """
+    The frames of one timeframe as symbols × bars arrays. Each row is right-aligned
+    on the symbol's last bar and NaN-padded on the left, so column `offsets[r] + i`
+    holds bar `i` of symbol `r` and bar-relative pattern offsets mean the same thing
+    on every row.
+    """
+
+    def __init__(self, symbols: List[str], prices: Dict[str, np.ndarray], dates: np.ndarray, lengths: np.ndarray):
+        self.symbols = symbols
+        self.prices = prices
+        self.dates = dates
+        self.lengths = lengths
+        self.offsets = dates.shape[1] - lengths
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @property
+    def bars(self) -> int:
+        return self.dates.shape[1]
+
+    def bar_dates(self, row: int) -> np.ndarray:
+        return self.dates[row, self.offsets[row]:]
+
+
+def build_panel(frames: Iterable[Tuple[str, pd.DataFrame]]) -> Panel:
+    """Stack (symbol, frame) pairs into a Panel, in the order given."""
+    symbols, columns, dates = [], [], []
+    for symbol, df in frames:
+        symbols.append(symbol)
+        columns.append([df[col].to_numpy(dtype="float64") for col in PRICE_COLUMNS])
+        dates.append(wall_time_ns(df["Date"] if "Date" in df.columns else pd.to_datetime(df.index)))
+
+    lengths = np.array([len(d) for d in dates], dtype=np.int64)
+    bars = int(lengths.max()) if len(lengths) else 0
+    prices = {col: np.full((len(symbols), bars), np.nan) for col in PRICE_COLUMNS}
+    panel_dates = np.full((len(symbols), bars), np.iinfo(np.int64).min, dtype=np.int64)
+    for row, (values, row_dates) in enumerate(zip(columns, dates)):
+        start = bars - len(row_dates)
+        for col, column in zip(PRICE_COLUMNS, values):
+            prices[col][row, start:] = column
+        panel_dates[row, start:] = row_dates
+    return Panel(symbols, prices, panel_dates, lengths)
+
+
+def _panel_candidates(arr: dict, offsets: np.ndarray, lengths: np.ndarray, min_base: int, max_base: int,
+                      fresh_only: bool) -> np.ndarray:
+    """
+    The leg-in/base/leg-out match of _pattern_candidates over every row at once.
+    Returns one record per candidate scoring at least 3, with `i` relative to the
+    symbol's own first bar, sorted by row and then in detect_zones emission order.
+    """
+    l, c, v = arr["Low"], arr["Close"], arr["Volume"]
+    body, strong, base_count = arr["body"], arr["strong"], arr["base_count"]
+    low_suffix_min = arr["low_suffix_min"]
+    bars = l.shape[1]
+    # A row's first usable base start is its own bar 3; short rows are skipped entirely
+    first = np.where(lengths >= MIN_BARS, offsets + 3, bars)[:, None]
+
+    parts = []
+    for base_len in range(max_base, min_base - 1, -1):
+        stop = min(bars - 4, bars - base_len - 1)
+        if stop <= 3:
+            continue
+        idx = np.arange(3, stop)
+
+        # Column slices rather than fancy indexing keep these passes over the panel copy-free
+        mask = (base_count[:, 3 + base_len:stop + base_len] - base_count[:, 3:stop]) == base_len
+        mask &= strong[:, 2:stop - 1]
+        mask &= strong[:, 3 + base_len:stop + base_len]
+        mask &= idx >= first
+        rows, cols = np.nonzero(mask)
+        if rows.size == 0:
+            continue
+        cols = idx[cols]
+
+        windows = cols[:, None] + np.arange(base_len)
+        proximal = np.nanmax(c[rows[:, None], windows], axis=1)
+        distal = np.nanmin(l[rows[:, None], windows], axis=1)
+
+        fresh = ~(low_suffix_min[rows, cols + base_len + 1] <= proximal)
+        if fresh_only:
+            rows, cols, proximal, distal, fresh, windows = (
+                rows[fresh], cols[fresh], proximal[fresh], distal[fresh], fresh[fresh], windows[fresh])
+            if rows.size == 0:
+                continue
+
+        base_vol_window = v[rows[:, None], windows]
+        vol_counts = np.sum(~np.isnan(base_vol_window), axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            base_vol = np.where(vol_counts > 0, np.nansum(base_vol_window, axis=1) / vol_counts, np.nan)
+            leg_out_vol = v[rows, cols + base_len]
+            vol_spike = (base_vol > 0) & (leg_out_vol > 1.5 * base_vol)
+
+        leg_in_strength = np.abs(body[rows, cols - 1])
+        leg_out_strength = body[rows, cols + base_len]
+        score = np.where(fresh, 2, 1) + np.where(leg_out_strength > 2 * leg_in_strength, 2, 1) + vol_spike.astype(int)
+
+        keep = score >= 3
+        part = np.empty(int(keep.sum()), dtype=CANDIDATE_DTYPE)
+        part["row"] = rows[keep]
+        part["i"] = cols[keep] - offsets[rows[keep]]
+        part["base_len"] = base_len
+        part["proximal"] = proximal[keep]
+        part["distal"] = distal[keep]
+        part["fresh"] = fresh[keep]
+        part["score"] = score[keep]
+        part["leg_out_strength"] = leg_out_strength[keep]
+        parts.append(part)
+
+    if not parts:
+        return np.empty(0, dtype=CANDIDATE_DTYPE)
+    candidates = np.concatenate(parts)
+    return candidates[np.lexsort((-candidates["base_len"], candidates["i"], candidates["row"]))]
+
+
+def _row_levels(high: np.ndarray, low: np.ndarray, is_res: np.ndarray, is_sup: np.ndarray, idx: np.ndarray):
+    """detect_support_resistance for one panel row, from its precomputed pivot masks."""
+    support, resistance = [], []
+    insert_levels(support, resistance, high[idx[is_res]], low[idx[is_sup]])
+    return finalize_levels(support, resistance)
+
+
+def detect_zones_panel(frames, tf: str, param_sets=(ZoneParams(),)) -> Dict[str, Dict[ZoneParams, List[Zone]]]:
+    """
+    Detect zones for many symbols of one timeframe in one vectorized pass. The frames
+    (a Panel or (symbol, frame) pairs) are stacked into symbols × bars arrays; the
+    candle masks, freshness, green runs and swing pivots are computed for the whole
+    panel at once and candidates come out of np.nonzero. Only symbols with
+    candidates go through the per-zone S/R and sizing rules. Returns
+    {symbol: {params: zones}}, each equal to detect_zones_sweep on that frame.
+
+    Merging pivots into support/resistance levels stays a per-symbol loop: whether
+    a pivot becomes a level depends on the levels inserted before it. That merge is
+    the same work as in detect_zones_sweep and takes about half of a panel run, so
+    the panel is about 1.5-2x faster than the per-symbol loop on 500 daily symbols
+    (benchmarks/bench_detection.py prints both), not an order of magnitude.
+    """
+    param_sets = [ZoneParams(*p) for p in param_sets]
+    started = time.perf_counter()
+    panel = frames if isinstance(frames, Panel) else build_panel(frames)
+    stats.record("panel_build", time.perf_counter() - started, tf)
+    results = {symbol: {params: [] for params in param_sets} for symbol in panel.symbols}
+    if not len(panel) or not param_sets:
+        return results
+
+    started = time.perf_counter()
+    p = panel.prices
+    arr = _candle_masks(p["Open"], p["High"], p["Low"], p["Close"], p["Volume"])
+    candidates = _panel_candidates(
+        arr, panel.offsets, panel.lengths,
+        min(params.min_base for params in param_sets),
+        max(params.max_base for params in param_sets),
+        all(params.fresh_only for params in param_sets),
+    )
+    stats.record("candidates", time.perf_counter() - started, tf)
+    if not candidates.size:
+        return results
+
+    # Swing pivots for every row, in the same pass; levels are only merged per symbol
+    started = time.perf_counter()
+    idx, is_res, is_sup = pivot_masks(p["High"], p["Low"], 0, panel.bars)
+    stats.record("pivots", time.perf_counter() - started, tf)
+
+    rows, starts = np.unique(candidates["row"], return_index=True)
+    for row, records in zip(rows.tolist(), np.split(candidates, starts[1:])):
+        offset = int(panel.offsets[row])
+        cands = list(zip(records["i"].tolist(), records["base_len"].tolist(), records["proximal"].tolist(),
+                         records["distal"].tolist(), records["fresh"].tolist(), records["score"].tolist(),
+                         records["leg_out_strength"].tolist()))
+        results[panel.symbols[row]] = _zones_from_candidates(
+            cands, tf, panel.symbols[row], param_sets,
+            float(p["Close"][row, -1]), arr["green_run"][row, offset:],
+            lambda row=row: _row_levels(p["High"][row], p["Low"][row], is_res[row], is_sup[row], idx),
+            lambda row=row: panel.bar_dates(row),
+        )
+    return results
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Tuple
+from ZoneScanner.incremental import IncrementalZoneDetector
+from ZoneScanner.instrumentation import stats
+from ZoneScanner.zone_detector import ZoneParams, detect_zones_sweep, detect_zones_vectorized
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def frame_to_arrays(df: pd.DataFrame) -> Tuple[np.ndarray, Optional[str], List[str], np.ndarray]:
+    """
+    Pack an OHLCV frame into compact arrays for a worker process:
+    int64 nanosecond timestamps, the index timezone (if any), the column names
+    and a float64 (bars x columns) value matrix.
+    """
+    index = pd.DatetimeIndex(pd.to_datetime(df.index))
+    tz = str(index.tz) if index.tz is not None else None
+    columns = [col for col in OHLCV_COLUMNS if col in df.columns]
+    values = np.ascontiguousarray(df[columns].to_numpy(dtype="float64"))
+    return index.asi8.copy(), tz, columns, values
+
+
+def arrays_to_frame(dates: np.ndarray, tz: Optional[str], columns: List[str], values: np.ndarray) -> pd.DataFrame:
+    index = pd.DatetimeIndex(dates.view("datetime64[ns]"), name="Date")
+    if tz is not None:
+        index = index.tz_localize("UTC").tz_convert(tz)
+    df = pd.DataFrame(values, index=index, columns=columns)
+    df["Date"] = df.index
+    return df
+
+
+def detect_job(symbol: str, tf: str, payload: tuple, params: ZoneParams = ZoneParams(),
+               state_dir: Optional[str] = None, sweep: Optional[List[ZoneParams]] = None) -> tuple:
+    """
+    Worker entry point: rebuild the frame from its arrays and run detection with
+    `params`, an incremental update of the persisted zone state when `state_dir` is
+    given, or every parameter set of `sweep` in one pass (zones keyed by parameters).
+    Errors are caught per symbol and returned as a message instead of raised.
+    The job's stage timings are returned for the parent to merge into its stats.
+    """
+    with stats.collect() as job_stats:
+        try:
+            with stats.timer("detect", tf, symbol):
+                df = arrays_to_frame(*payload)
+                if sweep:
+                    zones = detect_zones_sweep(df, tf, symbol, sweep)
+                elif state_dir is not None:
+                    with stats.timer("incremental", tf, symbol):
+                        zones = IncrementalZoneDetector(state_dir, *params).update(df, tf, symbol)
+                else:
+                    zones = detect_zones_vectorized(df, tf, symbol, *params)
+            return symbol, zones, None, job_stats.export()
+        except Exception as e:
+            return symbol, [], f"{type(e).__name__}: {e}", job_stats.export()
@@ -0,0 +1,139 @@
+import os
+import html
+import logging
+from typing import List, Optional, Tuple
+import pandas as pd
+from ZoneScanner.instrumentation import stats
+from ZoneScanner.parallel import arrays_to_frame, frame_to_arrays
+from ZoneScanner.zone import Zone
+
+# Chart span around the zone's first base candle
+WINDOW_BEFORE = pd.DateOffset(months=5)
+WINDOW_AFTER = pd.DateOffset(months=10)
+
+
+def zone_window(df: pd.DataFrame, zone: Zone) -> pd.DataFrame:
+    """The bars shown on the zone's chart, sliced from the frame it was detected on."""
+    start = pd.Timestamp(zone.dates[1])
+    if getattr(df.index, "tz", None) is not None:
+        start = start.tz_localize(df.index.tz)
+    return df.loc[start - WINDOW_BEFORE: start + WINDOW_AFTER]
+
+
+def zone_filename(zone: Zone) -> str:
+    symbol = zone.symbol.replace(".NS", "")
+    return f"{symbol}_{zone.tf}_{zone.start}_Score{zone.score}.html".replace(" ", "_")
+
+
+def zone_figure(window: pd.DataFrame, zone: Zone, buffer: float = 1.0):
+    import plotly.graph_objects as go  # only needed when plotting
+
+    symbol = zone.symbol.replace(".NS", "")
+    stop = zone.stop_loss - buffer
+    zone_color = "rgba(0,200,100,0.2)" if zone.tf == "1mo" else "rgba(0,100,255,0.2)"
+    edges = [window.index[0], window.index[-1]]
+
+    fig = go.Figure(data=[
+        go.Candlestick(
+            x=window.index,
+            open=window["Open"],
+            high=window["High"],
+            low=window["Low"],
+            close=window["Close"],
+            name="Price"
+        ),
+        go.Scatter(x=edges, y=[zone.entry, zone.entry], mode="lines", name="Entry", line=dict(color="blue", dash="dot")),
+        go.Scatter(x=edges, y=[stop, stop], mode="lines", name="Stop-Loss", line=dict(color="red", dash="dash")),
+    ])
+
+    fig.add_shape(
+        type="rect",
+        x0=edges[0],
+        x1=edges[1],
+        y0=zone.distal,
+        y1=zone.proximal,
+        fillcolor=zone_color,
+        line=dict(color="green", width=1),
+        layer="below"
+    )
+
+    fig.update_layout(
+        title=f"{symbol} | Demand Zone from {zone.start} ({zone.tf}) | Score {zone.score}",
+        xaxis_title="Date",
+        yaxis_title="Price",
+        xaxis_rangeslider_visible=False,
+        height=600
+    )
+    return fig
+
+
+def render_job(zone: Zone, payload: tuple, output_folder: Optional[str] = None,
+               buffer: float = 1.0) -> Tuple[str, str, dict]:
+    """
+    Worker entry point: build one zone's chart from its window arrays. With an
+    `output_folder` the chart is written there as its own HTML file, loading
+    plotly.js from a single plotly.min.js in the same folder, and the file name is
+    returned; without one the chart's <div> is returned for a combined page.
+    """
+    filename = zone_filename(zone)
+    with stats.collect() as job_stats:
+        with stats.timer("plot_render", zone.tf, zone.symbol):
+            fig = zone_figure(arrays_to_frame(*payload), zone, buffer)
+            if output_folder is None:
+                div = fig.to_html(full_html=False, include_plotlyjs=False)
+            else:
+                div = ""
+                fig.write_html(os.path.join(output_folder, filename), include_plotlyjs="directory")
+    return filename, div, job_stats.export()
+
+
+def write_combined_html(path: str, title: str, divs: List[str]) -> None:
+    """One page holding every chart, with plotly.js embedded once."""
+    from plotly.offline import get_plotlyjs
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f"<html>\n<head><meta charset=\"utf-8\" /><title>{html.escape(title)}</title>\n")
+        f.write(f"<script type=\"text/javascript\">{get_plotlyjs()}</script>\n</head>\n<body>\n")
+        for div in divs:
+            f.write(div)
+            f.write("\n")
+        f.write("</body>\n</html>\n")
+
+
+def render_zones(zones: List[Zone], windows: dict, tf: str, output_folder: str = "plots",
+                 combined: bool = False, executor=None, buffer: float = 1.0) -> List[str]:
+    """
+    Render the charts of `zones` (best first) from their already-sliced `windows`
+    (keyed by id(zone)), in `executor` when given. Returns the written file paths:
+    one HTML per zone, or with `combined` a single demand_zones_{tf}.html.
+    """
+    jobs = [(zone, frame_to_arrays(windows[id(zone)])) for zone in zones
+            if id(zone) in windows and not windows[id(zone)].empty]
+    if not jobs:
+        return []
+    os.makedirs(output_folder, exist_ok=True)
+    target = None if combined else output_folder
+
+    if executor is None:
+        calls = [lambda zone=zone, payload=payload: render_job(zone, payload, target, buffer) for zone, payload in jobs]
+    else:
+        calls = [executor.submit(render_job, zone, payload, target, buffer).result for zone, payload in jobs]
+
+    results = []
+    for (zone, _), call in zip(jobs, calls):
+        try:
+            filename, div, job_stats = call()
+        except Exception as e:
+            logging.warning(f"⚠️ Could not plot {zone.symbol} [{tf}] – {type(e).__name__}: {e}")
+            continue
+        stats.merge(job_stats)
+        results.append((filename, div))
+    if not results:
+        return []
+    if not combined:
+        return [os.path.join(output_folder, filename) for filename, _ in results]
+
+    path = os.path.join(output_folder, f"demand_zones_{tf}.html")
+    write_combined_html(path, f"Demand zones ({tf})", [div for _, div in results])
+    logging.info(f"📈 Combined {len(results)} charts into {path}")
+    return [path]
@@ -0,0 +1,181 @@
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Every check run by check_ohlc, in report order
+QUALITY_CHECKS = (
+    "duplicate_dates",   # same bar date more than once
+    "unsorted_dates",    # bar dated before the one stored ahead of it
+    "non_positive",      # an Open/High/Low/Close of zero or below
+    "high_below_low",    # High < Low
+    "outside_range",     # Open or Close outside [Low, High]
+    "zero_range",        # High == Low
+    "bad_volume",        # negative Volume
+    "split_jump",        # gap by a near-integer price factor, typical of an unadjusted split
+    "partial_bar",       # last bar whose period has not closed yet
+)
+
+QUALITY_MODES = ("off", "flag", "repair")
+
+# Bars that are wrong beyond repair; more than this share of them quarantines an entry
+MAX_BAD_FRACTION = 0.01
+MIN_ROWS = 8
+
+# A close-to-open gap counts as a split jump when the price ratio is within
+# SPLIT_TOLERANCE of an integer factor of at least 2 and the bars' ranges do not touch
+SPLIT_TOLERANCE = 0.03
+
+# When the bar labelled with a date closes (NSE closes at 15:30 exchange time).
+# Cached bars carry naive exchange-local dates, so "now" is compared in the same zone
+EXCHANGE_TZ = "Asia/Kolkata"
+MARKET_CLOSE = pd.Timedelta(hours=15, minutes=30)
+BAR_CLOSE = {
+    "1d": pd.DateOffset(days=0),
+    "1wk": pd.DateOffset(days=4),
+    "1mo": pd.offsets.MonthEnd(0),
+}
+
+
+class QualityReport:
+    """Outcome of validating one frame: rows flagged per check, rows dropped by repair and any quarantine reason."""
+
+    def __init__(self, symbol: str, tf: str, rows: int, flags: Dict[str, int], repaired_rows: int = 0,
+                 quarantined: Optional[str] = None):
+        self.symbol = symbol
+        self.tf = tf
+        self.rows = rows
+        self.flags = flags
+        self.repaired_rows = repaired_rows
+        self.quarantined = quarantined
+
+    @property
+    def clean(self) -> bool:
+        return not any(self.flags.values())
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "flags": {name: count for name, count in self.flags.items() if count},
+            "repaired_rows": self.repaired_rows,
+            "quarantined": self.quarantined,
+        }
+
+    def __repr__(self):
+        flagged = ", ".join(f"{name}={count}" for name, count in self.flags.items() if count) or "clean"
+        return f"QualityReport({self.symbol} {self.tf} rows={self.rows} {flagged})"
+
+
+def exchange_time(ts) -> pd.Timestamp:
+    """`ts` as naive exchange-local time; naive values are taken to be exchange-local already."""
+    ts = pd.Timestamp(ts)
+    return ts.tz_convert(EXCHANGE_TZ).tz_localize(None) if ts.tz is not None else ts
+
+
+def bar_closes(last: pd.Timestamp, tf: str) -> pd.Timestamp:
+    """When the bar labelled `last` closes: its final trading day at MARKET_CLOSE."""
+    return last.normalize() + BAR_CLOSE.get(tf, pd.DateOffset(days=0)) + MARKET_CLOSE
+
+
+def _split_jumps(o, h, l, c) -> np.ndarray:
+    """Bars that gap from the previous close by a near-integer factor (2x, 3x, 1/2x...) with no range overlap."""
+    mask = np.zeros(len(c), dtype=bool)
+    if len(c) < 2:
+        return mask
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = c[:-1] / o[1:]
+        factor = np.where(ratio >= 1, ratio, 1 / ratio)
+        nearest = np.round(factor)
+        near_integer = (nearest >= 2) & (np.abs(factor - nearest) <= SPLIT_TOLERANCE * nearest)
+        gapped = (l[1:] > h[:-1]) | (h[1:] < l[:-1])
+    mask[1:] = near_integer & gapped
+    return mask
+
+
+def check_ohlc(df: pd.DataFrame, tf: str, now: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+    """
+    Run every QUALITY_CHECKS test over the whole frame at once. Returns one boolean
+    mask per check, aligned with the frame's rows. `now` (default: the current time)
+    may be tz-aware; a naive `now` is read as exchange time.
+    """
+    o = df["Open"].to_numpy(dtype="float64")
+    h = df["High"].to_numpy(dtype="float64")
+    l = df["Low"].to_numpy(dtype="float64")
+    c = df["Close"].to_numpy(dtype="float64")
+    v = df["Volume"].to_numpy(dtype="float64") if "Volume" in df.columns else np.zeros(len(df))
+    index = pd.DatetimeIndex(df.index)
+    dates = index.asi8
+
+    masks = {name: np.zeros(len(df), dtype=bool) for name in QUALITY_CHECKS}
+    if not len(df):
+        return masks
+    masks["duplicate_dates"] = index.duplicated(keep="last")
+    masks["unsorted_dates"][1:] = dates[1:] < np.maximum.accumulate(dates)[:-1]
+    with np.errstate(invalid="ignore"):
+        masks["non_positive"] = ~(np.minimum(np.minimum(o, h), np.minimum(l, c)) > 0)
+        masks["high_below_low"] = h < l
+        masks["outside_range"] = ((np.maximum(o, c) > h) | (np.minimum(o, c) < l)) & ~masks["high_below_low"]
+        masks["zero_range"] = h == l
+        masks["bad_volume"] = v < 0
+    masks["split_jump"] = _split_jumps(o, h, l, c)
+
+    # Not the host's local clock: on a UTC host that would be 5.5 hours behind the exchange
+    now = exchange_time(now if now is not None else pd.Timestamp.now(tz=EXCHANGE_TZ))
+    masks["partial_bar"][-1] = now < bar_closes(exchange_time(index[-1]), tf)
+    return masks
+
+
+def repair_ohlc(df: pd.DataFrame, masks: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Fix what can be fixed without guessing: keep the last copy of a duplicated date,
+    sort by date, drop bars with non-positive prices or High < Low, widen High/Low to
+    cover Open/Close, drop zero-range bars without volume (holiday placeholders),
+    blank negative volume and drop the partial last bar. Split jumps are left alone.
+    """
+    drop = masks["duplicate_dates"] | masks["non_positive"] | masks["high_below_low"] | masks["partial_bar"]
+    if "Volume" in df.columns:
+        drop |= masks["zero_range"] & (df["Volume"].to_numpy(dtype="float64") == 0)
+    if not (drop.any() or masks["outside_range"].any() or masks["bad_volume"].any() or masks["unsorted_dates"].any()):
+        return df
+
+    df = df.loc[~drop].copy()
+    if masks["unsorted_dates"].any():
+        df = df.sort_index(kind="stable")
+    prices = df[["Open", "High", "Low", "Close"]].to_numpy(dtype="float64")
+    df["High"] = prices.max(axis=1)
+    df["Low"] = prices.min(axis=1)
+    if "Volume" in df.columns:
+        df.loc[df["Volume"] < 0, "Volume"] = np.nan
+    df.index.name = "Date"
+    df["Date"] = df.index
+    return df
+
+
+def validate_ohlc(df: pd.DataFrame, symbol: str, tf: str, mode: str = "flag",
+                  now: Optional[datetime] = None) -> Tuple[pd.DataFrame, QualityReport]:
+    """
+    Check a frame before it is cached and, in "repair" mode, fix it (see repair_ohlc).
+    The report's `quarantined` reason is set when the data is still unusable: a split
+    jump, fewer than MIN_ROWS bars, or more than MAX_BAD_FRACTION of bars that are
+    wrong beyond repair ("flag" mode only; repair drops those bars).
+    """
+    if mode not in QUALITY_MODES:
+        raise ValueError(f"Unknown quality mode '{mode}'. Choose from: {', '.join(QUALITY_MODES)}")
+    masks = check_ohlc(df, tf, now)
+    flags = {name: int(mask.sum()) for name, mask in masks.items()}
+    rows = len(df)
+
+    if mode == "repair":
+        df = repair_ohlc(df, masks)
+        broken = 0
+    else:
+        broken = int((masks["duplicate_dates"] | masks["unsorted_dates"] | masks["non_positive"] | masks["high_below_low"]).sum())
+
+    reason = None
+    if flags["split_jump"]:
+        reason = f"{flags['split_jump']} split jump(s)"
+    elif len(df) < MIN_ROWS:
+        reason = f"only {len(df)} bars"
+    elif broken > MAX_BAD_FRACTION * rows:
+        reason = f"{broken} of {rows} bars are broken"
+    return df, QualityReport(symbol, tf, rows, flags, rows - len(df), reason)
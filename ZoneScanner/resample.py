@@ -0,0 +1,101 @@
+import re
+import argparse
+import numpy as np
+import pandas as pd
+from ZoneScanner.zone_detector import clean_ohlc_frame
+
+# Weekly bars run Monday to Friday and are labelled by their Monday; monthly bars are
+# labelled by the first calendar day. Both match the bar dates yfinance uses for NSE.
+RESAMPLE_RULES = {
+    "1wk": "W-MON",
+    "1mo": "MS",
+}
+
+OHLCV_AGG = {
+    "Open": "first",
+    "High": "max",
+    "Low": "min",
+    "Close": "last",
+    "Volume": "sum",
+}
+
+
+def resample_ohlcv(daily: pd.DataFrame, tf: str) -> pd.DataFrame:
+    """
+    Build `tf` bars from daily OHLCV with a single vectorized resample.
+    Periods without any trading day are dropped.
+    """
+    rule = RESAMPLE_RULES[tf]
+    agg = {col: how for col, how in OHLCV_AGG.items() if col in daily.columns}
+    bars = daily[list(agg)].resample(rule, label="left", closed="left").agg(agg)
+    bars = bars.dropna(subset=["Open", "High", "Low", "Close"])
+    bars.index.name = "Date"
+    bars["Date"] = bars.index
+    return bars
+
+
+def trim_to_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """Keep only the bars inside a yfinance-style period such as 5y, 15y or 1825d."""
+    match = re.fullmatch(r"(\d+)(d|wk|mo|y)", period or "")
+    if not match or df.empty:
+        return df
+    n, unit = int(match.group(1)), match.group(2)
+    offset = {
+        "d": pd.DateOffset(days=n),
+        "wk": pd.DateOffset(weeks=n),
+        "mo": pd.DateOffset(months=n),
+        "y": pd.DateOffset(years=n),
+    }[unit]
+    return df[df.index >= df.index[-1] - offset]
+
+
+def validate_resampled(derived: pd.DataFrame, downloaded: pd.DataFrame, rtol: float = 0.005) -> dict:
+    """
+    Compare locally derived bars with bars downloaded for the same timeframe.
+    Returns the number of shared bars, bars missing on either side and, per column,
+    the share of shared bars that differ by more than `rtol`.
+    """
+    downloaded = downloaded.copy()
+    if downloaded.index.tz is not None and derived.index.tz is None:
+        downloaded.index = downloaded.index.tz_localize(None)
+    shared = derived.index.intersection(downloaded.index)
+    report = {
+        "shared_bars": len(shared),
+        "only_derived": len(derived.index.difference(downloaded.index)),
+        "only_downloaded": len(downloaded.index.difference(derived.index)),
+        "mismatch_pct": {},
+    }
+    for col in OHLCV_AGG:
+        if col not in derived.columns or col not in downloaded.columns or not len(shared):
+            continue
+        a = derived.loc[shared, col].to_numpy(dtype="float64")
+        b = downloaded.loc[shared, col].to_numpy(dtype="float64")
+        mismatched = ~np.isclose(a, b, rtol=rtol, equal_nan=True)
+        report["mismatch_pct"][col] = round(float(100 * mismatched.mean()), 2)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate weekly/monthly bars derived from daily data against yfinance")
+    parser.add_argument("--symbol", required=True, help="Symbol to check (e.g., TCS.NS)")
+    parser.add_argument("--tf", nargs="+", default=list(RESAMPLE_RULES), help="Timeframes to validate")
+    parser.add_argument("--period", default="5y", help="History to compare")
+    args = parser.parse_args()
+
+    from ZoneScanner.downloader import OHLCDownloader
+    downloader = OHLCDownloader()
+    daily = clean_ohlc_frame(_flatten(downloader.download(args.symbol, "1d", args.period)), args.symbol)
+    for tf in args.tf:
+        derived = resample_ohlcv(daily, tf)
+        downloaded = clean_ohlc_frame(_flatten(downloader.download(args.symbol, tf, args.period)), args.symbol)
+        print(f"{args.symbol} [{tf}] {validate_resampled(derived, downloaded)}")
+
+
+def _flatten(df: pd.DataFrame) -> pd.DataFrame:
+    if isinstance(df.columns, pd.MultiIndex):
+        df.columns = ['_'.join([str(c) for c in tup if c]) for tup in df.columns]
+    return df
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import os
+import json
+import pickle
+import hashlib
+import logging
+import threading
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+from ZoneScanner.zone import Zone
+
+# Bump whenever detection or the Zone layout changes so older cached results are ignored
+RESULT_CACHE_VERSION = 1
+
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """Hash of the bar dates and OHLCV values, so any changed or added bar changes it."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(pd.DatetimeIndex(df.index).asi8.tobytes())
+    for col in OHLCV_COLUMNS:
+        if col in df.columns:
+            h.update(col.encode())
+            h.update(np.ascontiguousarray(df[col].to_numpy(dtype="float64")).tobytes())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    On-disk cache of detection results, one pickle per entry named by a hash of
+    (symbol, timeframe, data fingerprint, detection parameters). A hit refreshes
+    the entry's mtime; when the cache grows past `max_bytes` or `max_entries`,
+    the least recently used entries are deleted first.
+    """
+
+    suffix = ".zones.pkl"
+
+    def __init__(self, cache_dir: str = "zone_cache", max_bytes: int = 256 * 1024 * 1024,
+                 max_entries: Optional[int] = None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._sizes = {
+            entry.path: entry.stat().st_size
+            for entry in os.scandir(self.cache_dir) if entry.name.endswith(self.suffix)
+        }
+
+    def key(self, symbol: str, tf: str, fingerprint: str, params: dict) -> str:
+        raw = json.dumps([RESULT_CACHE_VERSION, symbol, tf, fingerprint, params], sort_keys=True, default=str)
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}{self.suffix}")
+
+    def get(self, key: str) -> Optional[List[Zone]]:
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                zones = pickle.load(f)
+            os.utime(path)
+            return zones
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"♻️ Dropping unreadable result cache entry {path} – {type(e).__name__}: {e}")
+            self._remove(path)
+            return None
+
+    def put(self, key: str, zones: List[Zone]) -> None:
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(zones, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._sizes[path] = os.path.getsize(path)
+        self.evict()
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            self._sizes.pop(path, None)
+
+    def size(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the size and count limits hold."""
+        with self._lock:
+            total = sum(self._sizes.values())
+            over_count = self.max_entries is not None and len(self._sizes) > self.max_entries
+            if total <= self.max_bytes and not over_count:
+                return 0
+            entries = []
+            for path, size in self._sizes.items():
+                try:
+                    entries.append((os.path.getmtime(path), path, size))
+                except FileNotFoundError:
+                    entries.append((0.0, path, 0))
+        entries.sort()
+
+        removed = 0
+        count = len(entries)
+        for _, path, size in entries:
+            if total <= self.max_bytes and (self.max_entries is None or count <= self.max_entries):
+                break
+            self._remove(path)
+            total -= size
+            count -= 1
+            removed += 1
+        if removed:
+            logging.info(f"🧹 Evicted {removed} result cache entries ({total / 1e6:.1f} MB kept)")
+        return removed
+
+    def clear(self) -> None:
+        for path in list(self._sizes):
+            self._remove(path)
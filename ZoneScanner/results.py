@@ -0,0 +1,103 @@
+import os
+import csv
+import json
+import heapq
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:  # zone.py pulls in pandas; the CLI imports this module before parsing arguments
+    from ZoneScanner.zone import Zone
+
+RESULT_FORMATS = ("csv", "jsonl")
+
+
+class ZoneWriter:
+    """
+    Appends zones to `path` as they arrive instead of building one frame at the end.
+    Zones are only formatted into their CSV columns here. CSV takes its header from
+    the first zone written; JSONL writes one object per line.
+    The file is only created once there is something to write and is flushed after
+    every batch, so partial results are visible while a scan is still running.
+    """
+
+    def __init__(self, path: str, fmt: str = "csv"):
+        if fmt not in RESULT_FORMATS:
+            raise ValueError(f"Unknown result format '{fmt}'. Choose from: {', '.join(RESULT_FORMATS)}")
+        self.path = path
+        self.fmt = fmt
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def write(self, zones: List["Zone"], extra: Optional[dict] = None) -> None:
+        """Append zones; `extra` columns (e.g. sweep parameters) are written first."""
+        if not zones:
+            return
+        rows = [{**extra, **zone.to_dict()} if extra else zone.to_dict() for zone in zones]
+        if self._file is None:
+            self._file = open(self.path, "w", encoding="utf-8", newline="")
+            if self.fmt == "csv":
+                self._writer = csv.DictWriter(self._file, fieldnames=list(rows[0]), extrasaction="ignore")
+                self._writer.writeheader()
+        if self.fmt == "csv":
+            self._writer.writerows(rows)
+        else:
+            for row in rows:
+                self._file.write(json.dumps(row, default=str) + "\n")
+        self._file.flush()
+        self.count += len(zones)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TopZones:
+    """
+    Bounded min-heap of the `n` best zones by Score. Ties keep the zone that was
+    ranked first (lower `rank`, then earlier arrival), like a stable sort would.
+    """
+
+    def __init__(self, n: Optional[int] = 50):
+        self.n = n
+        self._heap = []
+        self._seq = 0
+
+    def push(self, zone: "Zone", rank: int = 0) -> Optional["Zone"]:
+        """Add a zone; returns the zone that fell out (possibly this one), if any."""
+        self._seq += 1
+        item = (zone.score, -rank, -self._seq, zone)
+        if self.n is None or len(self._heap) < self.n:
+            heapq.heappush(self._heap, item)
+            return None
+        if item[:3] > self._heap[0][:3]:
+            return heapq.heapreplace(self._heap, item)[3]
+        return zone
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def zones(self) -> List["Zone"]:
+        """Best first."""
+        return [item[3] for item in sorted(self._heap, key=lambda item: item[:3], reverse=True)]
+
+
+def sweep_columns(params) -> dict:
+    """Leading output columns that identify a sweep parameter set."""
+    return {
+        "Fresh Only": params.fresh_only,
+        "Min Base": params.min_base,
+        "Max Base": params.max_base,
+        "Distance Min": params.distance_range[0],
+        "Distance Max": params.distance_range[1],
+    }
+
+
+def result_path(tf: str, fmt: str = "csv", output_dir: str = ".") -> str:
+    return os.path.normpath(os.path.join(output_dir, f"demand_zones_{tf}.{fmt}"))
@@ -0,0 +1,367 @@
+import json
+import math
+import time
+import logging
+import argparse
+import threading
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+from urllib.request import Request, urlopen
+import numpy as np
+import pandas as pd
+from ZoneScanner.cache import CacheBackend, get_cache
+from ZoneScanner.downloader import OHLCDownloader
+from ZoneScanner.instrumentation import stats
+from ZoneScanner.result_cache import frame_fingerprint
+from ZoneScanner.stock_scanner import StockScanner
+from ZoneScanner.universe import get_universe
+from ZoneScanner.zone import Zone
+from ZoneScanner.zone_detector import DemandZoneScanner
+
+# Zones are precomputed for base lengths 1..SERVICE_MAX_BASE with no freshness or
+# distance filter; a query only filters them, so it matches a scan with its parameters
+SERVICE_MAX_BASE = 6
+
+
+class ZoneTable:
+    """
+    Every precomputed zone of one timeframe, in universe order, with the columns
+    queries filter on held as arrays.
+    """
+
+    def __init__(self, zones_by_symbol: Dict[str, List[Zone]], symbols: List[str]):
+        self.zones = [zone for symbol in symbols for zone in zones_by_symbol.get(symbol, ())]
+        self.symbol_codes = {symbol: i for i, symbol in enumerate(symbols)}
+        self.symbol = np.array([self.symbol_codes[z.symbol] for z in self.zones], dtype="int32")
+        self.fresh = np.array([bool(z.fresh) for z in self.zones], dtype=bool)
+        self.base_len = np.array([z.base_len for z in self.zones], dtype="int16")
+        self.distance = np.array([z.distance_pct for z in self.zones], dtype="float64")
+        self.score = np.array([z.score for z in self.zones], dtype="int64")
+
+    def __len__(self) -> int:
+        return len(self.zones)
+
+    def query(self, fresh_only: bool = False, min_base: int = 1, max_base: int = 3,
+              distance_range: Tuple[float, float] = (1.0, 5.0), symbols: Optional[set] = None,
+              limit: Optional[int] = None) -> List[Zone]:
+        """Matching zones, best Score first (ties keep universe order)."""
+        lo, hi = distance_range
+        mask = (self.base_len >= min_base) & (self.base_len <= max_base)
+        # Same test as detection, so a NaN distance is kept
+        mask &= ~((self.distance < lo) | (self.distance > hi))
+        if fresh_only:
+            mask &= self.fresh
+        if symbols is not None:
+            codes = [self.symbol_codes[s] for s in symbols if s in self.symbol_codes]
+            mask &= np.isin(self.symbol, codes)
+        idx = np.flatnonzero(mask)
+        idx = idx[np.argsort(-self.score[idx], kind="stable")]
+        if limit:
+            idx = idx[:limit]
+        return [self.zones[i] for i in idx]
+
+
+class ZoneService:
+    """
+    Keeps every symbol's frames and precomputed zones in memory so scan queries
+    only filter arrays. `refresh()` appends new bars for symbols whose cache entry
+    is stale (as `--refresh` does) and re-runs detection only for frames whose
+    data changed; `start()` runs it every `refresh_interval` in the background.
+    Tables are swapped whole, so queries never see a half-updated timeframe.
+    """
+
+    def __init__(self, timeframes=("1mo", "1wk", "1d"), symbols: Optional[List[str]] = None,
+                 csv_path: str = "StockList.csv", cache_dir: str = "csv_data",
+                 cache: Optional[CacheBackend] = None, downloader: Optional[OHLCDownloader] = None,
+                 refresh_interval: Optional[timedelta] = timedelta(hours=1), max_base: int = SERVICE_MAX_BASE):
+        self.universe = get_universe(csv_path)
+        self.symbols = list(symbols) if symbols is not None else self.universe.symbols()
+        self.refresh_interval = refresh_interval
+        self.max_base = max_base
+        self.scanners = {
+            tf: StockScanner(
+                cache_dir=cache_dir,
+                tf=tf,
+                downloader=downloader,
+                cache=cache,
+                refresh=refresh_interval is not None,
+                refresh_max_age=refresh_interval or timedelta(hours=12),
+                top_n=None,
+            )
+            for tf in timeframes
+        }
+        self.frames: Dict[Tuple[str, str], pd.DataFrame] = {}
+        self.tables: Dict[str, ZoneTable] = {}
+        self._zones: Dict[str, Dict[str, List[Zone]]] = {tf: {} for tf in timeframes}
+        self._fingerprints: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.loaded_at = None
+        self.refreshed_at = None
+        self.last_report = None
+
+    def _update(self, tf: str, symbols: List[str]) -> int:
+        scanner = self.scanners[tf]
+        changed = {}
+        for symbol, df in scanner.load_frames(symbols):
+            fingerprint = frame_fingerprint(df)
+            if self._fingerprints.get((symbol, tf)) == fingerprint:
+                continue
+            self._fingerprints[(symbol, tf)] = fingerprint
+            self.frames[(symbol, tf)] = df
+            changed[(symbol, tf)] = df
+
+        if changed or tf not in self.tables:
+            engine = DemandZoneScanner(
+                symbols=[symbol for symbol, _ in changed],
+                timeframes={tf: scanner.period},
+                fresh_only=False,
+                frames=changed,
+                min_base=1,
+                max_base=self.max_base,
+                distance_range=(-math.inf, math.inf),
+            )
+            with stats.timer("service_detect", tf):
+                zones_by_symbol = {symbol: [] for symbol, _ in changed}
+                for zone in engine.scan():
+                    zones_by_symbol[zone.symbol].append(zone)
+                self._zones[tf].update(zones_by_symbol)
+                self.tables[tf] = ZoneTable(self._zones[tf], self.symbols)
+        return len(changed)
+
+    def load(self) -> Dict[str, int]:
+        """Load every symbol's frames and precompute its zones."""
+        with self._lock:
+            started = time.perf_counter()
+            counts = {tf: self._update(tf, self.symbols) for tf in self.scanners}
+            self.loaded_at = self.refreshed_at = datetime.now()
+            self._take_report()
+        zones = sum(len(table) for table in self.tables.values())
+        logging.info(f"🔥 Loaded {len(self.frames)} frames and {zones} zones in {time.perf_counter() - started:.1f}s")
+        return counts
+
+    def _take_report(self):
+        # The daemon never exits, so keep only the last load/refresh in the shared stats
+        self.last_report = stats.report(slowest=5)
+        stats.reset()
+
+    def refresh(self) -> Dict[str, int]:
+        """Update stale symbols with new bars only; returns the changed frame count per timeframe."""
+        with self._lock:
+            counts = {}
+            for tf, scanner in self.scanners.items():
+                stale = scanner.stale_symbols(self.symbols)
+                counts[tf] = self._update(tf, stale) if stale else 0
+            self.refreshed_at = datetime.now()
+            self._take_report()
+        logging.info(f"🔄 Refreshed: {counts}")
+        return counts
+
+    def refresh_async(self) -> bool:
+        """Start a refresh in the background; False if one is already running."""
+        if self._lock.locked():
+            return False
+        threading.Thread(target=self._refresh_logged, name="zone-refresh-now", daemon=True).start()
+        return True
+
+    def _refresh_logged(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            logging.warning(f"❌ Refresh failed – {type(e).__name__}: {e}")
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval.total_seconds()):
+            self._refresh_logged()
+
+    def start(self):
+        if self.refresh_interval is not None and self._thread is None:
+            self._thread = threading.Thread(target=self._refresh_loop, name="zone-refresh", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def query(self, tf: str, fresh_only: bool = False, min_base: int = 1, max_base: int = 3,
+              distance_range: Tuple[float, float] = (1.0, 5.0), sectors: Optional[List[str]] = None,
+              industries: Optional[List[str]] = None, symbols: Optional[List[str]] = None,
+              limit: Optional[int] = None) -> List[Zone]:
+        if tf not in self.scanners:
+            raise ValueError(f"Timeframe '{tf}' is not loaded. Choose from: {', '.join(self.scanners)}")
+        if not 1 <= min_base <= max_base <= self.max_base:
+            raise ValueError(f"Need 1 <= min_base <= max_base <= {self.max_base}")
+        wanted = None
+        if sectors or industries:
+            wanted = set(self.universe.symbols(sectors=sectors, industries=industries))
+        if symbols:
+            wanted = set(symbols) if wanted is None else wanted & set(symbols)
+        table = self.tables.get(tf)
+        if table is None:
+            return []
+        return table.query(fresh_only, min_base, max_base, tuple(distance_range), wanted, limit)
+
+    def status(self) -> dict:
+        return {
+            "symbols": len(self.symbols),
+            "frames": len(self.frames),
+            "zones": {tf: len(table) for tf, table in self.tables.items()},
+            "loaded_at": self.loaded_at.isoformat(timespec="seconds") if self.loaded_at else None,
+            "refreshed_at": self.refreshed_at.isoformat(timespec="seconds") if self.refreshed_at else None,
+            "refresh_interval_s": self.refresh_interval.total_seconds() if self.refresh_interval else None,
+            "refreshing": self._lock.locked(),
+            "last_report": self.last_report,
+        }
+
+
+def _flag(value: str) -> bool:
+    if value.lower() in ("1", "true", "yes"):
+        return True
+    if value.lower() in ("0", "false", "no"):
+        return False
+    raise ValueError(f"Expected a boolean, got '{value}'")
+
+
+def scan_params(query: Dict[str, List[str]], default_tf: str) -> dict:
+    """
+    Query-string parameters of /scan as ZoneService.query keyword arguments.
+    sector, industry and symbol may be repeated; distance is "min,max".
+    """
+    def one(name, default=None):
+        return query[name][-1] if name in query else default
+
+    params = {
+        "tf": one("tf", default_tf),
+        "fresh_only": _flag(one("fresh", "0")),
+        "min_base": int(one("min_base", 1)),
+        "max_base": int(one("max_base", 3)),
+        "sectors": query.get("sector"),
+        "industries": query.get("industry"),
+        "symbols": query.get("symbol"),
+        "limit": int(one("limit", 0)) or None,
+    }
+    lo, _, hi = one("distance", "1,5").partition(",")
+    params["distance_range"] = (float(lo), float(hi))
+    return params
+
+
+def make_handler(service: ZoneService):
+    class ZoneRequestHandler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: dict):
+            data = json.dumps(body, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/status":
+                return self._send(200, service.status())
+            if url.path != "/scan":
+                return self._send(404, {"error": f"Unknown path {url.path}"})
+            started = time.perf_counter()
+            try:
+                params = scan_params(parse_qs(url.query), next(iter(service.scanners)))
+                zones = service.query(**params)
+            except ValueError as e:
+                return self._send(400, {"error": str(e)})
+            self._send(200, {
+                "tf": params["tf"],
+                "count": len(zones),
+                "query_ms": round(1000 * (time.perf_counter() - started), 3),
+                "refreshed_at": service.refreshed_at,
+                "zones": [zone.to_dict() for zone in zones],
+            })
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/refresh":
+                return self._send(404, {"error": f"Unknown path {self.path}"})
+            started = service.refresh_async()
+            self._send(202 if started else 409, {"refreshing": True, "started": started})
+
+        def log_message(self, fmt, *args):
+            logging.info(f"🌐 {self.address_string()} {fmt % args}")
+
+    return ZoneRequestHandler
+
+
+def make_server(service: ZoneService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    """HTTP server for `service`; port 0 picks a free port (see server.server_address)."""
+    return ThreadingHTTPServer((host, port), make_handler(service))
+
+
+class ZoneClient:
+    """Minimal client for a running service, e.g. ZoneClient().scan(tf="1wk", sector=["IT"])."""
+
+    def __init__(self, base_url: str = "http://127.0.0.1:8765", timeout: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+
+    def _request(self, path: str, method: str = "GET") -> dict:
+        with urlopen(Request(f"{self.base_url}{path}", method=method), timeout=self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+    def scan(self, **params) -> dict:
+        if "distance" in params and not isinstance(params["distance"], str):
+            params["distance"] = ",".join(str(v) for v in params["distance"])
+        return self._request(f"/scan?{urlencode(params, doseq=True)}")
+
+    def status(self) -> dict:
+        return self._request("/status")
+
+    def refresh(self) -> dict:
+        return self._request("/refresh", method="POST")
+
+
+def main():
+    from ZoneScanner.main import CACHE_FORMATS, setup_logging
+    from ZoneScanner.logs import LOG_FORMATS, LOG_LEVELS
+
+    parser = argparse.ArgumentParser(description="Demand zone scan service with a local HTTP/JSON API")
+    parser.add_argument("--tf", nargs="+", default=["1mo", "1wk", "1d"], help="Timeframes to keep loaded")
+    parser.add_argument("--symbol", nargs="+", help="Serve only these symbols")
+    parser.add_argument("--sector", nargs="+", help="Serve only these sectors of StockList.csv")
+    parser.add_argument("--limit", type=int, help="Max number of symbols to load")
+    parser.add_argument("--cache-format", choices=list(CACHE_FORMATS), default="csv", help="OHLC cache format")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--refresh-minutes", type=float, default=60, help="Append new bars for stale symbols this often (0 = never)")
+    parser.add_argument("--max-base", type=int, default=SERVICE_MAX_BASE, help="Largest base length queries may ask for")
+    parser.add_argument("--download-workers", type=int, default=4, help="Max concurrent yfinance downloads")
+    parser.add_argument("--rate-limit", type=float, default=2.0, help="Max download requests per second (0 = unlimited)")
+    parser.add_argument("--log-level", choices=list(LOG_LEVELS), default="progress", help="progress shows a line per symbol; info and warning silence them")
+    parser.add_argument("--log-format", choices=list(LOG_FORMATS), default="text", help="Log file format (text or JSON lines)")
+    args = parser.parse_args()
+    setup_logging(args.log_level, args.log_format)
+
+    symbols = args.symbol
+    if symbols is None:
+        symbols = get_universe("StockList.csv").symbols(sectors=args.sector, limit=args.limit)
+    service = ZoneService(
+        timeframes=args.tf,
+        symbols=symbols,
+        cache=get_cache(args.cache_format),
+        downloader=OHLCDownloader(max_workers=args.download_workers, rate_limit=args.rate_limit),
+        refresh_interval=timedelta(minutes=args.refresh_minutes) if args.refresh_minutes > 0 else None,
+        max_base=args.max_base,
+    )
+    service.load()
+    service.start()
+
+    server = make_server(service, args.host, args.port)
+    logging.info(f"🛰️ Serving demand zones on http://{args.host}:{server.server_address[1]}/scan")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
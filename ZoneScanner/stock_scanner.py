@@ -1,113 +1,541 @@
 import os
 import pandas as pd
-import yfinance as yf
 import logging
-from typing import List, Optional
-from datetime import datetime
-from ZoneScanner.zone_detector import DemandZoneScanner
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
+from ZoneScanner.cache import CacheBackend, CSVCache, merge_bars
+from ZoneScanner.downloader import OHLCDownloader
+from ZoneScanner.resample import RESAMPLE_RULES, resample_ohlcv, trim_to_period
+from ZoneScanner.incremental import IncrementalZoneDetector
+from ZoneScanner.parallel import frame_to_arrays, detect_job
+from ZoneScanner.panel import detect_zones_panel
+from ZoneScanner.quality import QUALITY_MODES, validate_ohlc
+from ZoneScanner.plotting import render_zones, zone_window
+from ZoneScanner.results import TopZones, ZoneWriter, result_path, sweep_columns
+from ZoneScanner.instrumentation import stats
+from ZoneScanner.logs import pool_logging, progress
+from ZoneScanner.result_cache import ResultCache, frame_fingerprint
+from ZoneScanner.zone import Zone
+from ZoneScanner.zone_detector import DemandZoneScanner, ZoneParams, clean_ohlc_frame, detect_zones_sweep
 from ZoneScanner.fetch import get_symbol_list
 
+# Approximate length of one bar, used to step back from the last cached bar on refresh
+TF_BAR_LENGTH = {
+    "1d": pd.Timedelta(days=1),
+    "1wk": pd.Timedelta(weeks=1),
+    "1mo": pd.Timedelta(days=31),
+}
+
+# Zones for one symbol, or zones per parameter set in sweep mode
+DetectResult = Union[List[Zone], Dict[ZoneParams, List[Zone]]]
+
 class StockScanner:
     def __init__(self, 
                  cache_dir: str = "csv_data",
                  tf: str = "1d",
                  fresh_only: bool = True,
-                 plot: bool = False):
+                 plot: bool = False,
+                 min_base: int = 1,
+                 max_base: int = 3,
+                 distance_range: Tuple[float, float] = (1.0, 5.0),
+                 force_download: bool = False,
+                 sweep: Optional[List[ZoneParams]] = None,
+                 downloader: Optional[OHLCDownloader] = None,
+                 cache: Optional[CacheBackend] = None,
+                 refresh: bool = False,
+                 refresh_max_age: timedelta = timedelta(hours=12),
+                 overlap_bars: int = 1,
+                 resample: bool = False,
+                 incremental: bool = False,
+                 state_dir: str = "zone_state",
+                 top_n: Optional[int] = 50,
+                 output_format: str = "csv",
+                 output_dir: str = ".",
+                 result_cache: Optional[ResultCache] = None,
+                 plot_top: int = 20,
+                 plot_combined: bool = False,
+                 plot_dir: str = "plots",
+                 plot_workers: int = 0,
+                 panel_size: int = 0,
+                 collect_zones: bool = False,
+                 quality: str = "flag",
+                 quarantine_retry: timedelta = timedelta(days=7)):
         self.cache_dir = cache_dir
         self.fresh_only = fresh_only
+        self.params = ZoneParams(fresh_only, min_base, max_base, tuple(distance_range))
+        # Several parameter sets evaluated together; results go to demand_zones_{tf}_sweep
+        self.sweep = [ZoneParams(*p) for p in sweep] if sweep else None
+        self.sweep_counts = {}
+        self.force_download = force_download
         self.plot = plot
+        # Charts are rendered after the scan for the best `plot_top` zones, from the
+        # bars kept when each zone entered the top list
+        self.plot_top = plot_top
+        self.plot_combined = plot_combined
+        self.plot_dir = plot_dir
+        self.plot_workers = plot_workers
+        self.plot_zones = []
+        self._frames = {}
+        self._windows = {}
         self.tf = tf
         self.period = self._get_max_period(tf)
+        # Weekly/monthly bars can be derived from the daily cache instead of downloaded
+        self.resample = resample and tf in RESAMPLE_RULES
+        self.source_tf = "1d" if self.resample else tf
+        self.source_period = self._get_max_period(self.source_tf)
+        if incremental and self.sweep:
+            logging.warning("⚠️ Incremental detection does not support parameter sweeps; running full detection")
+            incremental = False
+        if incremental and panel_size:
+            logging.warning("⚠️ Incremental detection does not use panels; detecting per symbol")
+            panel_size = 0
+        # Symbols detected together as one symbols × bars panel (0 = one symbol at a time)
+        self.panel_size = panel_size
+        self.incremental = IncrementalZoneDetector(state_dir, fresh_only, min_base, max_base, distance_range) if incremental else None
         self.zones = []
+        self.zone_count = 0
+        # Every zone of the last run, kept for joins across timeframes (see confluence.py)
+        self.collect_zones = collect_zones
+        self.all_zones = []
+        self.top_n = top_n
+        self.output_format = output_format
+        self.output_dir = output_dir
+        self.result_cache = result_cache
+        self.downloader = downloader or OHLCDownloader()
+        self.cache = cache or CSVCache(cache_dir)
+        self.refresh = refresh
+        self.refresh_max_age = refresh_max_age
+        self.overlap_bars = overlap_bars
+        # Bars are validated once, when they are written to the cache (see quality.py);
+        # entries that fail are quarantined and retried after `quarantine_retry`
+        if quality not in QUALITY_MODES:
+            raise ValueError(f"Unknown quality mode '{quality}'. Choose from: {', '.join(QUALITY_MODES)}")
+        self.quality = quality
+        self.quarantine_retry = quarantine_retry
         os.makedirs(self.cache_dir, exist_ok=True)
 
     def _get_max_period(self, tf: str) -> str:
         tf_period_map = {
-            "1d": "1825d",
+            "1d": "20y",
             "1wk": "5y",
             "1mo": "15y"
         }
         return tf_period_map.get(tf, "365d")
 
-    def _load_or_download_data(self, symbol: str, tf: str, period: str) -> pd.DataFrame:
-        filename = f"{symbol}_{tf}.csv"
-        filepath = os.path.join(self.cache_dir, filename)
+    def _needs_download(self, symbol: str, tf: str) -> bool:
+        return self.force_download or not self.cache.exists(symbol, tf)
 
-        if not self.fresh_only and os.path.exists(filepath):
-            print(f"💾 Cached CSV → {filepath}")
-            df = pd.read_csv(filepath, index_col="Date", parse_dates=True)
-        else:
-            print(f"🌐 Downloading {symbol} ({tf}, {period}) from yfinance …")
-            df = yf.download(
-                symbol, period=period, interval=tf, auto_adjust=False, progress=False
-            )
-            if df.empty:
-                print(f"⚠️ No data for {symbol}")
-                logging.warning(f"No data for {symbol}")
-                return pd.DataFrame()
-
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = ['_'.join([str(c) for c in tup if c]) for tup in df.columns]
-
-            df.index.name = "Date"
-            df["Date"] = df.index
-            df.to_csv(filepath, index_label="Date")
-
-        df = df.loc[:, ~df.columns.duplicated()]
-        suffix = f"_{symbol}"
-        rename_map = {
-            f"Open{suffix}": "Open", f"High{suffix}": "High",
-            f"Low{suffix}": "Low", f"Close{suffix}": "Close",
-            f"Volume{suffix}": "Volume"
-        }
-        df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns}, inplace=True)
+    def _needs_refresh(self, symbol: str, tf: str) -> bool:
+        return self.refresh and self.cache.is_stale(symbol, tf, self.refresh_max_age)
+
+    def _quarantined(self, symbol: str, tf: str) -> Optional[str]:
+        # Quarantine removes the live entry, so cached symbols skip the metadata read
+        if self.force_download or self.cache.exists(symbol, tf):
+            return None
+        return self.cache.quarantined(symbol, tf, self.quarantine_retry)
+
+    def _refresh_start(self, symbol: str, tf: str) -> pd.Timestamp:
+        """
+        First date to re-download: the last cached bar, moved back by `overlap_bars`
+        bar lengths so the previously still-forming bar gets corrected.
+        """
+        last_bar = self.cache.read_meta(symbol, tf).get("last_bar")
+        if last_bar is None:
+            last_bar = self.cache.read(symbol, tf).index[-1]
+        bar_length = TF_BAR_LENGTH.get(tf, pd.Timedelta(days=1))
+        return pd.Timestamp(last_bar).normalize() - self.overlap_bars * bar_length
+
+    def _prepare_download(self, symbol: str, df: pd.DataFrame) -> pd.DataFrame:
+        if df is None or df.empty:
+            return pd.DataFrame()
 
-        for col in ["Open", "High", "Low", "Close", "Volume"]:
-            if col in df.columns:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = ['_'.join([str(c) for c in tup if c]) for tup in df.columns]
 
-        df.dropna(subset=["Open", "High", "Low", "Close"], inplace=True)
+        df.index.name = "Date"
         df["Date"] = df.index
+        return clean_ohlc_frame(df, symbol)
+
+    def _store_download(self, symbol: str, tf: str, df: pd.DataFrame) -> pd.DataFrame:
+        df = self._prepare_download(symbol, df)
+        if df.empty:
+            logging.warning(f"No data for {symbol}")
+            return df
+
+        stats.count("cache_misses", tf=tf)
+        return self._write_cache(symbol, tf, df, downloaded_rows=len(df))
+
+    def _write_cache(self, symbol: str, tf: str, df: pd.DataFrame, downloaded_rows: int) -> pd.DataFrame:
+        """
+        Validate (and with quality="repair", fix) bars before they are cached, then
+        write them. Frames that fail validation are quarantined and come back empty.
+        """
+        report = None
+        if self.quality != "off":
+            with stats.timer("quality", tf, symbol):
+                df, report = validate_ohlc(df, symbol, tf, self.quality)
+            for name, flagged in report.flags.items():
+                if flagged:
+                    stats.count(f"quality_{name}", flagged, tf=tf)
+            if report.quarantined:
+                path = self.cache.quarantine(symbol, tf, df, report.quarantined, report.to_dict())
+                stats.count("quarantined", tf=tf)
+                logging.warning(f"🚧 Quarantined {symbol} ({tf}): {report.quarantined} → {path}")
+                return df.iloc[:0]
+            if not report.clean:
+                repaired = f", {report.repaired_rows} bars dropped" if report.repaired_rows else ""
+                progress(f"🩺 {report}{repaired}", symbol=symbol, tf=tf)
+
+        with stats.timer("cache_write", tf, symbol):
+            self.cache.write(symbol, tf, df)
+            self.cache.write_meta(symbol, tf, df, downloaded_rows, quality=report.to_dict() if report else None)
         return df
 
-    def run(self, source_csv: str = "StockList.csv", sectors: Optional[List[str]] = None, symbols: List[str] = None):
-        if symbols is None:
-            symbols = get_symbol_list(csv_path=source_csv, sectors=sectors)
-        print("🚀 Starting demand‑zone scan …")
-        logging.info("🚀 Starting demand‑zone scan …")
+    def _store_refresh(self, symbol: str, tf: str, df: pd.DataFrame) -> pd.DataFrame:
+        with stats.timer("cache_read", tf, symbol):
+            cached = self.cache.read(symbol, tf)
+        fresh = self._prepare_download(symbol, df)
+        merged = merge_bars(cached, fresh)
+        stats.count("cache_refreshes", tf=tf)
+        if fresh.empty:
+            # Nothing new: the cached bars were validated when they were written
+            self.cache.write_meta(symbol, tf, merged, downloaded_rows=0, quality=self.cache.read_meta(symbol, tf).get("quality"))
+        else:
+            merged = self._write_cache(symbol, tf, merged, downloaded_rows=len(fresh))
+            if merged.empty:
+                return merged
+        progress(f"🔄 Refreshed {symbol} ({tf}): {len(fresh)} bars downloaded, {len(merged) - len(cached)} new", symbol=symbol, tf=tf)
+        return merged
 
-        all_zones = []
+    def _load_or_download_data(self, symbol: str, tf: str, period: str) -> pd.DataFrame:
+        if not self._needs_download(symbol, tf):
+            if self._needs_refresh(symbol, tf):
+                start = self._refresh_start(symbol, tf)
+                progress(f"🔄 Refreshing {symbol} ({tf}) from {start.date()} …", symbol=symbol, tf=tf)
+                return self._store_refresh(symbol, tf, self.downloader.download(symbol, tf, period, start=start))
+            progress(f"💾 Cached → {self.cache.path(symbol, tf)}", symbol=symbol, tf=tf)
+            stats.count("cache_hits", tf=tf)
+            with stats.timer("cache_read", tf, symbol):
+                return self.cache.read(symbol, tf)
+
+        progress(f"🌐 Downloading {symbol} ({tf}, {period}) from yfinance …", symbol=symbol, tf=tf)
+        df = self.downloader.download(symbol, tf, period)
+        return self._store_download(symbol, tf, df)
+
+    def _iter_symbol_data(self, symbols: List[str]) -> Iterator[Tuple[str, Callable[[], pd.DataFrame]]]:
+        """
+        Yield (symbol, loader) pairs. Full downloads for uncached symbols and
+        incremental downloads for stale ones are submitted up front and run
+        concurrently while cached symbols are processed; each download is yielded
+        as soon as it completes. With `resample`, the daily series is loaded and the
+        loader returns bars derived for this scanner's timeframe. Symbols quarantined
+        by an earlier cache write are skipped until `quarantine_retry` has passed.
+        """
+        tf, period = self.source_tf, self.source_period
+        kept = []
+        for symbol in symbols:
+            reason = self._quarantined(symbol, tf)
+            if reason:
+                stats.count("quarantine_skips", tf=tf)
+                progress(f"🚧 Skipping quarantined {symbol} ({tf}): {reason}", symbol=symbol, tf=tf)
+                continue
+            kept.append(symbol)
+        symbols = kept
+        to_download = [s for s in symbols if self._needs_download(s, tf)]
+        pending = set(to_download)
+
+        starts = {}
         for symbol in symbols:
+            if symbol in pending or not self._needs_refresh(symbol, tf):
+                continue
             try:
-                df = self._load_or_download_data(symbol, self.tf, self.period)
-                if df.empty:
-                    continue
+                starts[symbol] = self._refresh_start(symbol, tf)
+            except Exception as e:
+                logging.warning(f"❌ Cannot refresh {symbol} [{tf}] – {type(e).__name__}: {e}")
+        pending.update(starts)
+        cached = [s for s in symbols if s not in pending]
+
+        downloads = iter(())
+        if to_download:
+            logging.info(f"🌐 Downloading {len(to_download)} symbols ({tf}, {period}) from yfinance …")
+            downloads = self.downloader.download_many(to_download, tf, period)
+
+        refreshes = iter(())
+        if starts:
+            logging.info(f"🔄 Refreshing {len(starts)} cached symbols ({tf}) with new bars only …")
+            refreshes = self.downloader.download_many(list(starts), tf, period, starts=starts)
+
+        for symbol in cached:
+            yield symbol, lambda symbol=symbol: self._derive(self._load_or_download_data(symbol, tf, period))
+
+        for symbol, raw in downloads:
+            yield symbol, lambda symbol=symbol, raw=raw: self._derive(self._store_download(symbol, tf, raw))
+
+        for symbol, raw in refreshes:
+            yield symbol, lambda symbol=symbol, raw=raw: self._derive(self._store_refresh(symbol, tf, raw))
+
+    def _derive(self, df: pd.DataFrame) -> pd.DataFrame:
+        if not self.resample or df.empty:
+            return df
+        with stats.timer("resample", self.tf):
+            return trim_to_period(resample_ohlcv(df, self.tf), self.period)
+
+    def _load(self, symbol: str, load: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        with stats.timer("load", self.tf, symbol):
+            df = load()
+        if self.plot and not self.sweep:
+            # Held until run() has the symbol's zones, so charts reuse the loaded bars
+            self._frames[symbol] = df
+        return df
+
+    def load_frames(self, symbols: List[str]) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """Yield (symbol, frame) for every symbol that loads with data; errors are reported and skipped."""
+        for symbol, load in self._iter_symbol_data(symbols):
+            try:
+                df = self._load(symbol, load)
+            except Exception as e:
+                stats.count("errors", tf=self.tf)
+                logging.warning(f"❌ Error with {symbol} [{self.tf}] – {type(e).__name__}: {e}")
+                continue
+            if not df.empty:
+                yield symbol, df
+
+    def stale_symbols(self, symbols: List[str]) -> List[str]:
+        """Symbols whose source data is missing from the cache or due for a refresh; quarantined ones are left out."""
+        tf = self.source_tf
+        return [s for s in symbols if not self._quarantined(s, tf) and (self._needs_download(s, tf) or self._needs_refresh(s, tf))]
+
+    def _detect_params(self) -> dict:
+        return {"params": list(self.params), "sweep": [list(p) for p in self.sweep] if self.sweep else None}
+
+    def _cached_zones(self, symbol: str, df: pd.DataFrame) -> Tuple[Optional[str], Optional[DetectResult]]:
+        """Result cache key for this frame and the cached zones, if any."""
+        if self.result_cache is None:
+            return None, None
+        with stats.timer("fingerprint", self.tf, symbol):
+            key = self.result_cache.key(symbol, self.tf, frame_fingerprint(df), self._detect_params())
+        zones = self.result_cache.get(key)
+        stats.count("result_cache_hits" if zones is not None else "result_cache_misses", tf=self.tf)
+        return key, zones
 
-                scanner = DemandZoneScanner(
-                    symbols=[symbol],
-                    timeframes={self.tf: self.period},
-                    fresh_only=self.fresh_only,
-                    plot=self.plot,
-                    local_csv_dir=self.cache_dir
-                )
-                zones_df = scanner.run()
-                zones = zones_df.to_dict(orient="records") if not zones_df.empty else []
+    def _detect(self, symbol: str, df: pd.DataFrame) -> DetectResult:
+        if self.sweep:
+            return detect_zones_sweep(df, self.tf, symbol, self.sweep)
+        if self.incremental is not None:
+            with stats.timer("incremental", self.tf, symbol):
+                return self.incremental.update(df, self.tf, symbol)
+        scanner = DemandZoneScanner(
+            symbols=[symbol],
+            timeframes={self.tf: self.period},
+            fresh_only=self.params.fresh_only,
+            plot=self.plot,
+            local_csv_dir=self.cache_dir,
+            frames={(symbol, self.tf): df},
+            min_base=self.params.min_base,
+            max_base=self.params.max_base,
+            distance_range=self.params.distance_range,
+        )
+        return scanner.scan()
 
-                all_zones.extend(zones)
+    def iter_zones(self, symbols: List[str], executor: Optional[Executor] = None,
+                   max_pending: Optional[int] = None) -> Iterator[Tuple[str, DetectResult]]:
+        """
+        Yield (symbol, zones) as each symbol finishes. With an `executor`, detection
+        jobs are sent as compact arrays and at most `max_pending` are in flight, so
+        loaded frames and finished results never pile up; results come back in the
+        order the symbols were loaded. Symbols whose data and parameters match a
+        `result_cache` entry skip detection. Errors are reported per symbol and skipped.
+        With `panel_size`, detection runs in-process on panels of that many symbols
+        (see `_iter_panels`) and the executor is not used.
+        """
+        if self.panel_size > 0:
+            yield from self._iter_panels(symbols)
+            return
+
+        if executor is None:
+            for symbol, load in self._iter_symbol_data(symbols):
+                try:
+                    df = self._load(symbol, load)
+                    if df.empty:
+                        continue
+                    key, zones = self._cached_zones(symbol, df)
+                    if zones is None:
+                        with stats.timer("detect", self.tf, symbol):
+                            zones = self._detect(symbol, df)
+                        if key is not None:
+                            self.result_cache.put(key, zones)
+                    yield symbol, zones
+                except Exception as e:
+                    stats.count("errors", tf=self.tf)
+                    logging.warning(f"❌ Error with {symbol} [{self.tf}] – {type(e).__name__}: {e}")
+            return
+
+        if max_pending is None:
+            max_pending = 4 * getattr(executor, "_max_workers", os.cpu_count() or 1)
+        state_dir = self.incremental.state_dir if self.incremental is not None else None
+        pending: Deque[Tuple[str, Future, Optional[str]]] = deque()
+        for symbol, load in self._iter_symbol_data(symbols):
+            try:
+                df = self._load(symbol, load)
+                if df.empty:
+                    continue
+                key, zones = self._cached_zones(symbol, df)
+                if zones is not None:
+                    # Queue cached results like finished jobs so the output order is unchanged
+                    future = Future()
+                    future.set_result((symbol, zones, None, None))
+                    pending.append((symbol, future, None))
+                    continue
+                payload = frame_to_arrays(df)
+                future = executor.submit(detect_job, symbol, self.tf, payload, self.params, state_dir, self.sweep)
+                pending.append((symbol, future, key))
+            except Exception as e:
+                stats.count("errors", tf=self.tf)
+                logging.warning(f"❌ Error with {symbol} [{self.tf}] – {type(e).__name__}: {e}")
+            while len(pending) >= max_pending:
+                yield from self._job_result(*pending.popleft())
+        while pending:
+            yield from self._job_result(*pending.popleft())
 
+    def _iter_panels(self, symbols: List[str]) -> Iterator[Tuple[str, DetectResult]]:
+        """
+        Load frames until `panel_size` of them need detection, detect that batch with
+        detect_zones_panel and yield every loaded symbol of it in load order,
+        result cache hits included.
+        """
+        param_sets = self.sweep or [self.params]
+        batch: List[Tuple[str, pd.DataFrame, Optional[str], Optional[DetectResult]]] = []
+        misses = 0
+        for symbol, df in self.load_frames(symbols):
+            try:
+                key, zones = self._cached_zones(symbol, df)
             except Exception as e:
-                print(f"❌ Error with {symbol} [{self.tf}] – {type(e).__name__}: {e}")
+                stats.count("errors", tf=self.tf)
                 logging.warning(f"❌ Error with {symbol} [{self.tf}] – {type(e).__name__}: {e}")
+                continue
+            batch.append((symbol, df, key, zones))
+            misses += zones is None
+            if misses >= self.panel_size:
+                yield from self._panel_results(batch, param_sets)
+                batch, misses = [], 0
+        if batch:
+            yield from self._panel_results(batch, param_sets)
+
+    def _panel_results(self, batch, param_sets) -> Iterator[Tuple[str, DetectResult]]:
+        frames = [(symbol, df) for symbol, df, _, zones in batch if zones is None]
+        try:
+            with stats.timer("panel_detect", self.tf):
+                detected = detect_zones_panel(frames, self.tf, param_sets) if frames else {}
+        except Exception as e:
+            stats.count("errors", len(frames), tf=self.tf)
+            logging.warning(f"❌ Error with a panel of {len(frames)} symbols [{self.tf}] – {type(e).__name__}: {e}")
+            detected = {}
+        for symbol, _, key, zones in batch:
+            if zones is None:
+                if symbol not in detected:
+                    continue
+                zones = detected[symbol] if self.sweep else detected[symbol][self.params]
+                if key is not None:
+                    self.result_cache.put(key, zones)
+            yield symbol, zones
+
+    def _job_result(self, symbol: str, future: Future, key: Optional[str]) -> Iterator[Tuple[str, DetectResult]]:
+        try:
+            _, zones, error, job_stats = future.result()
+            stats.merge(job_stats)
+        except Exception as e:
+            zones, error = [], f"{type(e).__name__}: {e}"
+        if error:
+            stats.count("errors", tf=self.tf)
+            logging.warning(f"❌ Error with {symbol} [{self.tf}] – {error}")
+            return
+        if key is not None:
+            self.result_cache.put(key, zones)
+        yield symbol, zones
+
+    def run(self, source_csv: str = "StockList.csv", sectors: Optional[List[str]] = None, symbols: List[str] = None,
+            executor: Optional[Executor] = None, industries: Optional[List[str]] = None):
+        """
+        Scan `symbols` and stream each symbol's zones to demand_zones_{tf}.{fmt} as it
+        finishes. Only the `top_n` zones by Score are kept in `self.zones` for the
+        summary; `self.zone_count` holds the total written. The output file keeps
+        scan order rather than being sorted by Score.
+
+        In sweep mode every parameter set's zones go to demand_zones_{tf}_sweep.{fmt}
+        with the parameters as leading columns, and `self.sweep_counts` holds the
+        number of zones per parameter set.
+
+        With `collect_zones` (outside sweep mode), every zone written is also kept in
+        `self.all_zones`.
 
-        if all_zones:
-            result_df = pd.DataFrame(all_zones)
-            if not result_df.empty and "Score" in result_df.columns:
-                result_df = result_df.sort_values(by="Score", ascending=False)
-            output_file = f"demand_zones_{self.tf}.csv"
-            result_df.to_csv(output_file, index=False)
-            self.zones = result_df.to_dict(orient="records")
-            print(f"\n📁 Saved to: {output_file}")
-            logging.info(f"📁 Saved demand zones to: {output_file}")
+        With `plot`, the best `plot_top` zones are charted once the scan is done
+        (see `render_plots`); sweeps are not plotted.
+        """
+        if symbols is None:
+            symbols = get_symbol_list(csv_path=source_csv, sectors=sectors, industries=industries)
+        logging.info("🚀 Starting demand‑zone scan …")
+
+        order = {symbol: n for n, symbol in enumerate(symbols)}
+        top = TopZones(self.top_n)
+        self.sweep_counts = {params: 0 for params in self.sweep or []}
+        output_file = result_path(f"{self.tf}_sweep" if self.sweep else self.tf, self.output_format, self.output_dir)
+        plots = TopZones(self.plot_top) if self.plot and not self.sweep else None
+        self._windows = {}
+        self.all_zones = []
+        with ZoneWriter(output_file, self.output_format) as writer:
+            for symbol, result in self.iter_zones(symbols, executor):
+                stats.count("symbols", tf=self.tf)
+                df = self._frames.pop(symbol, None)
+                if self.sweep:
+                    with stats.timer("write_results", self.tf):
+                        for params, zones in result.items():
+                            writer.write(zones, sweep_columns(params))
+                            self.sweep_counts[params] += len(zones)
+                    stats.count("zones", sum(len(zones) for zones in result.values()), tf=self.tf)
+                    continue
+                stats.count("zones", len(result), tf=self.tf)
+                with stats.timer("write_results", self.tf):
+                    writer.write(result)
+                if self.collect_zones:
+                    self.all_zones.extend(result)
+                for zone in result:
+                    rank = order.get(symbol, len(order))
+                    top.push(zone, rank)
+                    if plots is not None and df is not None:
+                        dropped = plots.push(zone, rank)
+                        if dropped is not zone:
+                            self._windows[id(zone)] = zone_window(df, zone).copy()
+                        if dropped is not None:
+                            self._windows.pop(id(dropped), None)
+        self._frames.clear()
+
+        self.zones = top.zones()
+        self.plot_zones = plots.zones() if plots is not None else []
+        self.zone_count = writer.count
+        if writer.count:
+            logging.info(f"📁 Saved {writer.count} demand zones to: {output_file}")
         else:
-            print("🚫 No valid demand zones detected.")
-            logging.info("🚫 No valid demand zones detected.")
\ No newline at end of file
+            logging.info("🚫 No valid demand zones detected.")
+
+        if self.plot_zones:
+            self.render_plots(executor)
+
+    def render_plots(self, executor: Optional[Executor] = None) -> List[str]:
+        """
+        Chart the best `plot_top` zones of the last run from their kept bars, in
+        `executor` or else a pool of `plot_workers` processes (in-process when 0).
+        Writes one HTML per zone sharing plots/plotly.min.js, or with
+        `plot_combined` a single plots/demand_zones_{tf}.html.
+        """
+        logging.info(f"📈 Rendering {len(self.plot_zones)} charts ({self.tf}) …")
+        with stats.timer("plot", self.tf):
+            if executor is None and self.plot_workers > 0:
+                with ProcessPoolExecutor(max_workers=self.plot_workers, **pool_logging()) as pool:
+                    paths = render_zones(self.plot_zones, self._windows, self.tf, self.plot_dir, self.plot_combined, pool)
+            else:
+                paths = render_zones(self.plot_zones, self._windows, self.tf, self.plot_dir, self.plot_combined, executor)
+        self._windows = {}
+        logging.info(f"📈 Saved {len(paths)} chart file(s) for {len(self.plot_zones)} zones to: {self.plot_dir}")
+        return paths
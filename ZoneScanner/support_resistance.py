@@ -1,28 +1,100 @@
 # support_resistance.py
+from bisect import bisect_left, bisect_right, insort
+import numpy as np
 
-def detect_support_resistance(df, swing=2, tolerance=0.015, min_touches=2):
+def pivot_masks(high, low, start, stop, swing=2):
     """
-    Detects support and resistance levels using swing high/low logic.
-    Returns a dictionary with 'Support' and 'Resistance' levels.
+    Vectorized swing detection over candles [start, stop). A candle is a resistance
+    pivot when its high is strictly above the max of the `swing` highs on each side,
+    and a support pivot when its low is strictly below the min of the lows on each side.
+    Returns (indices, is_resistance, is_support) for the scanned range. `high`/`low`
+    may also be 2D (one row per symbol); the masks then have one row per symbol too.
     """
-    support = []
-    resistance = []
+    start = max(start, swing)
+    stop = min(stop, high.shape[-1] - swing)
+    if stop <= start:
+        empty = np.zeros(high.shape[:-1] + (0,), dtype=bool)
+        return np.arange(0), empty, empty
+
+    # windows[..., k] covers candles k .. k + swing - 1; NaN propagates as with max/min
+    width = high.shape[-1] - swing + 1
+    high_windows = high[..., :width].copy()
+    low_windows = low[..., :width].copy()
+    for k in range(1, swing):
+        np.maximum(high_windows, high[..., k:k + width], out=high_windows)
+        np.minimum(low_windows, low[..., k:k + width], out=low_windows)
 
-    for i in range(swing, len(df) - swing):
-        high = df['High'].iloc[i]
-        low = df['Low'].iloc[i]
+    idx = np.arange(start, stop)
+    h = high[..., idx]
+    l = low[..., idx]
+    with np.errstate(invalid="ignore"):
+        is_res = (h > high_windows[..., idx - swing]) & (h > high_windows[..., idx + 1])
+        is_sup = (l < low_windows[..., idx - swing]) & (l < low_windows[..., idx + 1])
+    return idx, is_res, is_sup
 
-        # Detect resistance (local maximum)
-        is_res = all(high > df['High'].iloc[i - j] and high > df['High'].iloc[i + j] for j in range(1, swing + 1))
-        if is_res and not any(abs(high - r) / r < tolerance for r in resistance):
-            resistance.append(high)
+def _is_new_level(levels, value, tolerance):
+    """
+    True when no level in the sorted list is within `tolerance` of it, using the
+    same relative test as before (abs(value - level) / level < tolerance). Only the
+    levels inside a slightly padded bisect window around `value` are checked.
+    """
+    if not levels:
+        return True
+    if value <= 0 or levels[0] <= 0:
+        return not any(abs(value - r) / r < tolerance for r in levels)
+    lo = bisect_left(levels, value / (1 + tolerance) * (1 - 1e-9))
+    hi = bisect_right(levels, value / (1 - tolerance) * (1 + 1e-9)) if tolerance < 1 else len(levels)
+    for r in levels[lo:hi]:
+        if abs(value - r) / r < tolerance:
+            return False
+    return True
+
+def insert_levels(support, resistance, pivot_highs, pivot_lows, tolerance=0.015):
+    """
+    Insert pivot highs/lows, in candle order, into the sorted `resistance` and
+    `support` lists in place, skipping any within `tolerance` of an existing level.
+    Levels are kept as Python floats, which compare and divide faster than NumPy scalars.
+    """
+    for levels, values in ((resistance, pivot_highs), (support, pivot_lows)):
+        for value in np.asarray(values, dtype="float64").tolist():
+            if _is_new_level(levels, value, tolerance):
+                insort(levels, value)
 
-        # Detect support (local minimum)
-        is_sup = all(low < df['Low'].iloc[i - j] and low < df['Low'].iloc[i + j] for j in range(1, swing + 1))
-        if is_sup and not any(abs(low - s) / s < tolerance for s in support):
-            support.append(low)
+def scan_levels(high, low, start, stop, support, resistance, swing=2, tolerance=0.015):
+    """
+    Scan candles [start, stop) for swing highs/lows and insert new levels into the
+    sorted `support` and `resistance` lists in place. `high`/`low` are NumPy arrays;
+    a candle needs `swing` neighbours on both sides to qualify.
+    """
+    idx, is_res, is_sup = pivot_masks(high, low, start, stop, swing)
+    insert_levels(support, resistance, high[idx[is_res]], low[idx[is_sup]], tolerance)
 
+def finalize_levels(support, resistance):
+    """Round and de-duplicate raw levels into the sorted lists detect_zones uses."""
     return {
-        "Support": sorted(set(round(s, 2) for s in support)),
-        "Resistance": sorted(set(round(r, 2) for r in resistance))
-    }
\ No newline at end of file
+        "Support": list(np.unique(np.round(np.asarray(support, dtype="float64"), 2))),
+        "Resistance": list(np.unique(np.round(np.asarray(resistance, dtype="float64"), 2)))
+    }
+
+def nearest_levels(supports, resistances, price):
+    """
+    Nearest support at or below `price` and nearest resistance at or above it,
+    found by bisection in the sorted level lists. Either may be None.
+    """
+    i = bisect_right(supports, price)
+    j = bisect_left(resistances, price)
+    nearest_support = supports[i - 1] if i > 0 else None
+    nearest_resistance = resistances[j] if j < len(resistances) else None
+    return nearest_support, nearest_resistance
+
+def detect_support_resistance(df, swing=2, tolerance=0.015, min_touches=2):
+    """
+    Detects support and resistance levels using swing high/low logic.
+    Returns a dictionary with 'Support' and 'Resistance' levels.
+    """
+    support = []
+    resistance = []
+    high = df['High'].to_numpy(dtype="float64")
+    low = df['Low'].to_numpy(dtype="float64")
+    scan_levels(high, low, swing, len(df) - swing, support, resistance, swing, tolerance)
+    return finalize_levels(support, resistance)
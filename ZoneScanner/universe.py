@@ -0,0 +1,185 @@
+import os
+import csv
+import pickle
+import logging
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional
+import numpy as np
+
+# Bump when the on-disk index layout changes so older index files are rebuilt
+UNIVERSE_INDEX_VERSION = 1
+
+# Cell values pandas reads as missing; rows with such a YahooSymbol are skipped like dropna() did
+NA_VALUES = {"", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+             "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null"}
+
+
+class StockInfo(NamedTuple):
+    symbol: str
+    sector: Optional[str]
+    industry: Optional[str]
+    isin: Optional[str]
+
+
+def _value(row: dict, column: str) -> Optional[str]:
+    value = (row.get(column) or "").strip()
+    return None if value in NA_VALUES else value
+
+
+def _codes(values: List[Optional[str]]):
+    """Category names and one small integer code per row (-1 for missing)."""
+    names = sorted({v for v in values if v is not None})
+    lookup = {name: i for i, name in enumerate(names)}
+    return names, np.array([lookup.get(v, -1) for v in values], dtype="int16")
+
+
+class StockUniverse:
+    """
+    Symbol universe parsed once from StockList.csv into a compact index: the
+    YahooSymbol list in file order, sector and industry as integer codes and the
+    ISIN per symbol. The index is pickled next to the CSV and reused while the
+    CSV's mtime and size are unchanged, so later runs skip CSV parsing entirely.
+    Use `get_universe()` to share one instance per CSV across the process.
+    """
+
+    def __init__(self, csv_path: str = "StockList.csv"):
+        self.csv_path = csv_path
+        self.index_path = f"{csv_path}.idx.pkl"
+        st = os.stat(csv_path)
+        self.signature = (st.st_mtime_ns, st.st_size)
+        index = self._read_index()
+        if index is None:
+            index = self._parse()
+            self._write_index(index)
+        self.all_symbols = index["symbols"]
+        self.isins = index["isins"]
+        self.sector_names = index["sector_names"]
+        self.sector_codes = index["sector_codes"]
+        self.industry_names = index["industry_names"]
+        self.industry_codes = index["industry_codes"]
+        self.positions = {symbol: i for i, symbol in enumerate(self.all_symbols)}
+
+    def _read_index(self) -> Optional[dict]:
+        try:
+            with open(self.index_path, "rb") as f:
+                index = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"♻️ Rebuilding unreadable universe index {self.index_path} – {type(e).__name__}: {e}")
+            return None
+        if index.get("version") != UNIVERSE_INDEX_VERSION or index.get("signature") != self.signature:
+            return None
+        return index
+
+    def _parse(self) -> dict:
+        symbols, isins, sectors, industries = [], [], [], []
+        with open(self.csv_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                symbol = _value(row, "YahooSymbol")
+                if symbol is None:
+                    continue
+                symbols.append(symbol)
+                isins.append(_value(row, "ISIN NUMBER"))
+                sectors.append(_value(row, "Sector"))
+                industries.append(_value(row, "Industry"))
+        sector_names, sector_codes = _codes(sectors)
+        industry_names, industry_codes = _codes(industries)
+        logging.info(f"📇 Indexed {len(symbols)} symbols from {self.csv_path}")
+        return {
+            "version": UNIVERSE_INDEX_VERSION,
+            "signature": self.signature,
+            "symbols": symbols,
+            "isins": isins,
+            "sector_names": sector_names,
+            "sector_codes": sector_codes,
+            "industry_names": industry_names,
+            "industry_codes": industry_codes,
+        }
+
+    def _write_index(self, index: dict) -> None:
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logging.warning(f"⚠️ Could not save universe index {self.index_path} – {e}")
+
+    def is_current(self) -> bool:
+        """False once the CSV has been modified or removed since it was indexed."""
+        try:
+            st = os.stat(self.csv_path)
+        except FileNotFoundError:
+            return False
+        return (st.st_mtime_ns, st.st_size) == self.signature
+
+    def __len__(self) -> int:
+        return len(self.all_symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.positions
+
+    def _mask(self, codes: np.ndarray, names: List[str], wanted: Iterable[str]) -> np.ndarray:
+        lookup = {name: i for i, name in enumerate(names)}
+        wanted_codes = [lookup[name] for name in wanted if name in lookup]
+        return np.isin(codes, wanted_codes)
+
+    def symbols(self, sectors: Optional[List[str]] = None, industries: Optional[List[str]] = None,
+                limit: Optional[int] = None) -> List[str]:
+        """YahooSymbols in file order, optionally restricted to the given sectors and/or industries."""
+        if sectors is None and industries is None:
+            selected = self.all_symbols
+        else:
+            mask = np.ones(len(self.all_symbols), dtype=bool)
+            if sectors is not None:
+                mask &= self._mask(self.sector_codes, self.sector_names, sectors)
+            if industries is not None:
+                mask &= self._mask(self.industry_codes, self.industry_names, industries)
+            selected = [self.all_symbols[i] for i in np.flatnonzero(mask)]
+        return list(selected[:limit] if limit else selected)
+
+    def info(self, symbol: str) -> Optional[StockInfo]:
+        i = self.positions.get(symbol)
+        if i is None:
+            return None
+        sector, industry = self.sector_codes[i], self.industry_codes[i]
+        return StockInfo(
+            symbol,
+            self.sector_names[sector] if sector >= 0 else None,
+            self.industry_names[industry] if industry >= 0 else None,
+            self.isins[i],
+        )
+
+    def sectors(self) -> Dict[str, int]:
+        """Symbol count per sector."""
+        counts = np.bincount(self.sector_codes[self.sector_codes >= 0], minlength=len(self.sector_names))
+        return dict(zip(self.sector_names, counts.tolist()))
+
+    def industries(self) -> Dict[str, int]:
+        """Symbol count per industry."""
+        counts = np.bincount(self.industry_codes[self.industry_codes >= 0], minlength=len(self.industry_names))
+        return dict(zip(self.industry_names, counts.tolist()))
+
+
+_universes: Dict[str, StockUniverse] = {}
+_universes_lock = threading.Lock()
+
+
+def get_universe(csv_path: str = "StockList.csv", sectors: Optional[List[str]] = None) -> StockUniverse:
+    """
+    The process-wide StockUniverse for `csv_path`, re-indexed when the file changes.
+    When the CSV does not exist yet it is first built with the StockFetcher crawl
+    (for `sectors`, as `fetch_stocks` does).
+    """
+    key = os.path.abspath(csv_path)
+    with _universes_lock:
+        universe = _universes.get(key)
+        if universe is not None and universe.is_current():
+            return universe
+        if not os.path.exists(csv_path):
+            from ZoneScanner.fetch import fetch_stocks
+            fetch_stocks(limit=None, sectors=sectors, csv_file=csv_path)
+        universe = StockUniverse(csv_path)
+        _universes[key] = universe
+        return universe
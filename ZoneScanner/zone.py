@@ -0,0 +1,131 @@
+from typing import List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+TF_LABELS = {"1mo": "Month", "1wk": "Week", "1d": "Day"}
+TIME_FORMATS = {"Month": "%Y-%m", "Week": "%m-%d", "Day": "%Y-%m-%d"}
+ZONE_TYPES = {"1mo": "MIT", "1wk": "WIT", "1d": "DIT"}
+
+# CSV columns read straight off a Zone attribute or property by `zone[column]`
+ZONE_ATTRS = {
+    "Symbol": "symbol", "Timeframe": "tf", "Start": "start", "Entry": "entry", "Stop Loss": "stop_loss",
+    "Green After LegOut": "green_after_legout", "Score": "score", "Fresh": "fresh", "Base Count": "base_len",
+    "Nearest Support": "nearest_support", "Nearest Resistance": "nearest_resistance",
+    "S/R Zone Position": "sr_position", "Distance": "distance_pct", "RR Ratio": "rr_ratio",
+    "Stop Loss %": "stop_loss_pct", "Quantity": "quantity",
+}
+
+
+def wall_time_ns(dates) -> np.ndarray:
+    """
+    Bar dates as int64 nanoseconds in local wall time, so a tz-aware bar formats to
+    the same calendar date as its Timestamp would.
+    """
+    index = pd.DatetimeIndex(dates)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.asi8
+
+
+class Zone:
+    """
+    Compact demand-zone record. Holds the raw bar index, prices, scores and the bar
+    dates as int64 nanoseconds (leg-in, base candles, leg-out); the rounded prices,
+    formatted dates and labels of the CSV columns are only built by `to_dict`.
+    `zone["Entry"]` style access reads the same columns for display code.
+    """
+
+    __slots__ = (
+        "symbol", "tf", "index", "base_len", "proximal", "distal", "fresh", "score",
+        "leg_out_strength", "green_after_legout", "dates", "distance_pct", "stop_loss_pct",
+        "nearest_support", "nearest_resistance", "sr_position", "rr_ratio", "quantity",
+    )
+
+    def __init__(self, symbol: str, tf: str, index: int, base_len: int, proximal: float, distal: float,
+                 fresh: bool, score: int, leg_out_strength: float, green_after_legout: int,
+                 dates: Sequence[int], distance_pct: float, stop_loss_pct: float,
+                 nearest_support: Optional[float], nearest_resistance: Optional[float],
+                 sr_position: str, rr_ratio: float, quantity: int):
+        self.symbol = symbol
+        self.tf = tf
+        self.index = index
+        self.base_len = base_len
+        self.proximal = proximal
+        self.distal = distal
+        self.fresh = fresh
+        self.score = score
+        self.leg_out_strength = leg_out_strength
+        self.green_after_legout = green_after_legout
+        self.dates = tuple(dates)
+        self.distance_pct = distance_pct
+        self.stop_loss_pct = stop_loss_pct
+        self.nearest_support = nearest_support
+        self.nearest_resistance = nearest_resistance
+        self.sr_position = sr_position
+        self.rr_ratio = rr_ratio
+        self.quantity = quantity
+
+    def _key(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other):
+        if not isinstance(other, Zone):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __repr__(self):
+        return f"Zone({self.symbol} {self.tf} {self.start} Entry={self.entry} Stop={self.stop_loss} Score={self.score})"
+
+    def __getitem__(self, column: str):
+        name = ZONE_ATTRS.get(column)
+        if name is not None:
+            return getattr(self, name)
+        # Rounded, formatted and labelled columns are only built by to_dict
+        return self.to_dict()[column]
+
+    @property
+    def entry(self) -> float:
+        return round(self.proximal, 2)
+
+    @property
+    def stop_loss(self) -> float:
+        return round(self.distal, 2)
+
+    @property
+    def start(self) -> str:
+        return pd.Timestamp(self.dates[1]).strftime("%Y-%m-%d")
+
+    def to_dict(self) -> dict:
+        """The zone as the row written to demand_zones_{tf}.csv."""
+        label = TF_LABELS.get(self.tf, "Month")
+        time_fmt = TIME_FORMATS[label]
+        leg_in, *base, leg_out = [pd.Timestamp(ns) for ns in self.dates]
+        return {
+            "Symbol": self.symbol,
+            "Timeframe": self.tf,
+            "Start": self.start,
+            "Entry": self.entry,
+            "Stop Loss": self.stop_loss,
+            "Equilibrium": round((self.proximal + self.distal) / 2, 2),
+            "Green After LegOut": self.green_after_legout,
+            "Score": self.score,
+            "Fresh": self.fresh,
+            "Legout Strength": round(self.leg_out_strength, 2),
+            "Base Count": self.base_len,
+            f"Base {label}": ", ".join(d.strftime(time_fmt) for d in base),
+            f"Leg-in {label}": leg_in.strftime(time_fmt),
+            f"Leg-out {label}": leg_out.strftime(time_fmt),
+            "Zone Type": ZONE_TYPES.get(self.tf, "Unknown"),
+            "Nearest Support": self.nearest_support,
+            "Nearest Resistance": self.nearest_resistance,
+            "S/R Zone Position": self.sr_position,
+            "Distance": self.distance_pct,
+            "RR Ratio": self.rr_ratio,
+            "Stop Loss %": self.stop_loss_pct,
+            "Quantity": self.quantity,
+            "Position Size ₹": round(self.quantity * self.proximal, 2),
+        }
+
+
+def zones_to_frame(zones: List[Zone]) -> pd.DataFrame:
+    return pd.DataFrame([zone.to_dict() for zone in zones])
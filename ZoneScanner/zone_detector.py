@@ -1,9 +1,38 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
 import os
-import plotly.graph_objects as go
+import time
 import logging
-from ZoneScanner.support_resistance import detect_support_resistance
+from typing import Dict, List, NamedTuple, Tuple
+from ZoneScanner.support_resistance import detect_support_resistance, nearest_levels
+from ZoneScanner.zone import Zone, wall_time_ns, zones_to_frame
+from ZoneScanner.instrumentation import stats
+from ZoneScanner.logs import progress
+
+def clean_ohlc_frame(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    """
+    Normalize a downloaded or cached OHLCV frame: drop duplicate columns, strip the
+    `_{symbol}` suffix from flattened yfinance columns, coerce prices to numbers and
+    drop incomplete candles.
+    """
+    df = df.loc[:, ~df.columns.duplicated()]
+    suffix = f"_{symbol}"
+    rename_map = {
+        f"Open{suffix}": "Open", f"High{suffix}": "High",
+        f"Low{suffix}": "Low", f"Close{suffix}": "Close",
+        f"Volume{suffix}": "Volume"
+    }
+    df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns}, inplace=True)
+
+    for col in ["Open", "High", "Low", "Close", "Volume"]:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    df.dropna(subset=["Open", "High", "Low", "Close"], inplace=True)
+    df.index.name = "Date"
+    df["Date"] = df.index
+    return df
 
 def to_float(x):
     try:
@@ -45,6 +74,305 @@ def count_green_after_legout(df, legout_end_idx):
             break  # defensively break on any data issue
     return count
     
+def _build_zone(symbol, tf, proximal, distal, *, index, fresh, score, leg_out_strength, base_len,
+                green_after_legout, dates, distance_pct, stop_loss_pct, all_supports, all_resistances):
+    """
+    Apply the S/R, risk/reward and position sizing rules to a candidate that already
+    passed the pattern, score and distance filters. `dates` are the wall-time
+    nanoseconds of the leg-in, base and leg-out candles. Returns a Zone or None.
+    """
+    support_threshold_pct = 1.5  # within 1.5% = "Near Support"
+    resistance_threshold_pct = 1.5  # within 1.5% = "Near Resistance"
+
+    # ✅ Curve Position
+    #curve_low = df["Low"].min()
+    #curve_high = df["High"].max()
+    #position = (equilibrium - curve_low) / (curve_high - curve_low)
+
+    #if position <= 0.25:
+    #    curve_label = "Very Low on Curve"
+    #elif position <= 0.5:
+    #    curve_label = "Low on Curve"
+    #else:
+    #    curve_label = "High on Curve"
+
+    # === Nearest Support & Resistance ===
+    nearest_support, nearest_resistance = nearest_levels(all_supports, all_resistances, proximal)
+
+    # === Position Sizing Logic ===
+    capital = 100000             # total capital (set dynamically if needed)
+    risk_pct = 0.01              # risk per trade (1%)
+    capital_to_risk = capital * risk_pct
+    stop_loss_price = round(proximal - distal, 2)
+
+    if nearest_resistance is not None and stop_loss_price > 0:
+        rr_ratio = round((nearest_resistance - proximal) / stop_loss_price, 2)
+    else:
+        rr_ratio = None
+
+    if rr_ratio is None or rr_ratio < 1.5:
+        return None  # skip trades with poor risk/reward
+
+    quantity = int(capital_to_risk // stop_loss_price) if stop_loss_price > 0 else 0
+    position_size_value = round(quantity * proximal, 2)
+
+    max_exposure_pct = 0.2  # max 20% capital per trade
+    if position_size_value > capital * max_exposure_pct:
+        progress(f"⛔ Skipped {symbol}: position ₹{position_size_value} > max allowed ₹{capital * max_exposure_pct}", symbol=symbol, tf=tf)
+        return None  # skip oversized trades
+
+    sr_position = "In Between"
+    if nearest_support is not None:
+        support_gap_pct = abs((proximal - nearest_support) / proximal) * 100
+        if support_gap_pct <= support_threshold_pct:
+            sr_position = "Near Support"
+
+    if nearest_resistance is not None:
+        resistance_gap_pct = abs((nearest_resistance - proximal) / proximal) * 100
+        if resistance_gap_pct <= resistance_threshold_pct:
+            sr_position = "Near Resistance"
+
+    # If it's near both (rare but can happen), prioritize support
+    if "Near Support" in sr_position and "Near Resistance" in sr_position:
+        sr_position = "Near Support"
+
+    return Zone(
+        symbol, tf, index, base_len, proximal, distal,
+        fresh=fresh,
+        score=score,
+        leg_out_strength=leg_out_strength,
+        green_after_legout=green_after_legout,
+        dates=dates,
+        distance_pct=distance_pct,
+        stop_loss_pct=stop_loss_pct,
+        nearest_support=nearest_support,
+        nearest_resistance=nearest_resistance,
+        sr_position=sr_position,
+        rr_ratio=rr_ratio,
+        quantity=quantity,
+    )
+
+def _suffix_min(values: np.ndarray) -> np.ndarray:
+    """
+    Reverse cumulative minimum along the last axis: out[..., i] = min(values[..., i:]),
+    ignoring NaN.
+    """
+    return np.fmin.accumulate(values[..., ::-1], axis=-1)[..., ::-1]
+
+def _run_lengths_from(mask: np.ndarray) -> np.ndarray:
+    """
+    Number of consecutive True values starting at each position along the last axis:
+    out[i] = k when mask[i:i + k] is all True and mask[i + k] is False (or the end).
+    """
+    rev = mask[..., ::-1].astype(np.int64)
+    total = np.cumsum(rev, axis=-1)
+    last_reset = np.maximum.accumulate(np.where(rev == 0, total, 0), axis=-1)
+    return (total - last_reset)[..., ::-1]
+
+def _candle_masks(o, h, l, c, v) -> dict:
+    """
+    Per-candle arrays and masks for the vectorized engine. Prices are 1D for one
+    frame or 2D (symbols × bars) for a panel; everything runs along the last axis.
+    """
+    body = c - o
+    rng = h - l
+    abs_body = np.abs(body)
+    with np.errstate(invalid="ignore"):
+        base_mask = (abs_body < 0.5 * rng) & (rng > 0)
+        strong_mask = (c > o) & (abs_body >= 0.5 * rng)
+        green_mask = c > o
+
+    # Prefix count of base candles: a run [i, i + k) is all-base when the count is k
+    counts = np.cumsum(base_mask, axis=-1, dtype=np.int64)
+    base_count = np.concatenate((np.zeros(counts.shape[:-1] + (1,), dtype=np.int64), counts), axis=-1)
+
+    # Freshness and green-after-legout become O(1) lookups into these
+    low_suffix_min = _suffix_min(l)
+    green_run = _run_lengths_from(green_mask)
+
+    return {
+        "Open": o, "High": h, "Low": l, "Close": c, "Volume": v,
+        "body": body, "range": rng,
+        "base": base_mask, "strong": strong_mask, "green": green_mask,
+        "base_count": base_count,
+        "low_suffix_min": low_suffix_min,
+        "green_run": green_run,
+    }
+
+def _candle_arrays(df: pd.DataFrame) -> dict:
+    """
+    Precompute per-candle NumPy arrays and masks once per frame for the vectorized engine.
+    """
+    return _candle_masks(*(df[col].to_numpy(dtype="float64") for col in ("Open", "High", "Low", "Close", "Volume")))
+
+class ZoneParams(NamedTuple):
+    """One set of detection parameters; hashable so sweep results can be keyed by it."""
+    fresh_only: bool = True
+    min_base: int = 1
+    max_base: int = 3
+    distance_range: Tuple[float, float] = (1.0, 5.0)
+
+
+def _pattern_candidates(arr: dict, n: int, min_base: int, max_base: int, fresh_only: bool) -> list:
+    """
+    Match the leg-in/base/leg-out pattern for every base length in bulk and return
+    (i, base_len, proximal, distal, fresh, score, leg_out_strength) for candidates
+    scoring at least 3, in detect_zones emission order (base start, longest base first).
+    """
+    l, c, v = arr["Low"], arr["Close"], arr["Volume"]
+    body, strong, base_count = arr["body"], arr["strong"], arr["base_count"]
+    low_suffix_min = arr["low_suffix_min"]
+
+    candidates = []
+    for base_len in range(max_base, min_base - 1, -1):
+        # Base start i ranges over [3, n - 4) with the leg-out candle i + base_len < n - 1
+        stop = min(n - 4, n - base_len - 1)
+        if stop <= 3:
+            continue
+        idx = np.arange(3, stop)
+
+        mask = (base_count[idx + base_len] - base_count[idx]) == base_len
+        mask &= strong[idx - 1] & strong[idx + base_len]
+        idx = idx[mask]
+        if idx.size == 0:
+            continue
+
+        windows = idx[:, None] + np.arange(base_len)
+        proximal = np.nanmax(c[windows], axis=1)
+        distal = np.nanmin(l[windows], axis=1)
+
+        # Fresh when no low after the leg-out candle trades back into the base
+        fresh = ~(low_suffix_min[idx + base_len + 1] <= proximal)
+        if fresh_only:
+            keep = fresh
+            idx, proximal, distal, fresh, windows = idx[keep], proximal[keep], distal[keep], fresh[keep], windows[keep]
+            if idx.size == 0:
+                continue
+
+        base_vol_window = v[windows]
+        vol_counts = np.sum(~np.isnan(base_vol_window), axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            base_vol = np.where(vol_counts > 0, np.nansum(base_vol_window, axis=1) / vol_counts, np.nan)
+            leg_out_vol = v[idx + base_len]
+            vol_spike = (base_vol > 0) & (leg_out_vol > 1.5 * base_vol)
+
+        leg_in_strength = np.abs(body[idx - 1])
+        leg_out_strength = body[idx + base_len]
+        score = np.where(fresh, 2, 1) + np.where(leg_out_strength > 2 * leg_in_strength, 2, 1) + vol_spike.astype(int)
+
+        keep = score >= 3
+        for j in np.flatnonzero(keep):
+            candidates.append((int(idx[j]), base_len, float(proximal[j]), float(distal[j]),
+                               bool(fresh[j]), int(score[j]), float(leg_out_strength[j])))
+
+    candidates.sort(key=lambda cand: (cand[0], -cand[1]))
+    return candidates
+
+
+def _zones_from_candidates(candidates, tf, symbol, param_sets, cmp, green_run, levels, bar_dates) -> Dict[ZoneParams, List[Zone]]:
+    """
+    Filter pattern candidates of one symbol by each parameter set and build their
+    zones. `levels` (support/resistance) and `bar_dates` are callables, only called
+    once a candidate passes some parameter set's filters.
+    """
+    results = {params: [] for params in param_sets}
+    started = time.perf_counter()
+    sr_seconds = 0.0
+    sr_levels = None
+    dates = None
+    for i, base_len, proximal, distal, fresh, score, leg_out_strength in candidates:
+        distance_pct = round(((cmp - proximal) / cmp) * 100, 2)
+        stop_loss_pct = round(((proximal - distal) / proximal) * 100, 2)
+        wanted = [
+            params for params in param_sets
+            if params.min_base <= base_len <= params.max_base
+            and (fresh or not params.fresh_only)
+            and not (distance_pct < params.distance_range[0] or distance_pct > params.distance_range[1])
+        ]
+        if not wanted:
+            continue
+
+        if sr_levels is None:
+            sr_started = time.perf_counter()
+            sr_levels = levels()
+            sr_seconds = time.perf_counter() - sr_started
+            stats.record("support_resistance", sr_seconds, tf, symbol)
+            dates = bar_dates()
+
+        zone = _build_zone(
+            symbol, tf, proximal, distal,
+            index=i,
+            fresh=fresh,
+            score=score,
+            leg_out_strength=leg_out_strength,
+            base_len=base_len,
+            green_after_legout=int(green_run[i + base_len + 1]),
+            dates=dates[i - 1:i + base_len + 1].tolist(),
+            distance_pct=distance_pct,
+            stop_loss_pct=stop_loss_pct,
+            all_supports=sr_levels.get("Support", []),
+            all_resistances=sr_levels.get("Resistance", []),
+        )
+        if zone is not None:
+            for params in wanted:
+                results[params].append(zone)
+
+    stats.record("zone_build", time.perf_counter() - started - sr_seconds, tf, symbol)
+    return results
+
+
+def detect_zones_sweep(df: pd.DataFrame, tf: str, symbol: str, param_sets) -> Dict[ZoneParams, List[Zone]]:
+    """
+    Evaluate several parameter sets on one frame in a single pass. Candle masks,
+    freshness, green runs and support/resistance are computed once; pattern
+    candidates are matched once for the widest base-length range and each zone is
+    built once, then every parameter set just filters them. Each result equals
+    detect_zones_vectorized with those parameters.
+    """
+    param_sets = [ZoneParams(*p) for p in param_sets]
+    results = {params: [] for params in param_sets}
+    n = len(df)
+    if n < 8 or not param_sets:
+        return results
+
+    # Frames from the loaders already carry a DatetimeIndex and Date column; only copy otherwise
+    if not isinstance(df.index, pd.DatetimeIndex) or "Date" not in df.columns:
+        df = df.copy()
+        df.index = pd.to_datetime(df.index)
+        if "Date" not in df.columns:
+            df["Date"] = df.index
+
+    started = time.perf_counter()
+    arr = _candle_arrays(df)
+    green_run = arr["green_run"]
+    cmp = float(arr["Close"][-1])
+    candidates = _pattern_candidates(
+        arr, n,
+        min(p.min_base for p in param_sets),
+        max(p.max_base for p in param_sets),
+        all(p.fresh_only for p in param_sets),
+    )
+    stats.record("candidates", time.perf_counter() - started, tf, symbol)
+    if not candidates:
+        return results
+
+    return _zones_from_candidates(
+        candidates, tf, symbol, param_sets, cmp, green_run,
+        lambda: detect_support_resistance(df),
+        lambda: wall_time_ns(df["Date"]),
+    )
+
+
+def detect_zones_vectorized(df: pd.DataFrame, tf: str, symbol: str, fresh_only: bool = True, min_base: int = 1, max_base: int = 3, distance_range=(1.0, 5.0)) -> list[Zone]:
+    """
+    Vectorized equivalent of detect_zones. Candle masks are computed once as NumPy arrays
+    and the leg-in/base/leg-out pattern is matched for each base length in bulk; only the
+    surviving candidates are turned into Zone records, whose to_dict() rows match
+    detect_zones exactly.
+    """
+    params = ZoneParams(fresh_only, min_base, max_base, tuple(distance_range))
+    return detect_zones_sweep(df, tf, symbol, [params])[params]
+
 def detect_zones(df: pd.DataFrame, tf: str, symbol: str, fresh_only: bool = True, min_base: int = 1, max_base: int = 3, distance_range=(1.0, 5.0)) -> list[dict]:
     zones = []
     df = df.copy()
@@ -56,14 +384,11 @@ def detect_zones(df: pd.DataFrame, tf: str, symbol: str, fresh_only: bool = True
     sr_levels = detect_support_resistance(df)
     all_supports = sr_levels.get("Support", [])
     all_resistances = sr_levels.get("Resistance", [])
-    
-    support_threshold_pct = 1.5  # within 1.5% = "Near Support"
-    resistance_threshold_pct = 1.5  # within 1.5% = "Near Resistance"
-
 
-    tf_label_map = {"1mo": "Month", "1wk": "Week", "1d": "Day"}
-    label = tf_label_map.get(tf, "Month")
-    time_fmt = {"Month": "%Y-%m", "Week": "%m-%d", "Day": "%Y-%m-%d"}[label]
+    # === Precompute future-low minimum and green-run lengths once per DF ===
+    low_suffix_min = _suffix_min(df["Low"].to_numpy(dtype="float64"))
+    green_run = _run_lengths_from((df["Close"] > df["Open"]).to_numpy())
+    dates = wall_time_ns(df["Date"])
 
     for i in range(3, len(df) - 4):
         leg_in = df.iloc[i - 1]
@@ -81,11 +406,7 @@ def detect_zones(df: pd.DataFrame, tf: str, symbol: str, fresh_only: bool = True
             if not is_strong_bullish(leg_in) or not is_strong_bullish(leg_out_candle):
                 continue
 
-            future = df.iloc[i + base_len + 1:]
-            fresh = True
-            if not future.empty and "Low" in future.columns:
-                fresh_vals = (future["Low"] <= to_float(base["Close"].max()))
-                fresh = not bool(fresh_vals.any().item())
+            fresh = not bool(low_suffix_min[i + base_len + 1] <= to_float(base["Close"].max()))
             if fresh_only and not fresh:
                 continue
 
@@ -99,7 +420,6 @@ def detect_zones(df: pd.DataFrame, tf: str, symbol: str, fresh_only: bool = True
             if score < 3:
                 continue
 
-            start_date = to_scalar(base["Date"].iloc[0])
             cmp = to_float(df["Close"].iloc[-1])
             proximal = to_float(base["Close"].max())
             distal = to_float(base["Low"].min())
@@ -110,199 +430,85 @@ def detect_zones(df: pd.DataFrame, tf: str, symbol: str, fresh_only: bool = True
                 continue
 
             # ✅ Green candles after leg-out
-            green_candles_after_legout = count_green_after_legout(df, legout_end_idx)
-            
-            # ✅ Equilibrium
-            equilibrium = round((proximal + distal) / 2, 2)
-
-            # ✅ Curve Position
-            #curve_low = df["Low"].min()
-            #curve_high = df["High"].max()
-            #position = (equilibrium - curve_low) / (curve_high - curve_low)
-
-            #if position <= 0.25:
-            #    curve_label = "Very Low on Curve"
-            #elif position <= 0.5:
-            #    curve_label = "Low on Curve"
-            #else:
-            #    curve_label = "High on Curve"
-
-            # === Nearest Support & Resistance ===
-            nearest_support = max([s for s in all_supports if s <= proximal], default=None)
-            nearest_resistance = min([r for r in all_resistances if r >= proximal], default=None)
-            
-            # === Position Sizing Logic ===
-            capital = 100000             # total capital (set dynamically if needed)
-            risk_pct = 0.01              # risk per trade (1%)
-            capital_to_risk = capital * risk_pct
-            stop_loss_price = round(proximal - distal, 2)
-            
-            if nearest_resistance is not None and stop_loss_price > 0:
-                rr_ratio = round((nearest_resistance - proximal) / stop_loss_price, 2)
-            else:
-                rr_ratio = None
-            
-            if rr_ratio is None or rr_ratio < 1.5:
-                continue  # skip trades with poor risk/reward
-
-            quantity = int(capital_to_risk // stop_loss_price) if stop_loss_price > 0 else 0
-            position_size_value = round(quantity * proximal, 2)
-            
-            max_exposure_pct = 0.2  # max 20% capital per trade
-            if position_size_value > capital * max_exposure_pct:
-                logging.warning(f"⛔ Skipped {symbol}: position ₹{position_size_value} > max allowed ₹{capital * max_exposure_pct}")
-                continue # skip oversized trades
-
-            sr_position = "In Between"
-            if nearest_support is not None:
-                support_gap_pct = abs((proximal - nearest_support) / proximal) * 100
-                if support_gap_pct <= support_threshold_pct:
-                    sr_position = "Near Support"
-            
-            if nearest_resistance is not None:
-                resistance_gap_pct = abs((nearest_resistance - proximal) / proximal) * 100
-                if resistance_gap_pct <= resistance_threshold_pct:
-                    sr_position = "Near Resistance"
-            
-            # If it's near both (rare but can happen), prioritize support
-            if "Near Support" in sr_position and "Near Resistance" in sr_position:
-                sr_position = "Near Support"
-
-            zones.append({
-                "Symbol": symbol,
-                "Timeframe": tf,
-                "Start": start_date.strftime("%Y-%m-%d"),
-                "Entry": round(proximal, 2),
-                "Stop Loss": round(distal, 2),
-                "Equilibrium": equilibrium,
-                "Green After LegOut": green_candles_after_legout,
-                #"Curve Position": curve_label,
-                "Score": score,
-                "Fresh": fresh,
-                "Legout Strength": round(leg_out_strength, 2),
-                "Base Count": base_len,
-                f"Base {label}": ", ".join(to_scalar(row["Date"]).strftime(time_fmt) for _, row in base.iterrows()),
-                f"Leg-in {label}": to_scalar(leg_in["Date"]).strftime(time_fmt),
-                f"Leg-out {label}": to_scalar(leg_out_candle["Date"]).strftime(time_fmt),
-                "Zone Type": {"1mo": "MIT", "1wk": "WIT", "1d": "DIT"}.get(tf, "Unknown"),
-                "Nearest Support": nearest_support,
-                "Nearest Resistance": nearest_resistance,
-                "S/R Zone Position": sr_position,
-                "Distance": distance_pct,
-                "RR Ratio": rr_ratio,
-                "Stop Loss %": stop_loss_pct,
-                "Quantity": quantity,
-                "Position Size ₹": position_size_value
-            })
+            green_candles_after_legout = int(green_run[legout_end_idx + 1])
+
+            zone = _build_zone(
+                symbol, tf, proximal, distal,
+                index=i,
+                fresh=fresh,
+                score=score,
+                leg_out_strength=leg_out_strength,
+                base_len=base_len,
+                green_after_legout=green_candles_after_legout,
+                dates=dates[i - 1:legout_end_idx + 1].tolist(),
+                distance_pct=distance_pct,
+                stop_loss_pct=stop_loss_pct,
+                all_supports=all_supports,
+                all_resistances=all_resistances,
+            )
+            if zone is not None:
+                zones.append(zone.to_dict())
 
     return zones
 
 class DemandZoneScanner:
-    def __init__(self, symbols, timeframes, fresh_only=True, plot=False, local_csv_dir="csv_data"):
+    def __init__(self, symbols, timeframes, fresh_only=True, plot=False, local_csv_dir="csv_data", frames=None,
+                 min_base=1, max_base=3, distance_range=(1.0, 5.0)):
         self.symbols = symbols
         self.timeframes = timeframes
         self.fresh_only = fresh_only
+        self.min_base = min_base
+        self.max_base = max_base
+        self.distance_range = distance_range
         self.plot = plot
         self.local_csv_dir = local_csv_dir
+        # Already-loaded, cleaned frames keyed by (symbol, tf); these skip the CSV read entirely
+        self.frames = frames or {}
 
-    def run(self):
+    def _load_frame(self, symbol, tf):
+        df = self.frames.get((symbol, tf))
+        if df is not None:
+            return df
+
+        filepath = os.path.join(self.local_csv_dir, f"{symbol}_{tf}.csv")
+        if not os.path.exists(filepath):
+            progress(f"⚠️ Cached file not found: {filepath}", symbol=symbol, tf=tf)
+            return None
+
+        with stats.timer("csv_parse", tf, symbol):
+            df = pd.read_csv(filepath, index_col="Date", parse_dates=True)
+            return clean_ohlc_frame(df, symbol)
+
+    def scan(self) -> list[Zone]:
         all_zones = []
         for tf, period in self.timeframes.items():
             for symbol in self.symbols:
                 try:
-                    filepath = os.path.join(self.local_csv_dir, f"{symbol}_{tf}.csv")
-                    if not os.path.exists(filepath):
-                        print(f"⚠️ Cached file not found: {filepath}")
+                    df = self._load_frame(symbol, tf)
+                    if df is None:
                         continue
 
-                    df = pd.read_csv(filepath, index_col="Date", parse_dates=True)
-                    df = df.loc[:, ~df.columns.duplicated()]
-
-                    suffix = f"_{symbol}"
-                    rename_map = {
-                        f"Open{suffix}": "Open",
-                        f"High{suffix}": "High",
-                        f"Low{suffix}": "Low",
-                        f"Close{suffix}": "Close",
-                        f"Volume{suffix}": "Volume"
-                    }
-                    df.rename(columns={k: v for k, v in rename_map.items() if k in df.columns}, inplace=True)
-
-                    for col in df.columns:
-                        if any(x in col for x in ["Open", "High", "Low", "Close", "Volume"]):
-                            df[col] = pd.to_numeric(df[col], errors="coerce")
-
-                    df.dropna(subset=[col for col in ["Open", "High", "Low", "Close"] if col in df.columns], inplace=True)
-                    df.index.name = "Date"
-                    df["Date"] = df.index
-
-                    zones = detect_zones(df, tf, symbol, self.fresh_only)
+                    zones = detect_zones_vectorized(df, tf, symbol, self.fresh_only, self.min_base, self.max_base, self.distance_range)
                     all_zones.extend(zones)
 
                 except Exception as e:
-                    print(f"❌ Error with {symbol} [{tf}] – {type(e).__name__}: {e}")
+                    stats.count("errors", tf=tf)
+                    logging.warning(f"❌ Error with {symbol} [{tf}] – {type(e).__name__}: {e}")
+
+        return all_zones
 
-        return pd.DataFrame(all_zones)
+    def run(self):
+        return zones_to_frame(self.scan())
         
-    def plot_zone(self, df, zone, output_folder="plots", buffer=1.0):
-        symbol = zone["Symbol"].replace(".NS", "")
-        start_date = pd.to_datetime(zone["Start"])
-        tf = zone["Timeframe"]
+    def plot_zone(self, df, zone: Zone, output_folder="plots", buffer=1.0):
+        from ZoneScanner.plotting import zone_figure, zone_filename, zone_window
 
-        window = df.loc[start_date - pd.DateOffset(months=5): start_date + pd.DateOffset(months=10)].copy()
+        window = zone_window(df, zone)
         if window.empty:
-            print(f"⚠️ No window data for {symbol} @ {start_date}")
+            progress(f"⚠️ No window data for {zone.symbol} @ {zone.start}", symbol=zone.symbol, tf=zone.tf)
             return
 
-        entry = zone["Entry"]
-        stop = zone["Stop Loss"] - buffer
-        zone_color = "rgba(0,200,100,0.2)" if tf == "1mo" else "rgba(0,100,255,0.2)"
-
-        fig = go.Figure(data=[
-            go.Candlestick(
-                x=window.index,
-                open=window["Open"],
-                high=window["High"],
-                low=window["Low"],
-                close=window["Close"],
-                name="Price"
-            ),
-            go.Scatter(
-                x=[window.index[0], window.index[-1]],
-                y=[entry, entry],
-                mode="lines",
-                name="Entry",
-                line=dict(color="blue", dash="dot")
-            ),
-            go.Scatter(
-                x=[window.index[0], window.index[-1]],
-                y=[stop, stop],
-                mode="lines",
-                name="Stop-Loss",
-                line=dict(color="red", dash="dash")
-            )
-        ])
-
-        fig.add_shape(
-            type="rect",
-            x0=window.index[0],
-            x1=window.index[-1],
-            y0=zone["Distal"],
-            y1=zone["Proximal"],
-            fillcolor=zone_color,
-            line=dict(color="green", width=1),
-            layer="below"
-        )
-
-        fig.update_layout(
-            title=f"{symbol} | Demand Zone from {zone['Start']} ({tf})",
-            xaxis_title="Date",
-            yaxis_title="Price",
-            xaxis_rangeslider_visible=False,
-            height=600
-        )
-
         os.makedirs(output_folder, exist_ok=True)
-        filename = f"{symbol}_{tf}_{zone['Start']}_Score{zone['Score']}.html".replace(" ", "_")
-        fig.write_html(os.path.join(output_folder, filename))
-        print(f"📈 Saved Plot: {filename}")
\ No newline at end of file
+        filename = zone_filename(zone)
+        zone_figure(window, zone, buffer).write_html(os.path.join(output_folder, filename))
+        progress(f"📈 Saved Plot: {filename}", symbol=zone.symbol, tf=zone.tf)
@@ -0,0 +1,90 @@
+"""
+Trade replay speed of the backtest against a per-trade Python loop.
+
+    python benchmarks/bench_backtest.py --symbols 2000 --bars 1500 --trades 50000
+
+Stages:
+    loop      one Python scan per trade over that symbol's bars (run on --loop-trades of them)
+    replay    simulate_trades for all --trades at once on the panel
+    backtest  run_backtest() end to end: panel build, zone detection and replay, in panels of --panel
+
+Trades start at random bars with entry, stop and target drawn around that bar's
+close, so fills, stops, targets and untouched entries all occur. The loop and
+replay must agree on every trade the loop runs. Runs offline on synthetic frames.
+The end-to-end backtest only targets resistance already known at each leg-out; the
+planted synthetic zones break out to new highs, so few of them qualify.
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+
+from synthetic import synthetic_ohlcv
+from ZoneScanner.backtest import LOSS, OPEN, UNTOUCHED, WIN, run_backtest, simulate_trades
+from ZoneScanner.panel import build_panel
+from ZoneScanner.zone_detector import ZoneParams
+
+
+def loop_trade(low, high, start, entry, stop, target):
+    j = start
+    while j < len(low) and not low[j] <= entry:
+        j += 1
+    if j == len(low):
+        return UNTOUCHED, -1, -1
+    for k in range(j, len(low)):
+        if low[k] <= stop:
+            return LOSS, j, k
+        if k > j and high[k] >= target:
+            return WIN, j, k
+    return OPEN, j, -1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest replay benchmark")
+    parser.add_argument("--symbols", type=int, default=1000)
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--trades", type=int, default=50000, help="Random trades replayed at once")
+    parser.add_argument("--loop-trades", type=int, default=5000, help="Trades the Python loop replays")
+    parser.add_argument("--panel", type=int, default=250, help="Symbols per panel for the end-to-end backtest")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    rng = np.random.default_rng(0)
+    frames = [(f"SYN{i}.NS", synthetic_ohlcv(args.bars, seed=i)) for i in range(args.symbols)]
+    panel = build_panel(frames)
+    rows = rng.integers(0, len(frames), args.trades)
+    starts = (rng.random(args.trades) * panel.lengths[rows]).astype(np.int64)
+    close = panel.prices["Close"][rows, panel.offsets[rows] + starts]
+    entry = close * rng.uniform(0.8, 1.0, args.trades)
+    stop = entry * rng.uniform(0.85, 0.99, args.trades)
+    target = entry * rng.uniform(1.01, 1.4, args.trades)
+
+    start = time.perf_counter()
+    trades = simulate_trades(panel, rows, starts, entry, stop, target)
+    replay_s = time.perf_counter() - start
+
+    lows = [df["Low"].to_numpy() for _, df in frames]
+    highs = [df["High"].to_numpy() for _, df in frames]
+    count = min(args.loop_trades, args.trades)
+    start = time.perf_counter()
+    expected = [loop_trade(lows[r], highs[r], s, e, x, t)
+                for r, s, e, x, t in zip(rows[:count], starts[:count], entry[:count], stop[:count], target[:count])]
+    loop_s = time.perf_counter() - start
+    got = list(zip(trades["outcome"][:count].tolist(), trades["entry_bar"][:count].tolist(), trades["exit_bar"][:count].tolist()))
+    if got != expected:
+        raise SystemExit("vectorized replay differs from the Python loop")
+
+    outcomes = np.bincount(trades["outcome"], minlength=4)
+    print(f"{args.symbols} symbols × {args.bars} bars; outcomes untouched/open/win/loss = {'/'.join(map(str, outcomes))}")
+    print(f"loop      {count:>8} trades {loop_s:>8.3f} s  ({1e6 * loop_s / count:.1f} µs/trade)")
+    print(f"replay    {args.trades:>8} trades {replay_s:>8.3f} s  ({1e6 * replay_s / args.trades:.1f} µs/trade)")
+
+    grid = [ZoneParams(False, 1, 3), ZoneParams(False, 1, 5), ZoneParams(False, 2, 5)]
+    start = time.perf_counter()
+    summary = run_backtest(frames, "1d", grid, args.panel)
+    print(f"backtest  {int(summary['Zones'].max()):>8} zones  {time.perf_counter() - start:>8.3f} s  ({len(grid)} parameter sets)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Warm-cache scan time across OHLC cache formats.
+
+    python benchmarks/bench_cache_formats.py --symbols 200 --bars 5000
+
+Writes synthetic CSVs, migrates them to every available binary format and times
+reading every symbol (and optionally running detection) from each. Runs offline.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from synthetic import write_synthetic_csv
+from ZoneScanner.cache import CACHE_BACKENDS, get_cache, migrate_cache
+from ZoneScanner.zone_detector import detect_zones_vectorized
+
+
+def available_formats():
+    for fmt in CACHE_BACKENDS:
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                get_cache(fmt, tmp)
+            yield fmt
+        except ImportError:
+            print(f"Skipping {fmt}: dependency not installed")
+
+
+def warm_scan(cache, symbols, tf: str, detect: bool) -> float:
+    start = time.perf_counter()
+    for symbol in symbols:
+        df = cache.read(symbol, tf)
+        if detect:
+            detect_zones_vectorized(df, tf, symbol, fresh_only=False)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache format benchmark")
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--bars", type=int, default=5000)
+    parser.add_argument("--tf", default="1d")
+    parser.add_argument("--detect", action="store_true", help="Also run detection on each frame")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    symbols = [f"SYN{i}.NS" for i in range(args.symbols)]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for i, symbol in enumerate(symbols):
+            write_synthetic_csv(os.path.join(cache_dir, f"{symbol}_{args.tf}.csv"), args.bars, seed=i)
+
+        csv_cache = get_cache("csv", cache_dir)
+        results = {}
+        for fmt in available_formats():
+            cache = get_cache(fmt, cache_dir)
+            if fmt != "csv":
+                migrate_cache(csv_cache, cache)
+            size = sum(
+                os.path.getsize(os.path.join(cache_dir, f)) for f in os.listdir(cache_dir)
+                if f.endswith(cache.suffix) or (fmt == "npy" and f.endswith(".dates.npy"))
+            )
+            results[fmt] = (warm_scan(cache, symbols, args.tf, args.detect), size)
+
+    print(f"{'format':<10}{'seconds':>10}{'symbols/s':>12}{'MB on disk':>12}")
+    for fmt, (seconds, size) in results.items():
+        print(f"{fmt:<10}{seconds:>10.3f}{len(symbols) / seconds:>12.0f}{size / 1e6:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
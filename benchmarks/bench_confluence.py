@@ -0,0 +1,80 @@
+"""
+Multi-timeframe confluence join against a nested loop, as zone counts grow.
+
+    python benchmarks/bench_confluence.py --symbols 500 --daily 10 40 160
+
+For each --daily count, every symbol gets that many daily zones, a quarter as many
+weekly and a tenth as many monthly ones, with random [Stop Loss, Entry] ranges.
+Modes:
+    loop    each lower-timeframe zone checked against every higher-timeframe zone of its symbol
+    index   find_confluence (per-symbol IntervalIndex, vectorized queries)
+
+Both must find the same (zone, higher zone, relation) triples. Runs offline.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from ZoneScanner.confluence import CONTAINS, OVERLAPS, TF_ORDER, find_confluence
+from ZoneScanner.zone import Zone
+
+DAY_NS = 86_400 * 10**9
+WIDTH = {"1d": 3.0, "1wk": 8.0, "1mo": 20.0}
+
+
+def make_zones(symbols: int, daily: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    zones = []
+    for s in range(symbols):
+        for tf, count in (("1d", daily), ("1wk", max(1, daily // 4)), ("1mo", max(1, daily // 10))):
+            lows = rng.uniform(50, 150, count)
+            highs = lows + rng.exponential(WIDTH[tf], count)
+            for k, (low, high) in enumerate(zip(lows, highs)):
+                zones.append(Zone(f"SYN{s}.NS", tf, k, 1, float(high), float(low), True, 3, 1.0, 0,
+                                  [k * DAY_NS, (k + 1) * DAY_NS, (k + 2) * DAY_NS], 1.0, 1.0,
+                                  None, None, "In Between", 2.0, 1))
+    return zones
+
+
+def loop_join(zones):
+    rank = {tf: n for n, tf in enumerate(TF_ORDER)}
+    by_symbol = {}
+    for zone in zones:
+        by_symbol.setdefault(zone.symbol, []).append(zone)
+    triples = set()
+    for zone in zones:
+        for other in by_symbol[zone.symbol]:
+            if rank[other.tf] <= rank[zone.tf]:
+                continue
+            if other.stop_loss <= zone.entry and other.entry >= zone.stop_loss:
+                inside = other.stop_loss <= zone.stop_loss and other.entry >= zone.entry
+                triples.add((id(zone), id(other), CONTAINS if inside else OVERLAPS))
+    return triples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Confluence join benchmark")
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--daily", type=int, nargs="+", default=[10, 40, 160], help="Daily zones per symbol")
+    args = parser.parse_args()
+
+    print(f"{'zones':>8}{'matches':>10}{'loop s':>9}{'index s':>9}{'speedup':>9}")
+    for daily in args.daily:
+        zones = make_zones(args.symbols, daily)
+        start = time.perf_counter()
+        expected = loop_join(zones)
+        loop_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        joined = find_confluence(zones)
+        index_s = time.perf_counter() - start
+
+        got = {(id(zone), id(other), relation) for zone, matches in joined for other, relation in matches}
+        if got != expected:
+            raise SystemExit(f"confluence join differs from the nested loop at {daily} daily zones per symbol")
+        print(f"{len(zones):>8}{len(got):>10}{loop_s:>9.3f}{index_s:>9.3f}{loop_s / index_s:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
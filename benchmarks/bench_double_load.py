@@ -0,0 +1,93 @@
+"""
+Compare the old double-load flow (StockScanner parses the CSV, then DemandZoneScanner
+parses it again from disk) with passing the loaded frame straight through.
+
+    python benchmarks/bench_double_load.py --symbols 50 --bars 1500
+
+Runs offline on synthetic CSVs written to a temporary directory.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from synthetic import write_synthetic_csv
+from ZoneScanner.zone_detector import DemandZoneScanner, clean_ohlc_frame
+
+
+class ReadCounter:
+    """Counts pd.read_csv calls and the time spent in them while active."""
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self._orig = pd.read_csv
+
+    def __enter__(self):
+        def counted(*args, **kwargs):
+            self.calls += 1
+            start = time.perf_counter()
+            try:
+                return self._orig(*args, **kwargs)
+            finally:
+                self.seconds += time.perf_counter() - start
+        pd.read_csv = counted
+        return self
+
+    def __exit__(self, *exc):
+        pd.read_csv = self._orig
+
+
+def load(cache_dir: str, symbol: str, tf: str) -> pd.DataFrame:
+    df = pd.read_csv(os.path.join(cache_dir, f"{symbol}_{tf}.csv"), index_col="Date", parse_dates=True)
+    return clean_ohlc_frame(df, symbol)
+
+
+def run_flow(cache_dir: str, symbols, tf: str, in_memory: bool):
+    zones = 0
+    for symbol in symbols:
+        df = load(cache_dir, symbol, tf)
+        frames = {(symbol, tf): df} if in_memory else None
+        scanner = DemandZoneScanner([symbol], {tf: None}, fresh_only=False, local_csv_dir=cache_dir, frames=frames)
+        zones += len(scanner.scan())
+    return zones
+
+
+def measure(cache_dir: str, symbols, tf: str, in_memory: bool) -> dict:
+    tracemalloc.start()
+    with ReadCounter() as counter:
+        start = time.perf_counter()
+        zones = run_flow(cache_dir, symbols, tf, in_memory)
+        elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"csv_reads": counter.calls, "read_seconds": counter.seconds, "seconds": elapsed, "peak_mb": peak / 1e6, "zones": zones}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Double CSV load benchmark")
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--tf", default="1d")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    symbols = [f"SYN{i}.NS" for i in range(args.symbols)]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for i, symbol in enumerate(symbols):
+            write_synthetic_csv(os.path.join(cache_dir, f"{symbol}_{args.tf}.csv"), args.bars, seed=i)
+
+        before = measure(cache_dir, symbols, args.tf, in_memory=False)
+        after = measure(cache_dir, symbols, args.tf, in_memory=True)
+
+    print(f"{'flow':<14}{'csv reads':>10}{'read s':>10}{'total s':>10}{'peak MB':>10}{'zones':>8}")
+    for name, r in (("double load", before), ("in-memory", after)):
+        print(f"{name:<14}{r['csv_reads']:>10}{r['read_seconds']:>10.2f}{r['seconds']:>10.2f}{r['peak_mb']:>10.1f}{r['zones']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Scan-time cost of logging: handlers writing on the calling thread against the queue
+listener of logs.start_logging.
+
+    python benchmarks/bench_logging.py --symbols 300 --bars 1500 --records 50000
+
+Modes:
+    off     logging disabled (baseline)
+    sync    the old layout: file and console handlers written on the logging thread
+    queue   start_logging, text file, every per-symbol progress line
+    json    start_logging, JSON lines file
+    quiet   start_logging at the "info" level, per-symbol lines silenced
+Each mode times --records progress() calls (on the caller, then the time to drain
+the queue) and a cached StockScanner.run over synthetic CSVs. Console output goes
+to a file so terminal speed does not decide the result. Runs offline.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from synthetic import write_synthetic_csv
+from ZoneScanner.logs import PROGRESS, TEXT_FORMAT, ConsoleFormatter, progress, start_logging, stop_logging
+from ZoneScanner.stock_scanner import StockScanner
+
+MODES = ("off", "sync", "queue", "json", "quiet")
+
+
+def sync_logging(path: str, stream):
+    root = logging.getLogger()
+    root.handlers.clear()
+    root.setLevel(PROGRESS)
+    file_handler = logging.FileHandler(path, encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+    console_handler = logging.StreamHandler(stream)
+    console_handler.setFormatter(ConsoleFormatter(TEXT_FORMAT))
+    root.addHandler(file_handler)
+    root.addHandler(console_handler)
+
+
+def configure(mode: str, log_dir: str, stream):
+    logging.disable(logging.NOTSET)
+    if mode == "off":
+        logging.disable(logging.CRITICAL)
+    elif mode == "sync":
+        sync_logging(os.path.join(log_dir, "sync.log"), stream)
+    else:
+        level = logging.INFO if mode == "quiet" else PROGRESS
+        start_logging(os.path.join(log_dir, f"{mode}.log"), level, "json" if mode == "json" else "text", stream)
+
+
+def finish(mode: str) -> float:
+    start = time.perf_counter()
+    if mode == "sync":
+        for handler in logging.getLogger().handlers:
+            handler.close()
+        logging.getLogger().handlers.clear()
+    elif mode != "off":
+        stop_logging()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging overhead benchmark")
+    parser.add_argument("--symbols", type=int, default=300)
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--records", type=int, default=50000, help="progress() calls timed per mode")
+    parser.add_argument("--repeat", type=int, default=3, help="Scans per mode; the fastest counts")
+    args = parser.parse_args()
+
+    symbols = [f"SYN{i}.NS" for i in range(args.symbols)]
+    with tempfile.TemporaryDirectory() as work:
+        cache_dir = os.path.join(work, "cache")
+        os.makedirs(cache_dir)
+        for i, symbol in enumerate(symbols):
+            write_synthetic_csv(os.path.join(cache_dir, f"{symbol}_1d.csv"), args.bars, seed=i)
+
+        emitted, scans, zones = {}, {mode: [] for mode in MODES}, {}
+        for mode in MODES:
+            log_dir = os.path.join(work, mode)
+            os.makedirs(log_dir)
+            with open(os.path.join(log_dir, "console.txt"), "w", encoding="utf-8") as console:
+                configure(mode, log_dir, console)
+                start = time.perf_counter()
+                for n in range(args.records):
+                    progress(f"💾 Cached → {cache_dir}/SYN{n}.NS_1d.csv", symbol=f"SYN{n}.NS", tf="1d")
+                emit_s = time.perf_counter() - start
+                emitted[mode] = (emit_s, finish(mode))
+
+        # Modes take turns so drift in machine load spreads over all of them
+        for _ in range(args.repeat):
+            for mode in MODES:
+                log_dir = os.path.join(work, mode)
+                with open(os.path.join(log_dir, "console.txt"), "a", encoding="utf-8") as console:
+                    configure(mode, log_dir, console)
+                    scanner = StockScanner(cache_dir=cache_dir, tf="1d", fresh_only=False, distance_range=(-100.0, 100.0),
+                                           output_dir=work, top_n=50)
+                    start = time.perf_counter()
+                    scanner.run(symbols=symbols)
+                    scans[mode].append(time.perf_counter() - start + finish(mode))
+                    zones[mode] = scanner.zone_count
+        logging.disable(logging.NOTSET)
+        rows = [(mode, *emitted[mode], min(scans[mode]), zones[mode]) for mode in MODES]
+
+    baseline = rows[0][3]
+    print(f"{'mode':<7}{'µs/record':>11}{'drain s':>9}{'scan s':>9}{'overhead':>10}{'zones':>7}")
+    for mode, emit_s, drain_s, scan_s, zones in rows:
+        print(f"{mode:<7}{1e6 * emit_s / args.records:>11.2f}{drain_s:>9.3f}{scan_s:>9.3f}"
+              f"{100 * (scan_s - baseline) / baseline:>9.1f}%{zones:>7}")
+
+
+if __name__ == "__main__":
+    main()
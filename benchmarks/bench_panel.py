@@ -0,0 +1,86 @@
+"""
+Panel detection against the per-symbol loop, on the same in-memory frames.
+
+    python benchmarks/bench_panel.py --symbols 100 500 2000 --bars 1500 --panel 500
+
+Modes:
+    loop    detect_zones_vectorized on every frame, one symbol at a time
+    panel   detect_zones_panel on batches of --panel symbols (0 = all in one panel)
+
+Both modes use the same parameters and must return the same zones; the run stops
+if they differ. "pattern s" splits out the vectorizable stages (candle masks and
+pattern matching, plus the swing pivots in panel mode) from the per-symbol ones:
+merging pivots into support/resistance levels is sequential and zone building is
+per candidate, so they run per symbol with candidates in both modes. Frames come
+from the seeded generator in synthetic.py with history lengths varying around
+--bars, so rows are NaN-padded. Runs offline.
+"""
+import argparse
+import logging
+import time
+
+from synthetic import synthetic_ohlcv
+from ZoneScanner.instrumentation import stats
+from ZoneScanner.panel import detect_zones_panel
+from ZoneScanner.zone_detector import ZoneParams, detect_zones_vectorized
+
+
+def run_loop(frames, params):
+    return {symbol: detect_zones_vectorized(df, "1d", symbol, *params) for symbol, df in frames}
+
+
+def run_panel(frames, params, panel_size):
+    size = panel_size or len(frames)
+    zones = {}
+    for start in range(0, len(frames), size):
+        for symbol, result in detect_zones_panel(frames[start:start + size], "1d", [params]).items():
+            zones[symbol] = result[params]
+    return zones
+
+
+def stage_seconds(stage):
+    return sum(stats.samples.get((stage, "1d"), []))
+
+
+def best_of(repeat, fn, *args):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Panel detection benchmark")
+    parser.add_argument("--symbols", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--bars", type=int, default=1500, help="Longest history; others are up to 40%% shorter")
+    parser.add_argument("--panel", type=int, default=500, help="Symbols per panel (0 = all in one)")
+    parser.add_argument("--fresh", action="store_true", help="Fresh zones only")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    params = ZoneParams(args.fresh, 1, 3, (1.0, 5.0))
+
+    print(f"{'symbols':>8}{'zones':>8}{'loop s':>9}{'panel s':>9}{'speedup':>9}"
+          f"{'loop pattern s':>16}{'panel pattern s':>17}{'speedup':>9}")
+    for count in args.symbols:
+        frames = [(f"SYN{i}.NS", synthetic_ohlcv(args.bars - (i * 37) % (args.bars * 2 // 5), seed=i))
+                  for i in range(count)]
+        stats.reset()
+        loop_s, expected = best_of(args.repeat, run_loop, frames, params)
+        loop_pattern = stage_seconds("candidates") / args.repeat
+        stats.reset()
+        panel_s, got = best_of(args.repeat, run_panel, frames, params, args.panel)
+        panel_pattern = (stage_seconds("panel_build") + stage_seconds("candidates") + stage_seconds("pivots")) / args.repeat
+
+        if {s: [z.to_dict() for z in zs] for s, zs in expected.items()} != {s: [z.to_dict() for z in zs] for s, zs in got.items()}:
+            raise SystemExit(f"panel zones differ from the per-symbol loop at {count} symbols")
+        zones = sum(len(zs) for zs in expected.values())
+        print(f"{count:>8}{zones:>8}{loop_s:>9.3f}{panel_s:>9.3f}{loop_s / panel_s:>8.1f}x"
+              f"{loop_pattern:>16.3f}{panel_pattern:>17.3f}{loop_pattern / panel_pattern:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
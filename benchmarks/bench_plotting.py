@@ -0,0 +1,70 @@
+"""
+Chart rendering time and disk usage for the top-K zones.
+
+    python benchmarks/bench_plotting.py --symbols 40 --top 20 --workers 4
+
+Modes:
+    standalone   the old way: one self-contained HTML (plotly.js inlined) per zone, in-process
+    per-zone     render_zones: one HTML per zone sharing plots/plotly.min.js, in a process pool
+    combined     render_zones: one page per timeframe with plotly.js embedded once, in a process pool
+
+Zones come from detection on seeded synthetic frames; every mode charts the same
+zones from the same bar windows. Runs offline.
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from synthetic import synthetic_ohlcv
+from ZoneScanner.plotting import render_zones, zone_figure, zone_filename, zone_window
+from ZoneScanner.results import TopZones
+from ZoneScanner.zone_detector import detect_zones_vectorized
+
+
+def folder_mb(path: str) -> float:
+    return sum(entry.stat().st_size for entry in os.scandir(path)) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chart rendering benchmark")
+    parser.add_argument("--symbols", type=int, default=40)
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--top", type=int, default=20, help="Zones to chart")
+    parser.add_argument("--workers", type=int, default=4, help="Rendering processes for the pooled modes")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    top, windows = TopZones(args.top), {}
+    for i in range(args.symbols):
+        symbol = f"SYN{i}.NS"
+        df = synthetic_ohlcv(args.bars, seed=i)
+        for zone in detect_zones_vectorized(df, "1d", symbol, False):
+            dropped = top.push(zone, i)
+            if dropped is not zone:
+                windows[id(zone)] = zone_window(df, zone).copy()
+    zones = top.zones()
+
+    print(f"{len(zones)} zones, {args.workers} workers")
+    print(f"{'mode':<12}{'files':>7}{'seconds':>10}{'disk MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "standalone")
+        os.makedirs(out)
+        start = time.perf_counter()
+        for zone in zones:
+            zone_figure(windows[id(zone)], zone).write_html(os.path.join(out, zone_filename(zone)))
+        print(f"{'standalone':<12}{len(os.listdir(out)):>7}{time.perf_counter() - start:>10.2f}{folder_mb(out):>10.1f}")
+
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            executor.submit(int).result()  # start the pool outside the timed runs
+            for mode in ("per-zone", "combined"):
+                out = os.path.join(tmp, mode)
+                start = time.perf_counter()
+                render_zones(zones, windows, "1d", out, combined=mode == "combined", executor=executor)
+                print(f"{mode:<12}{len(os.listdir(out)):>7}{time.perf_counter() - start:>10.2f}{folder_mb(out):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
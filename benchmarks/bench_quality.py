@@ -0,0 +1,112 @@
+"""
+Cost of validating bars at cache-write time, and what bad bars do to detection.
+
+    python benchmarks/bench_quality.py --symbols 500 --bars 1500 --defects 0.005
+
+Every frame gets roughly --defects × bars injected faults: duplicated dates, High
+below Low, Open outside the range, zero-range bars without volume, negative volume
+and a still-forming last bar. Stages:
+    loop      the same checks as one Python pass over the rows of each frame
+    check     check_ohlc (every check over whole columns at once)
+    repair    validate_ohlc(mode="repair"): checks plus repair_ohlc
+The loop and check must flag the same rows. Zone counts are then compared on the
+corrupted and repaired frames. Runs offline on synthetic frames.
+"""
+import argparse
+import logging
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from synthetic import synthetic_ohlcv
+from ZoneScanner.quality import check_ohlc, validate_ohlc
+from ZoneScanner.zone_detector import ZoneParams, detect_zones_sweep
+
+LOOP_CHECKS = ("duplicate_dates", "non_positive", "high_below_low", "outside_range", "zero_range", "bad_volume")
+
+
+def corrupt(df: pd.DataFrame, rate: float, rng) -> pd.DataFrame:
+    df = df.copy()
+    n = len(df)
+    picks = rng.choice(np.arange(1, n - 1), size=max(5, int(rate * n)), replace=False)
+    col = {name: df.columns.get_loc(name) for name in ("Open", "High", "Low", "Close", "Volume")}
+    for k, i in enumerate(picks):
+        kind = k % 5
+        if kind == 0:
+            df.iloc[i, col["High"]] = df.iloc[i, col["Low"]] * 0.98
+        elif kind == 1:
+            df.iloc[i, col["Open"]] = df.iloc[i, col["High"]] * 1.03
+        elif kind == 2:
+            df.iloc[i, [col["Open"], col["High"], col["Low"], col["Close"]]] = df.iloc[i, col["Close"]]
+            df.iloc[i, col["Volume"]] = 0
+        elif kind == 3:
+            df.iloc[i, col["Volume"]] = -1
+    dupes = picks[4::5]
+    df = pd.concat([df, df.iloc[dupes]]).sort_index(kind="stable")
+    df.index.name = "Date"
+    df["Date"] = df.index
+    return df
+
+
+def loop_checks(df: pd.DataFrame) -> dict:
+    flags = {name: np.zeros(len(df), dtype=bool) for name in LOOP_CHECKS}
+    dates = df.index.tolist()
+    seen = {}
+    for i, date in enumerate(dates):
+        if date in seen:
+            flags["duplicate_dates"][seen[date]] = True
+        seen[date] = i
+    for i, (o, h, l, c, v) in enumerate(df[["Open", "High", "Low", "Close", "Volume"]].itertuples(index=False)):
+        flags["non_positive"][i] = not min(o, h, l, c) > 0
+        flags["high_below_low"][i] = h < l
+        flags["outside_range"][i] = h >= l and (max(o, c) > h or min(o, c) < l)
+        flags["zero_range"][i] = h == l
+        flags["bad_volume"][i] = v < 0
+    return flags
+
+
+def zone_count(frames) -> int:
+    params = [ZoneParams(False, 1, 3, (-math.inf, math.inf))]
+    return sum(len(detect_zones_sweep(df, "1d", symbol, params)[params[0]]) for symbol, df in frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache-write data-quality benchmark")
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--defects", type=float, default=0.005, help="Share of bars corrupted per frame")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    rng = np.random.default_rng(0)
+    frames = [(f"SYN{i}.NS", corrupt(synthetic_ohlcv(args.bars, seed=i), args.defects, rng)) for i in range(args.symbols)]
+    # The last bar is dated today, so it is still forming until the close
+    now = frames[0][1].index[-1] + pd.Timedelta(hours=12)
+
+    start = time.perf_counter()
+    expected = [loop_checks(df) for _, df in frames]
+    loop_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    masks = [check_ohlc(df, "1d", now) for _, df in frames]
+    check_s = time.perf_counter() - start
+    for want, got in zip(expected, masks):
+        if any(not np.array_equal(want[name], got[name]) for name in LOOP_CHECKS):
+            raise SystemExit("vectorized checks differ from the Python loop")
+
+    start = time.perf_counter()
+    repaired = [(symbol, validate_ohlc(df, symbol, "1d", "repair", now)[0]) for symbol, df in frames]
+    repair_s = time.perf_counter() - start
+
+    flagged = {name: sum(int(m[name].sum()) for m in masks) for name in masks[0]}
+    bars = sum(len(df) for _, df in frames)
+    print(f"{args.symbols} symbols, {bars} bars; flagged " + ", ".join(f"{k}={v}" for k, v in flagged.items() if v))
+    for name, seconds in (("loop", loop_s), ("check", check_s), ("repair", repair_s)):
+        print(f"{name:<8}{seconds:>8.3f} s  ({1e6 * seconds / args.symbols:>8.1f} µs/symbol)")
+    print(f"zones    corrupted {zone_count(frames)}, repaired {zone_count(repaired)}")
+
+
+if __name__ == "__main__":
+    main()
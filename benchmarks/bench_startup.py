@@ -0,0 +1,90 @@
+"""
+CLI startup time, with a per-package import breakdown from `python -X importtime`.
+
+    python benchmarks/bench_startup.py --runs 5
+    python benchmarks/bench_startup.py --root . /path/to/older/checkout
+
+Commands, each run in a fresh interpreter from a temporary working directory:
+    import   import ZoneScanner
+    help     python -m ZoneScanner.main --help
+    cached   a single-symbol daily scan served entirely from the CSV cache
+
+"wall s" is the median process time; the package columns are the median
+cumulative import time (ms) of each package, so they show what a command pays
+for pandas, plotly, yfinance and stockfetcher before doing any work (pandas
+includes the numpy it imports). Give several --root source trees to compare
+them. Runs offline on a seeded synthetic symbol.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+from synthetic import write_synthetic_csv
+
+PACKAGES = ("ZoneScanner", "pandas", "numpy", "plotly", "yfinance", "stockfetcher")
+
+COMMANDS = {
+    "import": ["-c", "import ZoneScanner"],
+    "help": ["-m", "ZoneScanner.main", "--help"],
+    "cached": ["-m", "ZoneScanner.main", "--symbol", "SYN0.NS", "--tf", "1d", "--no-result-cache", "--top", "5"],
+}
+
+
+def import_times(stderr: str) -> dict:
+    """
+    Cumulative microseconds of each package's own import line in -X importtime
+    output, wherever it is nested; that line covers all of the package's submodules.
+    """
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            totals.setdefault(name.strip(), int(cumulative))
+    return totals
+
+
+def run(root: str, command: str, cwd: str, runs: int) -> dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [root, os.environ.get("PYTHONPATH")])))
+    walls, packages = [], defaultdict(list)
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, "-X", "importtime", *COMMANDS[command]],
+                              cwd=cwd, env=env, capture_output=True, text=True)
+        walls.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{command} failed under {root}:\n{proc.stderr[-2000:]}")
+        totals = import_times(proc.stderr)
+        for package in PACKAGES:
+            packages[package].append(totals.get(package, 0))
+    return {"wall": statistics.median(walls), **{p: statistics.median(v) / 1000 for p, v in packages.items()}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI startup benchmark")
+    parser.add_argument("--root", nargs="+", default=[os.path.dirname(os.path.dirname(os.path.abspath(__file__)))],
+                        help="Source trees to compare (directories containing the ZoneScanner package)")
+    parser.add_argument("--commands", nargs="+", choices=list(COMMANDS), default=list(COMMANDS))
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per command; the median is reported")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cwd:
+        os.makedirs(os.path.join(cwd, "csv_data"))
+        write_synthetic_csv(os.path.join(cwd, "csv_data", "SYN0.NS_1d.csv"), 1500, seed=0)
+
+        print(f"{'root':<30}{'command':<9}{'wall s':>8}" + "".join(f"{p:>14}" for p in PACKAGES))
+        for root in args.root:
+            for command in args.commands:
+                r = run(os.path.abspath(root), command, cwd, args.runs)
+                label = os.path.basename(os.path.abspath(root)) or root
+                print(f"{label[-29:]:<30}{command:<9}{r['wall']:>8.3f}" + "".join(f"{r[p]:>14.1f}" for p in PACKAGES))
+
+
+if __name__ == "__main__":
+    main()
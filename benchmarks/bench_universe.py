@@ -0,0 +1,124 @@
+"""
+Cold-start cost of building the symbol list the way the CLI does, in fresh
+interpreters, and of repeated lookups within one process.
+
+    python benchmarks/bench_universe.py --rows 2000 --runs 5
+
+Flows:
+    pandas   the old get_symbol_list: pd.read_csv of the whole StockList.csv, isin sector filter
+    parse    StockUniverse with no index yet: csv parse, then the index is written
+    index    StockUniverse loading the pickled index of an unchanged CSV
+
+Each cold-start run starts a new Python process that imports ZoneScanner and
+builds the list once; "total s" is that process's wall time and "load ms" the
+symbol-list step alone. Runs offline on a seeded synthetic StockList.csv.
+"""
+import argparse
+import csv
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from ZoneScanner.universe import StockUniverse, get_universe
+
+COLUMNS = ["SYMBOL", "SERIES", "DATE OF LISTING", "ISIN NUMBER", "FACE VALUE",
+           "YahooSymbol", "Symbol", "Company", "Sector", "Industry"]
+SECTORS = ["Basic Materials", "Communication Services", "Consumer Cyclical", "Consumer Defensive", "Energy",
+           "Financial Services", "Healthcare", "Industrials", "Real Estate", "Technology", "Utilities"]
+
+COLD_START = """
+import sys, time
+start = time.perf_counter()
+import pandas as pd
+import ZoneScanner
+from ZoneScanner.universe import get_universe
+path, flow, sectors = sys.argv[1], sys.argv[2], sys.argv[3:] or None
+t = time.perf_counter()
+if flow == "pandas":
+    df = pd.read_csv(path)
+    if sectors is not None:
+        df = df[df["Sector"].isin(sectors)]
+    symbols = df["YahooSymbol"].dropna().astype(str).tolist()
+else:
+    symbols = get_universe(path).symbols(sectors=sectors)
+end = time.perf_counter()
+print(len(symbols), end - t, end - start)
+"""
+
+
+def write_stock_list(path: str, rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(rows):
+            sector = SECTORS[int(rng.integers(len(SECTORS)))]
+            symbol = f"SYN{i}"
+            writer.writerow([f"{symbol}.NS", "EQ", "01-JAN-2010", f"INE{i:06d}01010", 10, f"{symbol}.NS",
+                             symbol, f"Synthetic {i} Limited", sector, f"{sector} Industry {int(rng.integers(8))}"])
+
+
+def cold_start(path: str, flow: str, sectors, runs: int) -> dict:
+    loads, totals, count = [], [], 0
+    for _ in range(runs):
+        if flow == "parse" and os.path.exists(f"{path}.idx.pkl"):
+            os.remove(f"{path}.idx.pkl")
+        start = time.perf_counter()
+        out = subprocess.run([sys.executable, "-c", COLD_START, path, flow, *(sectors or [])],
+                             capture_output=True, text=True, check=True).stdout.split()
+        totals.append(time.perf_counter() - start)
+        count, load = int(out[0]), float(out[1])
+        loads.append(load)
+    return {"symbols": count, "load_ms": 1000 * statistics.median(loads), "total_s": statistics.median(totals)}
+
+
+def repeated(path: str, sectors, calls: int) -> dict:
+    """`calls` lookups in one process: pandas re-reads every time, the universe is shared."""
+    start = time.perf_counter()
+    for _ in range(calls):
+        df = pd.read_csv(path)
+        if sectors is not None:
+            df = df[df["Sector"].isin(sectors)]
+        df["YahooSymbol"].dropna().astype(str).tolist()
+    pandas_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        get_universe(path).symbols(sectors=sectors)
+    universe_s = time.perf_counter() - start
+    return {"pandas_ms": 1000 * pandas_s / calls, "universe_ms": 1000 * universe_s / calls}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Symbol universe cold-start benchmark")
+    parser.add_argument("--rows", type=int, default=2000, help="Symbols in the synthetic StockList.csv")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per flow; the median is reported")
+    parser.add_argument("--sector", nargs="+", help="Sector filter to apply (default: none)")
+    parser.add_argument("--calls", type=int, default=20, help="Repeated lookups for the in-process comparison")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "StockList.csv")
+        write_stock_list(path, args.rows)
+
+        print(f"Cold start, {args.rows} rows, median of {args.runs} fresh processes")
+        print(f"{'flow':<10}{'symbols':>9}{'load ms':>10}{'total s':>10}")
+        for flow in ("pandas", "parse", "index"):
+            r = cold_start(path, flow, args.sector, args.runs)
+            print(f"{flow:<10}{r['symbols']:>9}{r['load_ms']:>10.2f}{r['total_s']:>10.3f}")
+
+        StockUniverse(path)
+        r = repeated(path, args.sector, args.calls)
+        print(f"\nRepeated lookups in one process: pandas {r['pandas_ms']:.2f} ms/call, shared universe {r['universe_ms']:.3f} ms/call")
+
+
+if __name__ == "__main__":
+    main()
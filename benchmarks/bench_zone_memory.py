@@ -0,0 +1,99 @@
+"""
+Memory held by a full-universe result set: compact Zone records against the
+formatted CSV row dicts they replace, and the DataFrame built from those rows.
+
+    python benchmarks/bench_zone_memory.py --symbols 1400 --zones-per-symbol 40
+
+Zones are detected on a few synthetic frames with every filter widened, then
+tiled across the universe (one copy per symbol, renamed) up to the requested
+result-set size. Runs offline.
+"""
+import argparse
+import gc
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from synthetic import write_synthetic_csv
+from ZoneScanner.zone import Zone, zones_to_frame
+from ZoneScanner.zone_detector import clean_ohlc_frame, detect_zones_vectorized
+
+
+def sample_zones(cache_dir: str, tf: str, bars: int, frames: int = 200):
+    zones = []
+    for i in range(frames):
+        path = os.path.join(cache_dir, f"SAMPLE{i}_{tf}.csv")
+        write_synthetic_csv(path, bars, seed=i)
+        df = clean_ohlc_frame(pd.read_csv(path, index_col="Date", parse_dates=True), f"SAMPLE{i}")
+        zones.extend(detect_zones_vectorized(df, tf, f"SAMPLE{i}", fresh_only=False, distance_range=(-1e9, 1e9)))
+    return zones
+
+
+def _copy_zone(zone: Zone, symbol: str, shift: int) -> Zone:
+    """
+    Independent copy with its own numbers and date tuple, as a real scan would
+    allocate; labels such as tf and the S/R position stay shared constants.
+    """
+    values = {name: getattr(zone, name) for name in Zone.__slots__}
+    for name, value in values.items():
+        if isinstance(value, float):
+            values[name] = value + 0.0
+    values["symbol"] = symbol
+    values["dates"] = tuple(ns + shift for ns in zone.dates)
+    return Zone(**values)
+
+
+def tile_zones(sample, symbols, per_symbol: int):
+    zones = []
+    for n, symbol in enumerate(symbols):
+        for k in range(per_symbol):
+            zones.append(_copy_zone(sample[(n * per_symbol + k) % len(sample)], symbol, n))
+    return zones
+
+
+def held_bytes(build) -> tuple:
+    """Bytes still allocated by the object `build()` returns, and the seconds it took."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    obj = build()
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return current, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Zone record memory benchmark")
+    parser.add_argument("--symbols", type=int, default=1400)
+    parser.add_argument("--zones-per-symbol", type=int, default=40)
+    parser.add_argument("--bars", type=int, default=1500)
+    parser.add_argument("--tf", default="1d")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        sample = sample_zones(cache_dir, args.tf, args.bars)
+    if not sample:
+        print("No zones detected in the sample frames; increase --bars")
+        return
+
+    symbols = [f"SYN{i}.NS" for i in range(args.symbols)]
+    records, records_s = held_bytes(lambda: tile_zones(sample, symbols, args.zones_per_symbol))
+    zones = tile_zones(sample, symbols, args.zones_per_symbol)
+    rows, rows_s = held_bytes(lambda: [zone.to_dict() for zone in zones])
+    frame, frame_s = held_bytes(lambda: zones_to_frame(zones))
+
+    print(f"{len(zones)} zones ({args.symbols} symbols x {args.zones_per_symbol}, tiled from {len(sample)} detected) [{args.tf}]")
+    print(f"{'result set':<16}{'MB':>10}{'bytes/zone':>12}{'build s':>10}")
+    for name, held, seconds in (("Zone records", records, records_s), ("row dicts", rows, rows_s), ("DataFrame", frame, frame_s)):
+        print(f"{name:<16}{held / 1e6:>10.2f}{held / len(zones):>12.0f}{seconds:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
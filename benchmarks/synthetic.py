@@ -0,0 +1,110 @@
+"""
+Seeded synthetic OHLCV data for the offline benchmarks.
+
+`synthetic_ohlcv` produces a log random walk with leg-in / base / leg-out demand
+zone patterns planted at regular intervals. The last pattern forms after a
+breakout to a new high and is followed by a rally (with a swing high for the
+resistance level) and a pullback that ends just above the zone, so it passes the
+fresh, distance, risk/reward and sizing filters and shows up as a detected zone.
+"""
+import numpy as np
+import pandas as pd
+
+TF_FREQ = {"1d": "B", "1wk": "W-MON", "1mo": "MS"}
+# Early anchors so long weekly/monthly histories stay inside the datetime64[ns] range
+TF_START = {"1d": "2000-01-03", "1wk": "1900-01-01", "1mo": "1700-01-01"}
+
+RALLY_BARS = 15
+PULLBACK_BARS = 12
+
+
+def _walk(rng, price: float, bars: int, vol: float = 0.012):
+    rows = []
+    for step in rng.normal(0.0003, vol, bars):
+        close = price * np.exp(step)
+        wick = abs(rng.normal(0, vol / 2))
+        rows.append((price, max(price, close) * (1 + wick), min(price, close) * (1 - wick), close))
+        price = close
+    return rows, price
+
+
+def _pattern(rng, price: float, base_len: int):
+    """Leg-in, `base_len` base candles and a leg-out that ends about 8% higher."""
+    p = price
+    rows = [(p * 0.955, p * 1.006, p * 0.949, p)]                       # strong bullish leg-in
+    for _ in range(base_len):
+        rows.append((p, p * 1.01, p * 0.94, p * rng.uniform(1.001, 1.006)))  # narrow body, wide range
+    rows.append((p * 1.005, p * 1.085, p * 1.003, p * 1.08))            # strong bullish leg-out
+    return rows, p * 1.08
+
+
+def _trend(rng, start: float, end: float, bars: int, peak_wick: float = 0.0):
+    rows = []
+    path = np.linspace(start, end, bars + 1)[1:] * np.exp(rng.normal(0, 0.002, bars))
+    prev = start
+    for close in path:
+        rows.append((prev, max(prev, close) * 1.002, min(prev, close) * 0.998, close))
+        prev = close
+    if peak_wick and rows:
+        o, h, l, c = rows[-1]
+        rows[-1] = (o, h * (1 + peak_wick), l, c)
+    return rows, prev
+
+
+def synthetic_ohlcv(bars: int = 1500, seed: int = 0, tf: str = "1d", zone_every: int = 250,
+                    min_base: int = 1, max_base: int = 3) -> pd.DataFrame:
+    """
+    Seeded OHLCV frame with a DatetimeIndex named Date and a Date column, like the
+    cache loaders return. A pattern is planted roughly every `zone_every` bars with
+    a base length drawn from [min_base, max_base].
+    """
+    rng = np.random.default_rng(seed)
+    price = float(rng.uniform(50, 2000))
+    base_len = int(rng.integers(min_base, max_base + 1))
+    final_len = 2 + base_len + 2 * RALLY_BARS + PULLBACK_BARS
+    rows, volume_spikes = [], []
+
+    while len(rows) < bars - final_len - zone_every // 2:
+        walk, price = _walk(rng, price, int(rng.integers(zone_every // 2, zone_every + 1)))
+        rows.extend(walk)
+        pattern, price = _pattern(rng, price, int(rng.integers(min_base, max_base + 1)))
+        rows.extend(pattern)
+        volume_spikes.append(len(rows) - 1)
+        rally, price = _trend(rng, price, price * 1.15, RALLY_BARS)
+        rows.extend(rally)
+
+    walk, price = _walk(rng, price, max(0, bars - final_len - len(rows)))
+    rows.extend(walk)
+
+    # Final zone: break out above every earlier high so no older resistance sits just
+    # above it, rally to a swing high, then pull back to ~3% above the proximal line
+    history_high = max((row[1] for row in rows), default=price)
+    breakout, price = _trend(rng, price, max(price, history_high) * 1.06, RALLY_BARS)
+    rows.extend(breakout)
+    pattern, top = _pattern(rng, price, base_len)
+    rows.extend(pattern)
+    volume_spikes.append(len(rows) - 1)
+    proximal = max(row[3] for row in pattern[1:-1])
+    rally, top = _trend(rng, top, proximal * 1.25, RALLY_BARS, peak_wick=0.02)
+    rows.extend(rally)
+    pullback, _ = _trend(rng, top, proximal * 1.03, PULLBACK_BARS)
+    rows.extend(pullback)
+
+    # The planting loop can overshoot; drop the oldest bars to hit the requested length
+    trim = max(0, len(rows) - bars)
+    values = np.array(rows[trim:], dtype="float64")
+    volume = rng.integers(10_000, 100_000, len(values)).astype("float64")
+    for i in volume_spikes:
+        if i >= trim:
+            volume[i - trim] *= 3
+
+    index = pd.date_range(TF_START.get(tf, "2000-01-03"), periods=len(values), freq=TF_FREQ.get(tf, "B"), name="Date")
+    df = pd.DataFrame(values, index=index, columns=["Open", "High", "Low", "Close"])
+    df["Volume"] = volume
+    df["Date"] = df.index
+    return df
+
+
+def write_synthetic_csv(path: str, bars: int, seed: int, tf: str = "1d"):
+    """Write a synthetic frame in the `{symbol}_{tf}.csv` cache layout."""
+    synthetic_ohlcv(bars, seed, tf).drop(columns="Date").to_csv(path, index_label="Date")
@@ -16,7 +16,10 @@ setup(
     entry_points={
         'console_scripts': [
             'demandzone=ZoneScanner.main:main',
-            'fetch-stocks=ZoneScanner.fetch:main'
+            'demandzone-backtest=ZoneScanner.backtest:main',
+            'demandzone-serve=ZoneScanner.service:main',
+            'fetch-stocks=ZoneScanner.fetch:main',
+            'migrate-cache=ZoneScanner.cache:main'
         ]
     },
     classifiers=[
@@ -0,0 +1,153 @@
+import numpy as np
+import pandas as pd
+
+import ZoneScanner.backtest as backtest
+from synthetic import synthetic_ohlcv
+from ZoneScanner.backtest import LOSS, OPEN, UNTOUCHED, WIN, backtest_params, causal_zones, run_backtest, simulate_trades, summarize_trades
+from ZoneScanner.panel import build_panel, detect_zones_panel
+from ZoneScanner.support_resistance import detect_support_resistance
+from ZoneScanner.zone_detector import ZoneParams
+
+PARAMS = backtest_params(ZoneParams())
+
+
+def loop_trade(low, high, start, entry, stop, target):
+    """One trade replayed bar by bar: (outcome, entry_bar, exit_bar, r_multiple)."""
+    j = start
+    while j < len(low) and not low[j] <= entry:
+        j += 1
+    if j >= len(low):
+        return UNTOUCHED, -1, -1, np.nan
+    for k in range(j, len(low)):
+        if low[k] <= stop:
+            return LOSS, j, k, -1.0
+        if k > j and high[k] >= target:
+            return WIN, j, k, (target - entry) / (entry - stop)
+    return OPEN, j, -1, np.nan
+
+
+def bars_frame(lows, highs, start="2020-01-01") -> pd.DataFrame:
+    index = pd.date_range(start, periods=len(lows), freq="B", name="Date")
+    low, high = np.asarray(lows, dtype="float64"), np.asarray(highs, dtype="float64")
+    df = pd.DataFrame({"Open": (low + high) / 2, "High": high, "Low": low, "Close": (low + high) / 2,
+                       "Volume": 1000.0}, index=index)
+    df["Date"] = df.index
+    return df
+
+
+def assert_matches_loop(frames, rows, starts, entry, stop, target):
+    trades = simulate_trades(build_panel(frames), rows, starts, entry, stop, target)
+    for q, row in enumerate(rows.tolist()):
+        df = frames[row][1]
+        outcome, entry_bar, exit_bar, r_multiple = loop_trade(
+            df["Low"].to_numpy(), df["High"].to_numpy(), int(starts[q]), entry[q], stop[q], target[q])
+        assert (int(trades["outcome"][q]), int(trades["entry_bar"][q]), int(trades["exit_bar"][q])) == \
+            (outcome, entry_bar, exit_bar), q
+        np.testing.assert_equal(trades["r_multiple"][q], r_multiple)
+    return trades
+
+
+def test_replay_edge_cases_match_a_loop():
+    frames = [
+        # Short row, padded on the left: fills on bar 2, which also takes the stop
+        ("A.NS", bars_frame([10, 10.2, 7.5, 9, 12], [11, 10.5, 10, 10, 13])),
+        # Longest row: fills on bar 1, bar 3 reaches both stop and target, a loss
+        ("B.NS", bars_frame([10, 9.5, 9.4, 7.0, 9, 9, 9, 9], [11, 10.5, 10.2, 13, 10, 10, 10, 10])),
+        # Entry never reached
+        ("C.NS", bars_frame([10, 10.5, 11, 11.5, 12, 12.5], [11, 11.5, 12, 12.5, 13, 13.5])),
+        # Fills on the last bar: still open
+        ("D.NS", bars_frame([10, 10.5, 11, 9.5], [11, 11.5, 12, 10.5])),
+        # Fills, then wins on a later bar; a target reached on the fill bar itself does not count
+        ("E.NS", bars_frame([10, 9.8, 9.9, 10, 10.5, 11], [10.5, 12.5, 10.4, 10.8, 12.2, 11.5])),
+    ]
+    rows = np.arange(5)
+    starts = np.zeros(5, dtype=np.int64)
+    entry = np.full(5, 9.8)
+    stop = np.full(5, 8.0)
+    target = np.full(5, 12.0)
+    trades = assert_matches_loop(frames, rows, starts, entry, stop, target)
+    assert trades["outcome"].tolist() == [LOSS, LOSS, UNTOUCHED, OPEN, WIN]
+    assert trades["entry_bar"].tolist() == [2, 1, -1, 3, 1]
+    assert trades["exit_bar"].tolist() == [2, 3, -1, -1, 4]
+
+
+def test_random_replays_match_a_loop():
+    rng = np.random.default_rng(0)
+    frames = [(f"SYN{i}.NS", synthetic_ohlcv(120 + 60 * i, seed=i)) for i in range(5)]
+    count = 2000
+    rows = rng.integers(0, len(frames), count)
+    lengths = np.array([len(df) for _, df in frames])
+    starts = (rng.random(count) * lengths[rows]).astype(np.int64)
+    close = np.array([frames[r][1]["Close"].iloc[s] for r, s in zip(rows, starts)])
+    entry = close * rng.uniform(0.8, 1.0, count)
+    stop = entry * rng.uniform(0.85, 0.99, count)
+    target = entry * rng.uniform(1.01, 1.4, count)
+    trades = assert_matches_loop(frames, rows, starts, entry, stop, target)
+    assert set(trades["outcome"].tolist()) == {UNTOUCHED, OPEN, WIN, LOSS}
+
+
+def test_summary_counts_closed_trades():
+    trades = {
+        "outcome": np.array([WIN, LOSS, LOSS, OPEN, UNTOUCHED], dtype=np.int8),
+        "r_multiple": np.array([3.0, -1.0, -1.0, np.nan, np.nan]),
+        "pnl": np.array([300.0, -100.0, -50.0, np.nan, np.nan]),
+        "wait_bars": np.array([2, 0, 4, 1, -1]),
+        "holding_bars": np.array([5, 1, 3, -1, -1]),
+    }
+    assert summarize_trades(trades) == {
+        "Zones": 5, "Touched": 4, "Wins": 1, "Losses": 2, "Open": 1, "Win Rate %": 33.33,
+        "Expectancy R": 0.33, "Avg P&L ₹": 50.0, "Avg Bars To Entry": 1.75, "Avg Holding Bars": 3.0,
+    }
+
+
+def last_zone(df: pd.DataFrame):
+    """The final planted zone as full-history detection sees it."""
+    zones = detect_zones_panel([("SYN.NS", df)], "1d", [PARAMS])["SYN.NS"][PARAMS]
+    return max(zones, key=lambda z: z.index)
+
+
+def test_levels_only_use_bars_up_to_the_leg_out(monkeypatch):
+    frames = [(f"SYN{i}.NS", synthetic_ohlcv(400 + 50 * i, seed=i)) for i in range(6)]
+    by_symbol = dict(frames)
+    build_zone = backtest._build_zone
+    checked = []
+
+    def checked_build_zone(symbol, tf, proximal, distal, **kw):
+        known = by_symbol[symbol].iloc[:kw["index"] + kw["base_len"] + 1]
+        levels = detect_support_resistance(known)
+        assert kw["all_supports"] == levels["Support"]
+        assert kw["all_resistances"] == levels["Resistance"]
+        assert kw["fresh"]
+        checked.append(symbol)
+        return build_zone(symbol, tf, proximal, distal, **kw)
+
+    monkeypatch.setattr(backtest, "_build_zone", checked_build_zone)
+    causal_zones(build_panel(frames), "1d", [PARAMS, backtest_params(ZoneParams(False, 2, 5))])
+    assert len(checked) > 100
+
+
+def test_resistance_formed_after_entry_is_not_a_target():
+    df = synthetic_ohlcv(300, seed=3, zone_every=1000)
+    zone = last_zone(df)
+    known = detect_support_resistance(df.iloc[:zone.index + zone.base_len + 1])
+    # The planted zone breaks out to a new high; its resistance only forms in the rally after it
+    assert not any(level >= zone.proximal for level in known["Resistance"])
+
+    found = causal_zones(build_panel([("SYN.NS", df)]), "1d", [PARAMS])["SYN.NS"][PARAMS]
+    assert all(z.index != zone.index for z in found)
+    summary = run_backtest([("SYN.NS", df)], "1d", [PARAMS])
+    assert int(summary["Zones"].iloc[0]) == len(found)
+
+
+def test_target_is_the_resistance_known_at_the_leg_out():
+    df = synthetic_ohlcv(300, seed=3, zone_every=1000)
+    zone = last_zone(df)
+    # An old swing high above the zone, long before it formed
+    high = df.columns.get_loc("High")
+    df.iloc[50, high] = round(zone.proximal * 1.4, 2)
+
+    found = causal_zones(build_panel([("SYN.NS", df)]), "1d", [PARAMS])["SYN.NS"][PARAMS]
+    causal = next(z for z in found if z.index == zone.index and z.base_len == zone.base_len)
+    assert causal.nearest_resistance == df["High"].iloc[50]
+    assert causal.nearest_resistance > last_zone(df).nearest_resistance
+    assert causal.fresh and causal.rr_ratio >= 1.5
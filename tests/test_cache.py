@@ -0,0 +1,25 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from synthetic import synthetic_ohlcv
+from ZoneScanner.cache import OHLCV_COLUMNS, NpyCache
+
+
+def test_npy_rewrite_leaves_mapped_frames_intact(tmp_path):
+    cache = NpyCache(str(tmp_path))
+    old = synthetic_ohlcv(300, seed=1)
+    cache.write("SYN.NS", "1d", old)
+    mapped = cache.read("SYN.NS", "1d")
+    before = mapped[OHLCV_COLUMNS].to_numpy().copy()
+
+    new = synthetic_ohlcv(320, seed=2)
+    cache.write("SYN.NS", "1d", new)
+
+    np.testing.assert_array_equal(mapped[OHLCV_COLUMNS].to_numpy(), before)
+    fresh = cache.read("SYN.NS", "1d")
+    np.testing.assert_array_equal(fresh[OHLCV_COLUMNS].to_numpy(), new[OHLCV_COLUMNS].to_numpy())
+    pd.testing.assert_index_equal(fresh.index, pd.DatetimeIndex(new.index, name="Date"))
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+    assert list(cache.entries()) == [("SYN.NS", "1d")]
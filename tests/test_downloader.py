@@ -0,0 +1,116 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from synthetic import synthetic_ohlcv
+from ZoneScanner.downloader import OHLCDownloader, TokenBucket
+
+
+class FakeClock:
+    """A monotonic clock that only moves when something sleeps on it."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            return self.now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+
+def bars(symbol: str) -> pd.DataFrame:
+    return synthetic_ohlcv(30, seed=sum(map(ord, symbol))).drop(columns="Date")
+
+
+class FakeDownload:
+    """Stands in for yf.download: records each request and fails as scripted."""
+
+    def __init__(self, failures=0, broken=(), missing=()):
+        self.failures = failures
+        self.broken = set(broken)
+        self.missing = set(missing)
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def __call__(self, tickers, interval, start=None, period=None, **kwargs):
+        with self._lock:
+            self.requests.append(tickers)
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("connection reset")
+        if isinstance(tickers, str):
+            return bars(tickers)
+        if self.broken & set(tickers):
+            raise ValueError("bad batch")
+        present = [t for t in tickers if t not in self.missing]
+        return pd.concat({t: bars(t) for t in present}, axis=1)
+
+
+def test_retries_with_exponential_backoff():
+    clock = FakeClock()
+    fake = FakeDownload(failures=2)
+    downloader = OHLCDownloader(rate_limit=0, retries=3, backoff=1.0, download_fn=fake, clock=clock, sleep=clock.sleep)
+
+    df = downloader.download("SYN.NS", "1d", "5y")
+
+    pd.testing.assert_frame_equal(df, bars("SYN.NS"))
+    assert fake.requests == ["SYN.NS"] * 3
+    assert len(clock.sleeps) == 2
+    assert 1.0 <= clock.sleeps[0] <= 1.25
+    assert 2.0 <= clock.sleeps[1] <= 2.5
+
+
+def test_gives_up_after_the_last_retry():
+    clock = FakeClock()
+    fake = FakeDownload(failures=10)
+    downloader = OHLCDownloader(rate_limit=0, retries=2, download_fn=fake, clock=clock, sleep=clock.sleep)
+
+    with pytest.raises(ConnectionError):
+        downloader.download("SYN.NS", "1d", "5y")
+    assert len(fake.requests) == 3
+    assert [symbol for symbol, df in downloader.download_many(["SYN.NS"], "1d", "5y") if df.empty] == ["SYN.NS"]
+
+
+def test_token_bucket_paces_acquisitions():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, capacity=2, clock=clock, sleep=clock.sleep)
+
+    for _ in range(6):
+        bucket.acquire()
+
+    # Two tokens of burst, then one every half second
+    assert clock.sleeps == pytest.approx([0.5] * 4)
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_rate_limit_applies_to_every_request():
+    clock = FakeClock()
+    fake = FakeDownload()
+    downloader = OHLCDownloader(max_workers=1, rate_limit=4.0, burst=1, download_fn=fake, clock=clock, sleep=clock.sleep)
+    symbols = [f"SYN{i}.NS" for i in range(9)]
+
+    assert sorted(symbol for symbol, _ in downloader.download_many(symbols, "1d", "5y")) == symbols
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_batches_split_and_isolate_failures():
+    fake = FakeDownload(broken={"BAD.NS"}, missing={"GONE.NS"})
+    downloader = OHLCDownloader(max_workers=2, rate_limit=0, retries=0, batch_size=2, download_fn=fake)
+    symbols = ["A.NS", "B.NS", "GONE.NS", "C.NS", "BAD.NS", "D.NS"]
+
+    frames = dict(downloader.download_many(symbols, "1d", "5y"))
+
+    assert sorted(map(tuple, fake.requests)) == [("A.NS", "B.NS"), ("BAD.NS", "D.NS"), ("GONE.NS", "C.NS")]
+    assert sorted(frames) == sorted(symbols)
+    # A ticker missing from a batch, or a failed batch, only empties those symbols
+    assert frames["GONE.NS"].empty
+    assert frames["BAD.NS"].empty and frames["D.NS"].empty
+    for symbol in ("A.NS", "B.NS", "C.NS"):
+        pd.testing.assert_frame_equal(frames[symbol], bars(symbol), check_names=False)
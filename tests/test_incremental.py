@@ -0,0 +1,49 @@
+import math
+
+import pytest
+
+from synthetic import synthetic_ohlcv
+from ZoneScanner.incremental import IncrementalZoneDetector
+from ZoneScanner.zone_detector import detect_zones_vectorized
+
+PARAMS = [
+    {"fresh_only": True},
+    {"fresh_only": False, "min_base": 1, "max_base": 5, "distance_range": (-math.inf, math.inf)},
+    {"fresh_only": False, "min_base": 2, "max_base": 3, "distance_range": (-20.0, 20.0)},
+]
+# Bar counts fed in turn: a short start, single bars, and larger chunks
+STEPS = [6, 9, 40, 41, 42, 80, 150, 151, 230, 300]
+
+
+@pytest.mark.parametrize("params", PARAMS)
+def test_updates_match_a_full_recompute(tmp_path, params):
+    df = synthetic_ohlcv(300, seed=6, zone_every=60, max_base=5)
+    state_dir = str(tmp_path / "state")
+    detector = IncrementalZoneDetector(state_dir, **params)
+    found = 0
+    for step, n in enumerate(STEPS):
+        if step % 3 == 2:
+            # A new detector only has the JSON state file to go on
+            detector = IncrementalZoneDetector(state_dir, **params)
+        part = df.iloc[:n]
+        expected = detect_zones_vectorized(part, "1d", "SYN.NS", **params)
+        assert detector.update(part, "1d", "SYN.NS") == expected, n
+        assert detector.verify(part, "1d", "SYN.NS")
+        found += len(expected)
+    assert found
+
+
+def test_a_corrected_last_bar_is_picked_up(tmp_path):
+    params = PARAMS[1]
+    df = synthetic_ohlcv(200, seed=6, zone_every=60)
+    detector = IncrementalZoneDetector(str(tmp_path), **params)
+    detector.update(df.iloc[:150], "1d", "SYN.NS")
+
+    # The bar that was still forming closes lower on the next download
+    revised = df.copy()
+    low = revised.columns.get_loc("Low")
+    revised.iloc[149, low] = revised["Low"].iloc[149] * 0.9
+    for n in (160, 200):
+        part = revised.iloc[:n]
+        reloaded = IncrementalZoneDetector(str(tmp_path), **params)
+        assert reloaded.update(part, "1d", "SYN.NS") == detect_zones_vectorized(part, "1d", "SYN.NS", **params)
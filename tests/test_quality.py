@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthetic import synthetic_ohlcv
+from ZoneScanner.quality import MIN_ROWS, QUALITY_CHECKS, check_ohlc, repair_ohlc, validate_ohlc
+
+# Well after the synthetic frames' last bar has closed
+LATER = pd.Timestamp("2030-01-01")
+
+
+def frame(rows, dates=None) -> pd.DataFrame:
+    dates = dates or pd.date_range("2024-01-01", periods=len(rows), freq="B").tolist()
+    df = pd.DataFrame(rows, columns=["Open", "High", "Low", "Close", "Volume"],
+                      index=pd.DatetimeIndex(dates, name="Date"), dtype="float64")
+    df["Date"] = df.index
+    return df
+
+
+def flagged(masks) -> dict:
+    return {name: np.flatnonzero(mask).tolist() for name, mask in masks.items() if mask.any()}
+
+
+def test_each_check_flags_its_rows():
+    dates = pd.date_range("2024-01-01", periods=9, freq="B").tolist()
+    dates[4] = dates[3]                      # duplicate
+    dates[6], dates[7] = dates[7], dates[6]  # out of order
+    df = frame([
+        (100, 102, 99, 101, 1000),
+        (101, 103, 100, 102, 1000),
+        (101, 103, 0, 102, 1000),        # non-positive
+        (102, 101, 103, 102, 1000),      # High < Low
+        (106, 104, 101, 103, 1000),      # Open above High
+        (103, 103, 103, 103, 0),         # zero range
+        (103, 105, 102, 104, -5),        # negative volume
+        (104, 106, 103, 105, 1000),
+        (105, 107, 104, 106, 1000),
+    ], dates)
+
+    assert flagged(check_ohlc(df, "1d", LATER)) == {
+        "duplicate_dates": [3],
+        "unsorted_dates": [7],
+        "non_positive": [2],
+        "high_below_low": [3],
+        "outside_range": [4],
+        "zero_range": [5],
+        "bad_volume": [6],
+    }
+    assert set(check_ohlc(df, "1d", LATER)) == set(QUALITY_CHECKS)
+
+
+def test_split_jump():
+    df = frame([(100, 102, 99, 101, 1000), (101, 103, 100, 102, 1000),
+                (51, 52, 50.5, 51.5, 1000), (51.5, 52.5, 51, 52, 1000)])
+    assert flagged(check_ohlc(df, "1d", LATER)) == {"split_jump": [2]}
+
+
+@pytest.mark.parametrize("now, partial", [
+    ("2024-01-05 15:00", True),                 # naive: exchange time, before the close
+    ("2024-01-05 15:45", False),
+    (pd.Timestamp("2024-01-05 09:45", tz="UTC"), True),    # 15:15 in Kolkata
+    (pd.Timestamp("2024-01-05 11:00", tz="UTC"), False),   # 16:30 in Kolkata, 11:00 on a UTC clock
+    (pd.Timestamp("2024-01-05 16:00", tz="Asia/Kolkata"), False),
+])
+def test_partial_bar_uses_exchange_time(now, partial):
+    df = frame([(100, 102, 99, 101, 1000)] * 4, pd.date_range("2024-01-02", periods=4, freq="B").tolist())
+    assert bool(check_ohlc(df, "1d", pd.Timestamp(now))["partial_bar"][-1]) == partial
+
+
+def test_weekly_bar_closes_on_friday():
+    df = frame([(100, 102, 99, 101, 1000)] * 3, pd.date_range("2024-01-01", periods=3, freq="W-MON").tolist())
+    assert check_ohlc(df, "1wk", pd.Timestamp("2024-01-19 12:00"))["partial_bar"][-1]
+    assert not check_ohlc(df, "1wk", pd.Timestamp("2024-01-19 16:00"))["partial_bar"][-1]
+
+
+def test_repair_fixes_what_it_can():
+    dates = pd.date_range("2024-01-01", periods=8, freq="B").tolist()
+    dates[2] = dates[1]
+    dates[4], dates[5] = dates[5], dates[4]
+    df = frame([
+        (100, 102, 99, 101, 1000),
+        (101, 103, 100, 102, 1000),      # superseded by the next row's copy of the date
+        (101, 104, 100, 103, 1100),
+        (103, 102, 100, 101, 1000),      # Open above High: widened
+        (102, 104, 101, 103, -1),        # negative volume: blanked
+        (103, 103, 103, 103, 0),         # zero range without volume: dropped
+        (-1, 104, 101, 103, 1000),       # non-positive: dropped
+        (103, 105, 102, 104, 1000),      # still forming: dropped
+    ], dates)
+    now = dates[-1] + pd.Timedelta(hours=12)
+
+    repaired = repair_ohlc(df, check_ohlc(df, "1d", now))
+
+    assert repaired.index.is_monotonic_increasing and not repaired.index.duplicated().any()
+    assert repaired.index.tolist() == [dates[0], dates[1], dates[3], dates[4]]
+    assert repaired.loc[dates[1], "Volume"] == 1100
+    assert repaired.loc[dates[3], "High"] == 103
+    assert np.isnan(repaired.loc[dates[4], "Volume"])
+    assert (repaired["Date"] == repaired.index).all()
+    assert flagged(check_ohlc(repaired, "1d", LATER)) == {}
+
+
+def test_clean_frames_pass_untouched():
+    df = synthetic_ohlcv(200, seed=0)
+    out, report = validate_ohlc(df, "SYN.NS", "1d", "repair", LATER)
+    assert out is df
+    assert report.clean and report.quarantined is None and report.repaired_rows == 0
+
+
+def test_quarantine_reasons():
+    df = synthetic_ohlcv(200, seed=0)
+
+    split = df.copy()
+    split.iloc[100:, :4] = split.iloc[100:, :4] / 2
+    assert validate_ohlc(split, "SYN.NS", "1d", "flag", LATER)[1].quarantined == "1 split jump(s)"
+
+    short = df.iloc[:MIN_ROWS - 1]
+    assert validate_ohlc(short, "SYN.NS", "1d", "flag", LATER)[1].quarantined == f"only {MIN_ROWS - 1} bars"
+
+    broken = df.copy()
+    high, low = broken.columns.get_loc("High"), broken.columns.get_loc("Low")
+    broken.iloc[10:13, high] = broken.iloc[10:13, low] * 0.99
+    assert validate_ohlc(broken, "SYN.NS", "1d", "flag", LATER)[1].quarantined == "3 of 200 bars are broken"
+    # Repair drops the broken bars instead
+    fixed, report = validate_ohlc(broken, "SYN.NS", "1d", "repair", LATER)
+    assert report.quarantined is None and report.repaired_rows == 3 and len(fixed) == 197
+
+    with pytest.raises(ValueError):
+        validate_ohlc(df, "SYN.NS", "1d", "strict")
@@ -0,0 +1,144 @@
+import json
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+
+from synthetic import synthetic_ohlcv
+from ZoneScanner.cache import get_cache
+from ZoneScanner.downloader import OHLCDownloader
+from ZoneScanner.instrumentation import stats
+from ZoneScanner.service import ZoneClient, ZoneService, make_server
+from ZoneScanner.zone_detector import DemandZoneScanner
+
+SYMBOLS = ["AAA.NS", "BBB.NS", "CCC.NS", "DDD.NS"]
+SECTORS = {"AAA.NS": "IT", "BBB.NS": "Energy", "CCC.NS": "IT", "DDD.NS": "Energy"}
+TIMEFRAMES = ("1d", "1wk")
+BARS = 300
+NEW_BARS = 5
+
+FILTERS = [
+    {},
+    {"fresh": 1, "distance": (0.0, 20.0)},
+    {"min_base": 2, "max_base": 5, "distance": (-50.0, 50.0)},
+    {"max_base": 6, "distance": (-100.0, 100.0), "sector": ["IT"]},
+]
+
+
+class SlowDownload:
+    """Serves the bars after the cached ones; blocks until released once `hold()` is called."""
+
+    def __init__(self, history):
+        self.history = history
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def hold(self):
+        self.release.clear()
+
+    def __call__(self, tickers, interval, start=None, period=None, **kwargs):
+        self.started.set()
+        assert self.release.wait(10)
+        df = self.history[(tickers, interval)]
+        return (df[df.index >= start] if start is not None else df).copy()
+
+
+@pytest.fixture
+def served(tmp_path):
+    with open(tmp_path / "StockList.csv", "w", encoding="utf-8") as f:
+        f.write("YahooSymbol,Sector,Industry,ISIN NUMBER\n")
+        for i, symbol in enumerate(SYMBOLS):
+            f.write(f"{symbol},{SECTORS[symbol]},Ind{i},INE{i:06d}\n")
+
+    cache = get_cache("csv", str(tmp_path / "cache"))
+    history = {}
+    for i, symbol in enumerate(SYMBOLS):
+        for tf in TIMEFRAMES:
+            df = synthetic_ohlcv(BARS + NEW_BARS, seed=i, tf=tf, zone_every=40, max_base=5).drop(columns="Date")
+            history[(symbol, tf)] = df
+            cache.write(symbol, tf, df.iloc[:BARS])
+            cache.write_meta(symbol, tf, df.iloc[:BARS], downloaded_rows=BARS)
+
+    download = SlowDownload(history)
+    service = ZoneService(
+        timeframes=TIMEFRAMES, symbols=SYMBOLS, csv_path=str(tmp_path / "StockList.csv"),
+        cache_dir=cache.cache_dir, cache=cache,
+        downloader=OHLCDownloader(rate_limit=0, download_fn=download),
+        refresh_interval=timedelta(hours=1),
+    )
+    service.load()
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield service, ZoneClient(f"http://127.0.0.1:{server.server_address[1]}"), cache, download
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop()
+
+
+def direct_scan(cache, tf, fresh=0, min_base=1, max_base=3, distance=(1.0, 5.0), sector=None):
+    """The rows a one-off DemandZoneScanner scan returns, ordered as the service ranks them."""
+    symbols = [s for s in SYMBOLS if sector is None or SECTORS[s] in sector]
+    scanner = DemandZoneScanner(
+        symbols=symbols, timeframes={tf: "max"}, fresh_only=bool(fresh),
+        frames={(s, tf): cache.read(s, tf) for s in symbols},
+        min_base=min_base, max_base=max_base, distance_range=distance,
+    )
+    zones = sorted(scanner.scan(), key=lambda zone: -zone.score)
+    # Through JSON, as the service sends them
+    return json.loads(json.dumps([zone.to_dict() for zone in zones], default=str))
+
+
+def test_queries_match_a_direct_scan(served):
+    service, client, cache, _ = served
+    found = 0
+    for tf in TIMEFRAMES:
+        for filters in FILTERS:
+            response = client.scan(tf=tf, **filters)
+            expected = direct_scan(cache, tf, **filters)
+            assert response["zones"] == expected
+            assert response["count"] == len(expected)
+            found += len(expected)
+    assert found
+
+
+def test_queries_are_served_during_a_refresh(served):
+    service, client, cache, download = served
+    before = {tf: client.scan(tf=tf, **FILTERS[2])["zones"] for tf in TIMEFRAMES}
+    for scanner in service.scanners.values():
+        scanner.refresh_max_age = timedelta(0)
+    download.hold()
+    download.started.clear()
+
+    assert client.refresh()["started"]
+    assert download.started.wait(10)
+    # The refresh is stuck in a download; queries still answer from the current tables
+    assert client.status()["refreshing"]
+    for tf in TIMEFRAMES:
+        assert client.scan(tf=tf, **FILTERS[2])["zones"] == before[tf]
+
+    download.release.set()
+    deadline = time.monotonic() + 30
+    while client.status()["refreshing"]:
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+
+    for tf in TIMEFRAMES:
+        assert all(len(cache.read(symbol, tf)) == BARS + NEW_BARS for symbol in SYMBOLS)
+        for filters in FILTERS:
+            assert client.scan(tf=tf, **filters)["zones"] == direct_scan(cache, tf, **filters)
+
+
+def test_refreshes_do_not_accumulate_stats(served):
+    service, client, _, _ = served
+    for scanner in service.scanners.values():
+        scanner.refresh_max_age = timedelta(0)
+    for _ in range(3):
+        service.refresh()
+        assert not stats.samples and not stats.counters and not stats.symbols
+    assert "service_detect" in service.last_report["stages"]
+    assert client.status()["last_report"]["stages"].keys() == service.last_report["stages"].keys()
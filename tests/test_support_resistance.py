@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+import reference
+from synthetic import synthetic_ohlcv
+from ZoneScanner.support_resistance import detect_support_resistance, nearest_levels
+
+
+def frames():
+    yield synthetic_ohlcv(400, seed=0)
+    yield synthetic_ohlcv(250, seed=1, tf="1wk", zone_every=40)
+    # Prices on a coarse tick, so equal highs/lows and levels exactly `tolerance` apart occur
+    df = synthetic_ohlcv(300, seed=2)
+    df[["Open", "High", "Low", "Close"]] = (df[["Open", "High", "Low", "Close"]] / 5).round() * 5
+    yield df
+
+
+@pytest.mark.parametrize("swing", [1, 2, 3])
+@pytest.mark.parametrize("tolerance", [0.0, 0.005, 0.015, 0.05])
+def test_levels_match_the_original_loop(swing, tolerance):
+    rng = np.random.default_rng(swing)
+    for df in frames():
+        expected = reference.detect_support_resistance(df, swing, tolerance)
+        got = detect_support_resistance(df, swing, tolerance)
+        assert got == expected
+
+        supports, resistances = got["Support"], got["Resistance"]
+        levels = supports + resistances
+        probes = levels + [level + 0.005 for level in levels] + [level - 0.005 for level in levels]
+        probes += rng.uniform(df["Low"].min() * 0.9, df["High"].max() * 1.1, 50).tolist()
+        for price in probes:
+            assert nearest_levels(supports, resistances, price) == reference.nearest_levels(supports, resistances, price)
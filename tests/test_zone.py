@@ -0,0 +1,16 @@
+import math
+
+from synthetic import synthetic_ohlcv
+from ZoneScanner.zone import ZONE_ATTRS
+from ZoneScanner.zone_detector import detect_zones_vectorized
+
+
+def test_getitem_reads_every_csv_column():
+    for tf in ("1d", "1wk", "1mo"):
+        zones = detect_zones_vectorized(synthetic_ohlcv(400, seed=2, tf=tf), tf, "SYN.NS", False, 1, 3, (-math.inf, math.inf))
+        assert zones
+        for zone in zones:
+            row = zone.to_dict()
+            assert set(ZONE_ATTRS) <= set(row)
+            for column, value in row.items():
+                assert zone[column] == value
@@ -0,0 +1,49 @@
+import math
+
+import pytest
+
+import reference
+from synthetic import synthetic_ohlcv
+from ZoneScanner.panel import detect_zones_panel
+from ZoneScanner.zone_detector import ZoneParams, detect_zones, detect_zones_sweep, detect_zones_vectorized
+
+PARAM_SETS = [
+    ZoneParams(),
+    ZoneParams(False, 1, 3, (-math.inf, math.inf)),
+    ZoneParams(False, 2, 5, (-50.0, 50.0)),
+    ZoneParams(True, 1, 1, (0.0, 10.0)),
+]
+
+
+def frames(tf):
+    # Different lengths, so panel rows are padded differently
+    return [(f"SYN{seed}.NS", synthetic_ohlcv(220 + 45 * seed, seed=seed, tf=tf, zone_every=25, max_base=5))
+            for seed in range(3)]
+
+
+@pytest.mark.parametrize("tf", ["1d", "1wk", "1mo"])
+def test_engines_match_detect_zones(tf):
+    pairs = frames(tf)
+    panel = detect_zones_panel(pairs, tf, PARAM_SETS)
+    found = 0
+    for symbol, df in pairs:
+        sweep = detect_zones_sweep(df, tf, symbol, PARAM_SETS)
+        for params in PARAM_SETS:
+            # The original loop, not today's detect_zones, which shares code with the engines
+            expected = reference.detect_zones(df, tf, symbol, *params)
+            vectorized = detect_zones_vectorized(df, tf, symbol, *params)
+            assert [zone.to_dict() for zone in vectorized] == expected
+            assert detect_zones(df, tf, symbol, *params) == expected
+            assert sweep[params] == vectorized
+            assert panel[symbol][params] == vectorized
+            found += len(expected)
+    assert found
+
+
+def test_short_frames_have_no_zones():
+    df = synthetic_ohlcv(7, seed=0)
+    params = PARAM_SETS[1]
+    assert reference.detect_zones(df, "1d", "SYN.NS", *params) == []
+    assert detect_zones(df, "1d", "SYN.NS", *params) == []
+    assert detect_zones_sweep(df, "1d", "SYN.NS", [params])[params] == []
+    assert detect_zones_panel([("SYN.NS", df)], "1d", [params])["SYN.NS"][params] == []